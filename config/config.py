@@ -4,6 +4,7 @@ Simplified and optimized for ARM hardware
 """
 
 import os
+import socket
 
 # Display Settings - Optimized for Radxa Zero
 DISPLAY_SIZE = (1280, 960)
@@ -95,8 +96,43 @@ MQTT_TOPICS = {
     'scores': 'doombox/scores',
     'players': 'doombox/players',
     'system': 'doombox/system',
-    'start_game': 'doombox/start_game'  # For web form compatibility
+    'start_game': 'doombox/start_game',  # For web form compatibility
+    'queue': 'doombox/queue',  # Retained queue depth and ETAs
+    'telemetry': 'doombox/telemetry',  # Retained keyframes plus deltas
+    'scores_snapshot': 'doombox/scores/snapshot',  # Retained, versioned top-N
+    'scores_delta': 'doombox/scores/delta'  # One sequenced message per recorded score
 }
+# Topics the kiosk subscribes to; the rest of MQTT_TOPICS are only published,
+# so the kiosk never consumes its own status/score/queue output
+MQTT_COMMAND_TOPICS = ['commands', 'start_game', 'players', 'system']
+MQTT_QOS = 1
+MQTT_OUTBOX_MAX_MESSAGES = 1000  # Unacknowledged publishes kept in the score database; oldest dropped first
+MQTT_RECONNECT_MIN_DELAY = 1     # seconds; doubled after each failed attempt
+MQTT_RECONNECT_MAX_DELAY = 60
+
+# Telemetry (kiosk health on MQTT_TOPICS['telemetry'])
+TELEMETRY_ENABLED = True
+TELEMETRY_INTERVAL = 30        # seconds between full retained keyframes
+TELEMETRY_CHECK_INTERVAL = 1.0  # seconds between samples; a delta goes out when something below changes enough
+TELEMETRY_CHANGE_THRESHOLDS = {
+    'game_state': 0,
+    'queue_depth': 0,
+    'fps': 5.0,
+    'frame_p95_ms': 8.0,
+    'db_query_p95_ms': 10.0,
+    'soc_temp_c': 3.0
+}
+SOC_TEMP_PATH = '/sys/class/thermal/thermal_zone0/temp'
+
+# Leaderboard published over MQTT (snapshot + deltas)
+LEADERBOARD_SYNC_LIMIT = 10
+
+# Multi-kiosk score replication: kiosks at the same event share one leaderboard over MQTT
+REPLICATION_ENABLED = False
+KIOSK_ID = os.environ.get('DOOMBOX_KIOSK_ID') or socket.gethostname()  # Must differ between kiosks
+REPLICATION_TOPIC = 'doombox/replication'  # Each kiosk publishes to <topic>/<kiosk id>
+REPLICATION_SYNC_INTERVAL = 10  # seconds between summaries used to repair missed scores
+REPLICATION_BATCH_SIZE = 50     # Scores per replication message
 
 # Controller Settings
 CONTROLLER_NAME = "Sony Interactive Entertainment Wireless Controller"  # PS4 Controller
@@ -122,7 +158,7 @@ DOOM_EXTRA_ARGS = [
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # DoomBox root directory
 LOGS_DIR = f"{BASE_DIR}/logs"
 TRIGGER_FILE = f"{BASE_DIR}/new_player.json"
-SCORE_DATABASE = f"{BASE_DIR}/scores.db"
+SCORE_DATABASE = f"{BASE_DIR}/doombox_scores.db"  # Shared by the kiosk, game launcher and MQTT client
 DOOM_DIR = f"{BASE_DIR}/doom"
 
 # Logging Configuration
@@ -146,12 +182,32 @@ AUDIO_ENABLED = False     # Disable audio for better performance
 VSYNC_ENABLED = False     # Disable VSYNC for ARM
 RENDER_SCALE = 1.0        # No scaling for better performance
 
+# Video Cache Settings
+VIDEO_CACHE_BUDGET_MB = 0      # Memory shared by all video frame caches (0 = 25% of available RAM)
+VIDEO_CACHE_MIN_SECONDS = 2.0  # Shortest clip loop kept when the budget is too tight
+
+# Game Output Settings
+GAME_LOG_MAX_BYTES = 1024 * 1024  # Per-session game.log size before rotating
+GAME_LOG_BACKUPS = 2              # Rotated game logs kept per session
+GAME_OUTPUT_TAIL_LINES = 200      # Recent game output kept in memory
+
 # Timing Settings
 QR_CODE_REFRESH_INTERVAL = 300  # 5 minutes
 SCORE_DISPLAY_DURATION = 10
 GAME_START_DELAY = 2
+GAME_EXIT_SETTLE_SECONDS = 0.5  # Pause after a game exits before the kiosk takes the display back
+DISPLAY_RELEASE_TIMEOUT = 1.0   # Longest wait for the kiosk to hide before launching a game
+GAME_READY_MARKER = 'ST_Init'   # Last dsda-doom init line before the first frame is drawn
+SCORE_INGEST_BUDGET = 1.0       # Seconds from game exit until its score is committed and announced
 INPUT_POLLING_RATE = 1/30  # 30 FPS
 FILE_CHECK_INTERVAL = 1    # Check trigger file every second
+CONTROLLER_RESCAN_INTERVAL = 30  # Controller rescan period when inotify is unavailable
+
+# Player Queue Settings
+QUEUE_MAX_DEPTH = 50                # Players allowed to wait at once
+QUEUE_TIME_LIMIT = 0                # Default per-session time limit in seconds (0 = none)
+QUEUE_DEFAULT_SESSION_SECONDS = 300 # Session length assumed for ETAs until real sessions are recorded
+QUEUE_HANDOFF_SECONDS = 5           # Pause between queued sessions so the next player can step up
 
 # Test Mode Settings
 TEST_PLAYER_PREFIX = "TEST_"
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the OpenCV -> pygame frame upload path
+Compares ms/frame of the legacy resize/cvtColor/swapaxes/make_surface path
+against the preallocated in-place FrameUploader path
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import numpy as np
+import cv2
+import pygame
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from frame_upload import FrameUploader, legacy_frame_to_surface
+
+
+def make_frames(size, count):
+    """Create synthetic BGR frames of the given (width, height)"""
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8) for _ in range(count)]
+
+
+def time_per_frame(func, frames, repeat):
+    """Average milliseconds per call of func over the frames"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            func(frame)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(frames))
+
+
+def run_case(name, source_size, display_size, screen, repeat):
+    """Benchmark one source/display size combination"""
+    frames = make_frames(source_size, 8)
+    uploader = FrameUploader(display_size, ring_size=6)
+
+    legacy_ms = time_per_frame(lambda f: legacy_frame_to_surface(f, display_size), frames, repeat)
+    upload_ms = time_per_frame(uploader.upload, frames, repeat)
+
+    # Include the blit to the display, which is what the kiosk pays every frame
+    legacy_blit_ms = time_per_frame(lambda f: screen.blit(legacy_frame_to_surface(f, display_size), (0, 0)), frames, repeat)
+    upload_blit_ms = time_per_frame(lambda f: screen.blit(uploader.upload(f), (0, 0)), frames, repeat)
+
+    print(f"{name}")
+    print(f"  source {source_size[0]}x{source_size[1]} -> display {display_size[0]}x{display_size[1]}")
+    print(f"  legacy upload:        {legacy_ms:7.2f} ms/frame")
+    print(f"  in-place upload:      {upload_ms:7.2f} ms/frame  ({legacy_ms / upload_ms:.1f}x)")
+    print(f"  legacy upload+blit:   {legacy_blit_ms:7.2f} ms/frame")
+    print(f"  in-place upload+blit: {upload_blit_ms:7.2f} ms/frame  ({legacy_blit_ms / upload_blit_ms:.1f}x)")
+
+
+def run_clip(path, display_size, screen):
+    """Benchmark decode + upload on a real clip"""
+    for label, use_uploader in (("legacy", False), ("in-place", True)):
+        cap = cv2.VideoCapture(path)
+        uploader = FrameUploader(display_size, ring_size=6)
+        count = 0
+        start = time.perf_counter()
+        while True:
+            if use_uploader:
+                surface = uploader.read(cap)
+                if surface is None:
+                    break
+            else:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                surface = legacy_frame_to_surface(frame, display_size)
+            screen.blit(surface, (0, 0))
+            count += 1
+        cap.release()
+        elapsed = (time.perf_counter() - start) * 1000
+        if count:
+            print(f"  {label:<9} decode+upload+blit: {elapsed / count:7.2f} ms/frame over {count} frames")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DoomBox frame upload benchmark')
+    parser.add_argument('--width', type=int, default=1280, help='Display width')
+    parser.add_argument('--height', type=int, default=960, help='Display height')
+    parser.add_argument('--repeat', type=int, default=10, help='Passes over the test frames')
+    parser.add_argument('--clip', type=str, help='Optional video file to benchmark with real decode')
+    args = parser.parse_args()
+
+    display_size = (args.width, args.height)
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    screen = pygame.display.set_mode(display_size)
+
+    print("=== DoomBox Frame Upload Benchmark ===")
+    run_case("Pre-optimized clip (skip-resize fast path)", display_size, display_size, screen, args.repeat)
+    run_case("Downscale from 1080p", (1920, 1080), display_size, screen, args.repeat)
+    run_case("Upscale from 640x480", (640, 480), display_size, screen, args.repeat)
+
+    if args.clip:
+        print(f"Real clip: {args.clip}")
+        run_clip(args.clip, display_size, screen)
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -449,13 +449,12 @@ echo "===================="
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" &>/dev/null && pwd)"
 cd "$SCRIPT_DIR"
 
-if [ -f scores.db ]; then
-    sqlite3 scores.db "SELECT
+if [ -f doombox_scores.db ]; then
+    sqlite3 doombox_scores.db "SELECT
         ROW_NUMBER() OVER (ORDER BY score DESC) as rank,
         player_name,
         score,
-        datetime(timestamp) as date_played,
-        level_reached
+        datetime(timestamp) as date_played
     FROM scores
     ORDER BY score DESC
     LIMIT 20;"
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Persistent pre-decoded clip cache for the DoomBox video players
+Each clip is decoded once into a memory-mappable .npy file of raw BGR frames at
+display resolution; playback memory-maps it so clip switches are page-ins
+instead of full decodes
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Dict, Any
+
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+class ClipFrameCache:
+    """
+    On-disk cache of decoded clips
+
+    Frames are stored uncompressed as an (N, H, W, 3) uint8 .npy array so they can
+    be memory-mapped read-only. Pages are file-backed, so the kernel can drop
+    them under memory pressure and RSS stays bounded no matter how many clips
+    are in rotation. A JSON sidecar records the source file identity so a
+    re-encoded clip invalidates its cache entry.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str, display_size: Tuple[int, int] = (1280, 960), max_disk_mb: int = 4096):
+        self.cache_dir = Path(cache_dir)
+        self.display_size = display_size
+        self.max_disk_mb = max_disk_mb
+        self.build_lock = threading.Lock()
+
+        self.stats = {
+            'hits': 0,
+            'builds': 0,
+            'build_seconds': 0.0,
+            'pruned': 0,
+            'errors': 0,
+        }
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Could not create clip cache directory {self.cache_dir}: {e}")
+
+    def _cache_key(self, video_path: Path, max_frames: Optional[int],
+                   frame_size: Tuple[int, int], frame_step: int) -> str:
+        """Key a cache entry on the source file identity and output format"""
+        stat = video_path.stat()
+        ident = f"{video_path.resolve()}|{stat.st_size}|{int(stat.st_mtime)}|" \
+                f"{frame_size[0]}x{frame_size[1]}|{max_frames}|v{self.FORMAT_VERSION}"
+        if frame_step > 1:
+            ident += f"|step{frame_step}"
+        return hashlib.sha1(ident.encode('utf-8')).hexdigest()[:16]
+
+    def _entry_paths(self, video_path: Path, max_frames: Optional[int],
+                     frame_size: Tuple[int, int] = None, frame_step: int = 1) -> Tuple[Path, Path]:
+        """Frame data and metadata paths for a clip"""
+        key = self._cache_key(video_path, max_frames, frame_size or self.display_size, frame_step)
+        stem = f"{video_path.stem}-{key}"
+        return self.cache_dir / f"{stem}.npy", self.cache_dir / f"{stem}.json"
+
+    def has(self, video_path, max_frames: Optional[int] = None,
+            frame_size: Tuple[int, int] = None, frame_step: int = 1) -> bool:
+        """Check whether a clip is already cached"""
+        try:
+            data_path, meta_path = self._entry_paths(Path(video_path), max_frames, frame_size, frame_step)
+            return data_path.exists() and meta_path.exists()
+        except OSError:
+            return False
+
+    def load(self, video_path, max_frames: Optional[int] = None,
+             frame_size: Tuple[int, int] = None, frame_step: int = 1) -> Optional[np.ndarray]:
+        """
+        Get a read-only memory map of a clip's frames, decoding it first if needed
+
+        frame_size and frame_step select a reduced resolution or frame rate
+        (keep every frame_step-th frame); max_frames counts stored frames.
+        Returns an (N, H, W, 3) BGR array, or None if the clip could not be cached.
+        """
+        video_path = Path(video_path)
+        frame_size = tuple(frame_size or self.display_size)
+        frame_step = max(1, int(frame_step))
+        try:
+            data_path, meta_path = self._entry_paths(video_path, max_frames, frame_size, frame_step)
+
+            if not (data_path.exists() and meta_path.exists()):
+                with self.build_lock:
+                    if not (data_path.exists() and meta_path.exists()):
+                        self._build(video_path, max_frames, data_path, meta_path, frame_size, frame_step)
+            else:
+                self.stats['hits'] += 1
+
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+
+            frames = np.load(data_path, mmap_mode='r')
+            os.utime(data_path)  # Track last use for pruning
+            return frames[:meta['frames']]
+
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Clip cache error for {video_path.name}: {e}")
+            return None
+
+    def _build(self, video_path: Path, max_frames: Optional[int], data_path: Path, meta_path: Path,
+               frame_size: Tuple[int, int], frame_step: int):
+        """Decode a clip once into the cache"""
+        start = time.perf_counter()
+        cap = cv2.VideoCapture(str(video_path))
+        if not cap.isOpened():
+            raise IOError(f"Could not open video: {video_path}")
+
+        tmp_path = data_path.with_suffix('.tmp.npy')
+        frames = None
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = -(-int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) // frame_step)
+            if max_frames:
+                frame_count = min(frame_count, max_frames)
+            if frame_count <= 0:
+                raise IOError(f"Video reports no frames: {video_path}")
+
+            self.prune(reserve_mb=frame_count * frame_size[0] * frame_size[1] * 3 / (1024 * 1024))
+
+            logger.info(f"Building frame cache for {video_path.name}: {frame_count} frames at "
+                        f"{frame_size[0]}x{frame_size[1]}, step {frame_step}")
+            shape = (frame_count, frame_size[1], frame_size[0], 3)
+            frames = np.lib.format.open_memmap(str(tmp_path), mode='w+', dtype=np.uint8, shape=shape)
+
+            decoded = 0
+            for i in range(frame_count):
+                # Decode straight into the mapped slot when the clip is pre-optimized
+                ret, frame = cap.read(frames[i])
+                if not ret:
+                    break
+                if not np.shares_memory(frame, frames):
+                    cv2.resize(frame, frame_size, dst=frames[i], interpolation=cv2.INTER_LINEAR)
+                decoded += 1
+
+                # Reduced frame rate: skip the frames we don't keep without decoding them to pixels
+                for _ in range(frame_step - 1):
+                    if not cap.grab():
+                        break
+
+            frames.flush()
+            del frames
+            frames = None
+
+            if decoded == 0:
+                raise IOError(f"No frames decoded from {video_path}")
+
+            os.replace(tmp_path, data_path)
+            with open(meta_path, 'w') as f:
+                json.dump({
+                    'source': str(video_path),
+                    'frames': decoded,
+                    'fps': fps,
+                    'frame_step': frame_step,
+                    'display_size': list(frame_size),
+                    'version': self.FORMAT_VERSION,
+                }, f)
+
+            elapsed = time.perf_counter() - start
+            self.stats['builds'] += 1
+            self.stats['build_seconds'] += elapsed
+            logger.info(f"Cached {decoded} frames of {video_path.name} in {elapsed:.1f}s")
+
+        finally:
+            cap.release()
+            if frames is not None:
+                del frames
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def disk_usage_mb(self) -> float:
+        """Total size of cached frame data"""
+        return sum(p.stat().st_size for p in self.cache_dir.glob('*.npy')) / (1024 * 1024)
+
+    def prune(self, reserve_mb: float = 0):
+        """Delete least recently used entries until the cache fits its disk budget"""
+        try:
+            entries = sorted(self.cache_dir.glob('*.npy'), key=lambda p: p.stat().st_mtime)
+            total_mb = sum(p.stat().st_size for p in entries) / (1024 * 1024)
+
+            for data_path in entries:
+                if total_mb + reserve_mb <= self.max_disk_mb:
+                    break
+                if data_path.name.endswith('.tmp.npy'):
+                    continue
+                size_mb = data_path.stat().st_size / (1024 * 1024)
+                data_path.unlink()
+                meta_path = data_path.with_suffix('.json')
+                if meta_path.exists():
+                    meta_path.unlink()
+                total_mb -= size_mb
+                self.stats['pruned'] += 1
+                logger.info(f"Pruned clip cache entry {data_path.name} ({size_mb:.0f} MB)")
+
+        except OSError as e:
+            logger.warning(f"Could not prune clip cache: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        stats = dict(self.stats)
+        try:
+            stats['disk_mb'] = self.disk_usage_mb()
+        except OSError:
+            stats['disk_mb'] = None
+        stats['max_disk_mb'] = self.max_disk_mb
+        return stats
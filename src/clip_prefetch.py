@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Gapless clip transitions for the DoomBox video players
+Opens and pre-rolls the next clip on a second decoder thread while the current
+one plays, so switching clips is a pointer swap instead of an open + probe
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Optional, Tuple, Any, Dict
+
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchedClip:
+    """A clip whose decoder is open and whose first frame is already decoded"""
+
+    def __init__(self, video_path: str, cap: cv2.VideoCapture, fps: float,
+                 first_frame: Optional[np.ndarray], open_ms: float):
+        self.video_path = video_path
+        self.cap = cap
+        self.fps = fps
+        self.first_frame = first_frame
+        self.open_ms = open_ms
+
+
+class ClipPrefetcher:
+    """
+    Second decoder that prepares the next clip in the background
+
+    open_clip(path) must return (capture, fps) or None. Only one clip is
+    prefetched at a time; the previous capture can be handed over to be
+    released on the prefetch thread as well, keeping release() off the
+    playback path.
+    """
+
+    def __init__(self, open_clip: Callable[[str], Optional[Tuple[cv2.VideoCapture, float]]]):
+        self.open_clip = open_clip
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.clip: Optional[PrefetchedClip] = None
+
+        self.stats = {
+            'prefetched': 0,
+            'failures': 0,
+            'waits': 0,  # take() had to block because the prefetch was not finished
+            'last_open_ms': 0.0,
+        }
+
+    def prefetch(self, video_path: str, release_cap: cv2.VideoCapture = None):
+        """Start opening and pre-rolling a clip on the prefetch thread"""
+        self.cancel()
+        self.ready.clear()
+        self.thread = threading.Thread(target=self._prefetch_worker, args=(str(video_path), release_cap),
+                                       daemon=True)
+        self.thread.start()
+
+    def _prefetch_worker(self, video_path: str, release_cap: Optional[cv2.VideoCapture]):
+        """Release the old decoder, then open the next clip and decode its first frame"""
+        try:
+            if release_cap is not None:
+                release_cap.release()
+
+            start = time.perf_counter()
+            opened = self.open_clip(video_path)
+            if opened is None:
+                self.stats['failures'] += 1
+                return
+
+            cap, fps = opened
+            ret, first_frame = cap.read()
+            if not ret:
+                logger.warning(f"Prefetched clip has no frames: {video_path}")
+                cap.release()
+                self.stats['failures'] += 1
+                return
+
+            open_ms = (time.perf_counter() - start) * 1000
+            with self.lock:
+                self.clip = PrefetchedClip(video_path, cap, fps, first_frame, open_ms)
+            self.stats['prefetched'] += 1
+            self.stats['last_open_ms'] = open_ms
+            logger.debug(f"Prefetched {video_path} in {open_ms:.1f}ms")
+
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"Error prefetching clip {video_path}: {e}")
+        finally:
+            self.ready.set()
+
+    def take(self, timeout: float = None) -> Optional[PrefetchedClip]:
+        """Hand over the prefetched clip, waiting for it if it is still opening"""
+        if self.thread is None:
+            return None
+
+        if not self.ready.is_set():
+            self.stats['waits'] += 1
+            if not self.ready.wait(timeout):
+                return None
+
+        with self.lock:
+            clip, self.clip = self.clip, None
+        self.thread = None
+        return clip
+
+    def cancel(self):
+        """Drop a prefetched clip that will not be played"""
+        if self.thread is not None:
+            self.ready.wait(2.0)
+            self.thread = None
+        with self.lock:
+            clip, self.clip = self.clip, None
+        if clip is not None:
+            clip.cap.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch statistics"""
+        return dict(self.stats)
+
+
+class TransitionStats:
+    """Measures the on-screen gap between the last frame of a clip and the first frame of the next"""
+
+    def __init__(self, history: int = 20):
+        self.gaps_ms = deque(maxlen=history)
+        self.transitions = 0
+        self.stalls = 0  # Transitions that held the old frame longer than one frame interval
+
+    def record(self, gap_seconds: float, frame_interval: float):
+        """Record one clip transition"""
+        self.transitions += 1
+        self.gaps_ms.append(gap_seconds * 1000)
+        if gap_seconds > frame_interval * 1.5:
+            self.stalls += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transition statistics"""
+        gaps = list(self.gaps_ms)
+        return {
+            'transitions': self.transitions,
+            'stalls': self.stalls,
+            'last_gap_ms': gaps[-1] if gaps else None,
+            'avg_gap_ms': sum(gaps) / len(gaps) if gaps else None,
+            'max_gap_ms': max(gaps) if gaps else None,
+        }
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Command executor for DoomBox
+Runs remote-control handlers on a worker thread fed by a bounded queue, so
+the MQTT network thread only parses, acknowledges and hands work off
+"""
+
+import time
+import queue
+import logging
+import threading
+from typing import Callable, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class CommandExecutor:
+    """
+    Bounded FIFO of handler calls run by worker threads
+
+    One worker (the default) keeps commands in arrival order, which matters
+    for launch/stop sequences. submit() never blocks: when the queue is full
+    it returns False and the caller reports the command as rejected.
+    """
+
+    def __init__(self, max_pending: int = 32, workers: int = 1, name: str = 'commands'):
+        self.jobs = queue.Queue(maxsize=max_pending)
+        self.name = name
+        self.running = True
+        self.workers = []
+        for index in range(workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"{name}-{index}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'max_wait_ms': 0.0,
+            'last_run_ms': 0.0
+        }
+
+    def submit(self, label: str, func: Callable, *args, **kwargs) -> bool:
+        """Queue func(*args, **kwargs); returns False if the queue is full or stopped"""
+        if not self.running:
+            return False
+        try:
+            self.jobs.put_nowait((label, func, args, kwargs, time.perf_counter()))
+        except queue.Full:
+            with self.stats_lock:
+                self.stats['rejected'] += 1
+            logger.warning(f"{self.name} queue full, rejecting {label}")
+            return False
+        with self.stats_lock:
+            self.stats['submitted'] += 1
+        return True
+
+    def _worker_loop(self):
+        """Run queued calls until stopped"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            label, func, args, kwargs, queued_at = job
+            start = time.perf_counter()
+            try:
+                func(*args, **kwargs)
+                outcome = 'completed'
+            except Exception as e:
+                outcome = 'failed'
+                logger.error(f"Error running {label}: {e}")
+            run_ms = (time.perf_counter() - start) * 1000
+            with self.stats_lock:
+                self.stats[outcome] += 1
+                self.stats['max_wait_ms'] = max(self.stats['max_wait_ms'], (start - queued_at) * 1000)
+                self.stats['last_run_ms'] = run_ms
+
+    def stop(self, timeout: float = 2.0):
+        """Finish queued work (bounded by timeout) and stop the workers"""
+        self.running = False
+        for _ in self.workers:
+            try:
+                self.jobs.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for worker in self.workers:
+            worker.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics"""
+        with self.stats_lock:
+            return dict(self.stats, pending=self.jobs.qsize())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Controller inventory for DoomBox
+Reads game controller details straight from /sys/class/input and /dev/input,
+caches them, and rescans when inotify reports devices coming or going, so
+launch and status calls never have to initialize pygame
+"""
+
+import os
+import re
+import sys
+import time
+import glob
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import CONTROLLER_RESCAN_INTERVAL
+except ImportError:
+    # Fallback configuration
+    CONTROLLER_RESCAN_INTERVAL = 30
+
+SYS_INPUT_ROOT = '/sys/class/input'
+DEV_INPUT_ROOT = '/dev/input'
+
+# Linux input event codes (linux/input-event-codes.h)
+BTN_JOYSTICK = 0x120
+BTN_DIGI = 0x140
+ABS_HAT0X = 0x10
+ABS_HAT3Y = 0x17
+
+BITS_PER_LONG = struct.calcsize('l') * 8
+HANDLER_PATTERN = re.compile(r'^(js|event)\d+$')
+
+# inotify flags (sys/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_CREATE | IN_DELETE | IN_ATTRIB
+RESCAN_SETTLE_SECONDS = 0.2  # sysfs attributes appear shortly after the device node
+
+
+def parse_bitmap(text: str) -> List[int]:
+    """Decode a sysfs capability bitmap ("1b 0 ffff0000 ...") into the set bit numbers"""
+    bits = []
+    for word_index, word in enumerate(reversed(text.split())):
+        value = int(word, 16)
+        bit = 0
+        while value:
+            if value & 1:
+                bits.append(word_index * BITS_PER_LONG + bit)
+            value >>= 1
+            bit += 1
+    return bits
+
+
+def _read_text(path: str) -> str:
+    """Read a sysfs attribute, empty if it is missing"""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+class ControllerInventory:
+    """
+    Cached snapshot of connected game controllers
+
+    The snapshot has the shape GameLauncher.check_controllers always returned
+    (controllers_found, controllers, joysticks_found, joysticks). It is rebuilt
+    in the background on inotify events in /dev/input, or every
+    CONTROLLER_RESCAN_INTERVAL seconds where inotify is unavailable.
+    """
+
+    def __init__(self, sys_root: str = SYS_INPUT_ROOT, dev_root: str = DEV_INPUT_ROOT,
+                 rescan_interval: float = None):
+        self.sys_root = sys_root
+        self.dev_root = dev_root
+        self.rescan_interval = CONTROLLER_RESCAN_INTERVAL if rescan_interval is None else rescan_interval
+
+        self.snapshot: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.stopped = threading.Event()
+        self.watch_thread = None
+        self.running = False
+        self.inotify_fd = None
+
+        self.stats = {
+            'scans': 0,
+            'device_events': 0,
+            'last_scan_ms': 0.0,
+            'watch_mode': None
+        }
+
+        self.rescan()
+
+    def _describe_device(self, input_dir: str, index: int) -> Optional[Dict[str, Any]]:
+        """Build a controller entry from one /sys/class/input/inputN directory, or None if it isn't one"""
+        handlers = sorted(name for name in os.listdir(input_dir) if HANDLER_PATTERN.match(name))
+        keys = parse_bitmap(_read_text(os.path.join(input_dir, 'capabilities', 'key')))
+        axes = parse_bitmap(_read_text(os.path.join(input_dir, 'capabilities', 'abs')))
+
+        has_js = any(name.startswith('js') for name in handlers)
+        has_gamepad_buttons = any(BTN_JOYSTICK <= key < BTN_DIGI for key in keys)
+        if not (has_js or has_gamepad_buttons):
+            return None
+
+        hat_axes = [axis for axis in axes if ABS_HAT0X <= axis <= ABS_HAT3Y]
+        return {
+            'id': index,
+            'name': _read_text(os.path.join(input_dir, 'name')) or os.path.basename(input_dir),
+            'axes': len(axes) - len(hat_axes),
+            'buttons': sum(1 for key in keys if BTN_JOYSTICK <= key < BTN_DIGI),  # As pygame counts them
+            'hats': (len(hat_axes) + 1) // 2,
+            'vendor': _read_text(os.path.join(input_dir, 'id', 'vendor')),
+            'product': _read_text(os.path.join(input_dir, 'id', 'product')),
+            'devices': [os.path.join(self.dev_root, name) for name in handlers]
+        }
+
+    def rescan(self) -> Dict[str, Any]:
+        """Re-read the input devices and replace the cached snapshot"""
+        start = time.perf_counter()
+
+        controllers = []
+        try:
+            input_dirs = sorted(glob.glob(os.path.join(self.sys_root, 'input*')),
+                                key=lambda path: int(re.sub(r'\D', '', os.path.basename(path)) or 0))
+            for input_dir in input_dirs:
+                try:
+                    controller = self._describe_device(input_dir, len(controllers))
+                except OSError:
+                    continue  # Device went away mid-scan
+                if controller:
+                    controllers.append(controller)
+        except OSError as e:
+            logger.error(f"Error scanning input devices: {e}")
+
+        joysticks = sorted(glob.glob(os.path.join(self.dev_root, 'js*')))
+        snapshot = {
+            'controllers_found': len(controllers),
+            'controllers': controllers,
+            'joysticks_found': len(joysticks),
+            'joysticks': joysticks,
+            'sdl_env': {
+                'SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS': os.environ.get('SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS'),
+                'SDL_GAMECONTROLLER_ALLOW_BACKGROUND_EVENTS': os.environ.get('SDL_GAMECONTROLLER_ALLOW_BACKGROUND_EVENTS')
+            }
+        }
+
+        with self.lock:
+            if snapshot['controllers'] != self.snapshot.get('controllers'):
+                logger.info(f"Controllers: {len(controllers)} found ({', '.join(c['name'] for c in controllers) or 'none'}), "
+                            f"{len(joysticks)} joystick devices")
+            self.snapshot = snapshot
+            self.stats['scans'] += 1
+            self.stats['last_scan_ms'] = (time.perf_counter() - start) * 1000
+        return snapshot
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Current controller info (cached; no device access)"""
+        with self.lock:
+            snapshot = self.snapshot
+        return dict(snapshot, controllers=list(snapshot['controllers']), joysticks=list(snapshot['joysticks']))
+
+    def _open_inotify(self) -> Optional[int]:
+        """Watch the device directory with inotify; returns the fd, or None if unavailable"""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+            if libc.inotify_add_watch(fd, os.fsencode(self.dev_root), INOTIFY_MASK) < 0:
+                error = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(error, os.strerror(error))
+            return fd
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable for {self.dev_root}, rescanning every {self.rescan_interval}s: {e}")
+            return None
+
+    def start(self):
+        """Start watching for controllers being connected or removed"""
+        if self.running:
+            return
+        self.running = True
+        self.stopped.clear()
+        self.inotify_fd = self._open_inotify()
+        self.stats['watch_mode'] = 'inotify' if self.inotify_fd is not None else 'interval'
+
+        target = self._inotify_loop if self.inotify_fd is not None else self._interval_loop
+        self.watch_thread = threading.Thread(target=target, daemon=True)
+        self.watch_thread.start()
+
+        # The event thread only wakes us; rescans happen here so bursts are coalesced
+        threading.Thread(target=self._rescan_loop, daemon=True).start()
+
+    def _inotify_loop(self):
+        """Turn inotify events on the device directory into rescans"""
+        fd = self.inotify_fd
+        try:
+            while self.running:
+                # Wake up now and then to notice stop()
+                readable, _, _ = select.select([fd], [], [], 1.0)
+                if not readable:
+                    continue
+                try:
+                    os.read(fd, 4096)
+                except OSError as e:
+                    if e.errno == errno.EINTR:
+                        continue
+                    raise
+                self.stats['device_events'] += 1
+                self.changed.set()
+        except OSError as e:
+            logger.error(f"Controller watch stopped: {e}")
+        finally:
+            os.close(fd)
+            self.inotify_fd = None
+
+    def _interval_loop(self):
+        """Periodic rescans when inotify is unavailable"""
+        while self.running:
+            self.changed.set()
+            self.stopped.wait(self.rescan_interval)
+
+    def _rescan_loop(self):
+        """Rescan once device events have settled"""
+        while self.running:
+            self.changed.wait()
+            if not self.running:
+                break
+            # Let udev finish creating nodes and sysfs attributes, then take all pending events at once
+            time.sleep(RESCAN_SETTLE_SECONDS)
+            self.changed.clear()
+            self.rescan()
+
+    def stop(self):
+        """Stop watching"""
+        self.running = False
+        self.stopped.set()
+        self.changed.set()  # The watch thread closes the inotify fd on its way out
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get inventory statistics"""
+        with self.lock:
+            return dict(self.stats, controllers=self.snapshot.get('controllers_found', 0))
+
+
+_shared_inventory = None
+_shared_lock = threading.Lock()
+
+
+def get_controller_inventory() -> ControllerInventory:
+    """Get the process-wide controller inventory, started on first use"""
+    global _shared_inventory
+    with _shared_lock:
+        if _shared_inventory is None:
+            _shared_inventory = ControllerInventory()
+            _shared_inventory.start()
+        return _shared_inventory
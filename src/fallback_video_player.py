@@ -10,6 +10,7 @@ import threading
 import queue
 import logging
 import random
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, List, Tuple, Dict
 
@@ -17,6 +18,11 @@ import pygame
 import cv2
 import numpy as np
 
+from frame_upload import wrap_bgr_frame
+from clip_cache import ClipFrameCache
+from video_memory import VideoMemoryBudget, get_shared_budget, frame_bytes
+from clip_prefetch import TransitionStats
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,7 +32,8 @@ class CachedVideoPlayer:
     Designed for systems where hardware acceleration is not available
     """
     
-    def __init__(self, video_dir: str, display_size: Tuple[int, int] = (1280, 960)):
+    def __init__(self, video_dir: str, display_size: Tuple[int, int] = (1280, 960), cache_dir: str = None,
+                 memory_budget: VideoMemoryBudget = None):
         self.video_dir = Path(video_dir)
         self.display_size = display_size
         self.video_files = []
@@ -34,9 +41,27 @@ class CachedVideoPlayer:
         
         # Frame cache settings
         self.cache_size = 90  # Cache 3 seconds at 30fps
-        self.frame_cache = []
+        self.frame_cache = []  # Memory-mapped frame array, or a list of surfaces as fallback
         self.cache_index = 0
         self.cache_lock = threading.Lock()
+        self.current_surface = None
+        
+        # Recently played clips stay resident within the shared memory budget (LRU)
+        self.memory_budget = memory_budget or get_shared_budget()
+        self.resident_clips = OrderedDict()  # video path -> (frames, plan)
+        self.current_plan = None
+        self.resident_hits = 0
+        self.scale_buffer = None  # Display-sized target for reduced-resolution clips
+        self.scale_surface = None
+        
+        # The next clip is loaded while the current one plays and swapped in at rollover
+        self.next_clip = None  # (frames, plan, video path)
+        self.current_video_name = None
+        self.transition_stats = TransitionStats()
+        self.rollover_waits = 0  # Rollovers that looped the current clip because the next was not ready
+        
+        # Clips are decoded once to disk and memory-mapped on every later play
+        self.clip_cache = ClipFrameCache(cache_dir or str(self.video_dir / '.framecache'), display_size)
         
         # Performance settings
         self.target_fps = 30
@@ -79,12 +104,14 @@ class CachedVideoPlayer:
         else:
             logger.warning("No video files found")
     
-    def _preload_video_frames(self, video_path: str, max_frames: int = None) -> List[pygame.Surface]:
+    def _preload_video_frames(self, video_path: str, max_frames: int = None,
+                              frame_size: Tuple[int, int] = None, frame_step: int = 1) -> List[pygame.Surface]:
         """
         Pre-load video frames into memory for smooth playback
         """
         frames = []
         cap = None
+        frame_size = frame_size or self.display_size
         
         try:
             cap = cv2.VideoCapture(str(video_path))
@@ -94,7 +121,7 @@ class CachedVideoPlayer:
             
             # Get video properties
             fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            frame_count = -(-int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) // frame_step)
             
             if max_frames:
                 frame_count = min(frame_count, max_frames)
@@ -105,18 +132,17 @@ class CachedVideoPlayer:
                 ret, frame = cap.read()
                 if not ret:
                     break
+                for _ in range(frame_step - 1):
+                    cap.grab()
                 
                 # Convert frame to pygame surface
                 try:
-                    # Resize if needed
-                    if frame.shape[:2] != (self.display_size[1], self.display_size[0]):
-                        frame = cv2.resize(frame, self.display_size, interpolation=cv2.INTER_LINEAR)
-                    
-                    # Convert BGR to RGB
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    # Resize if needed (pre-optimized clips skip this)
+                    if frame.shape[:2] != (frame_size[1], frame_size[0]):
+                        frame = cv2.resize(frame, frame_size, interpolation=cv2.INTER_LINEAR)
                     
-                    # Create pygame surface
-                    surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+                    # Wrap the BGR pixels directly, no colour conversion or extra copies
+                    surface = wrap_bgr_frame(frame)
                     frames.append(surface)
                     
                     # Progress indicator
@@ -137,6 +163,80 @@ class CachedVideoPlayer:
         
         return frames
     
+    def _budget_key(self, video_path) -> str:
+        """Key for a resident clip in the shared memory budget"""
+        return f"cached:{id(self)}:{video_path}"
+    
+    def _evict_clip(self, key: str):
+        """Budget eviction callback: drop a resident clip (a playing clip is released at its next switch)"""
+        with self.cache_lock:
+            for video_path in list(self.resident_clips.keys()):
+                if self._budget_key(video_path) == key:
+                    del self.resident_clips[video_path]
+                    logger.info(f"Evicted resident clip {Path(video_path).name}")
+                    break
+    
+    def _load_clip_frames(self, video_path):
+        """
+        Get a clip's frames and cache plan, reusing a resident copy if there is one
+        
+        Frames come from the on-disk cache, or are decoded into memory if that
+        fails, at the resolution and frame rate the memory budget allows.
+        """
+        with self.cache_lock:
+            resident = self.resident_clips.get(video_path)
+            if resident is not None:
+                self.resident_clips.move_to_end(video_path)
+        if resident is not None:
+            self.memory_budget.touch(self._budget_key(video_path))
+            self.resident_hits += 1
+            return resident
+        
+        plan = self.memory_budget.plan_clip(self.display_size, self.target_fps, self.cache_size)
+        frames = self.clip_cache.load(video_path, plan['frames'], plan['frame_size'], plan['frame_step'])
+        if frames is None:
+            logger.warning(f"Clip cache unavailable for {video_path.name}, decoding into memory")
+            frames = self._preload_video_frames(video_path, plan['frames'], plan['frame_size'], plan['frame_step'])
+        
+        if len(frames) > 0:
+            self.memory_budget.reserve(self._budget_key(video_path),
+                                       len(frames) * frame_bytes(plan['frame_size']),
+                                       self._evict_clip)
+            with self.cache_lock:
+                self.resident_clips[video_path] = (frames, plan)
+        
+        return frames, plan
+    
+    def _set_clip(self, frames, plan, video_path):
+        """Make a loaded clip the one being played (caller holds cache_lock)"""
+        self.frame_cache = frames
+        self.current_video_name = Path(video_path).name
+        self.current_plan = plan
+        self.cache_index = 0
+        # Reduced frame rate clips keep every Nth frame, so each one is shown N times as long
+        self.frame_time = plan['frame_step'] / self.target_fps
+    
+    def _frame_surface(self, index: int) -> pygame.Surface:
+        """Get a displayable surface for a cached frame (mapped frames are wrapped, not copied)"""
+        frame = self.frame_cache[index]
+        if self.current_plan and tuple(self.current_plan['frame_size']) != tuple(self.display_size):
+            return self._upscale_frame(frame)
+        if isinstance(frame, pygame.Surface):
+            return frame
+        return wrap_bgr_frame(frame)
+    
+    def _upscale_frame(self, frame) -> pygame.Surface:
+        """Scale a reduced-resolution frame into the preallocated display-sized surface"""
+        if self.scale_buffer is None:
+            self.scale_buffer = np.empty((self.display_size[1], self.display_size[0], 3), dtype=np.uint8)
+            self.scale_surface = wrap_bgr_frame(self.scale_buffer)
+        
+        if isinstance(frame, pygame.Surface):
+            pygame.transform.scale(frame, self.display_size, self.scale_surface)
+        else:
+            cv2.resize(frame, self.display_size, dst=self.scale_buffer, interpolation=cv2.INTER_LINEAR)
+        return self.scale_surface
+    
     def _background_loader(self):
         """Background thread for loading video frames"""
         while self.running:
@@ -148,15 +248,21 @@ class CachedVideoPlayer:
                     continue
                 
                 # Load frames
-                frames = self._preload_video_frames(video_path, self.cache_size)
+                frames, plan = self._load_clip_frames(video_path)
                 
-                # Update cache
+                # Play the first clip right away; later clips wait for the current one to roll over
                 with self.cache_lock:
-                    self.frame_cache = frames
-                    self.cache_index = 0
+                    first_clip = len(self.frame_cache) == 0
+                    if first_clip:
+                        self._set_clip(frames, plan, video_path)
+                    elif len(frames) > 0:
+                        self.next_clip = (frames, plan, video_path)
                 
                 logger.info(f"Background loaded {len(frames)} frames")
                 
+                if first_clip:
+                    self._load_next_video()
+                
             except Exception as e:
                 logger.error(f"Error in background loader: {e}")
     
@@ -176,10 +282,9 @@ class CachedVideoPlayer:
                 logger.warning("Load queue full, skipping video load")
         else:
             # Load synchronously
-            frames = self._preload_video_frames(video_path, self.cache_size)
+            frames, plan = self._load_clip_frames(video_path)
             with self.cache_lock:
-                self.frame_cache = frames
-                self.cache_index = 0
+                self._set_clip(frames, plan, video_path)
         
         # Move to next video
         self.current_video_index = (self.current_video_index + 1) % len(self.video_files)
@@ -218,7 +323,14 @@ class CachedVideoPlayer:
             self.load_thread.join(timeout=1.0)
         
         with self.cache_lock:
-            self.frame_cache.clear()
+            self.frame_cache = []
+            self.next_clip = None
+            self.current_surface = None
+            resident_paths = list(self.resident_clips.keys())
+            self.resident_clips.clear()
+        
+        for video_path in resident_paths:
+            self.memory_budget.release(self._budget_key(video_path))
             
         logger.info("Cached video player stopped")
     
@@ -229,41 +341,61 @@ class CachedVideoPlayer:
         # Check if it's time for next frame
         if current_time - self.last_frame_time < self.frame_time:
             # Return current frame (don't advance)
-            with self.cache_lock:
-                if self.frame_cache and self.cache_index < len(self.frame_cache):
-                    return self.frame_cache[self.cache_index]
-            return None
+            return self.current_surface
         
         # Time to advance frame
+        previous_frame_time = self.last_frame_time
         self.last_frame_time = current_time
+        prefetch_next = False
         
         with self.cache_lock:
-            if not self.frame_cache:
+            if len(self.frame_cache) == 0:
                 return None
             
             if self.cache_index >= len(self.frame_cache):
-                # End of cached frames, load next video
-                self.cache_index = 0
-                self._load_next_video()
-                return None
+                if self.next_clip is not None:
+                    # Swap in the preloaded clip on this same tick
+                    self.transition_stats.record(current_time - previous_frame_time, self.frame_time)
+                    self._set_clip(*self.next_clip)
+                    self.next_clip = None
+                    prefetch_next = True
+                else:
+                    # Next clip is still loading: loop the current one rather than show nothing
+                    self.cache_index = 0
+                    self.rollover_waits += 1
             
-            frame = self.frame_cache[self.cache_index]
+            self.current_surface = self._frame_surface(self.cache_index)
             self.cache_index += 1
-            
-            return frame
+        
+        if prefetch_next:
+            self._load_next_video()
+        
+        return self.current_surface
     
     def get_stats(self) -> Dict:
         """Get player statistics"""
         with self.cache_lock:
             cache_frames = len(self.frame_cache)
             cache_position = self.cache_index
+            resident_count = len(self.resident_clips)
+            plan = self.current_plan or {'frame_size': self.display_size, 'frame_step': 1, 'degraded': None}
         
         return {
             'video_count': len(self.video_files),
-            'current_video': self.video_files[self.current_video_index].name if self.video_files else None,
+            'current_video': self.current_video_name,
             'cache_frames': cache_frames,
             'cache_position': cache_position,
-            'cache_size_mb': cache_frames * self.display_size[0] * self.display_size[1] * 3 / (1024 * 1024),
+            'cache_size_mb': cache_frames * frame_bytes(plan['frame_size']) / (1024 * 1024),
+            'cache_backend': 'mmap' if isinstance(self.frame_cache, np.ndarray) else 'memory',
+            'cache_resolution': '{}x{}'.format(*plan['frame_size']),
+            'cache_frame_step': plan['frame_step'],
+            'degraded': plan['degraded'],
+            'resident_clips': resident_count,
+            'resident_hits': self.resident_hits,
+            'transitions': self.transition_stats.get_stats(),
+            'rollover_waits': self.rollover_waits,
+            'clip_cache': self.clip_cache.get_stats(),
+            'memory_budget': self.memory_budget.get_stats(),
             'target_fps': self.target_fps
         }
 
@@ -296,9 +428,7 @@ class SimpleVideoPlayer:
                     ret, frame = cap.read()
                     if ret:
                         frame = cv2.resize(frame, self.display_size, interpolation=cv2.INTER_LINEAR)
-                        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-                        self.static_frames.append(surface)
+                        self.static_frames.append(wrap_bgr_frame(frame))
                 cap.release()
             
             logger.info(f"Created {len(self.static_frames)} static frames")
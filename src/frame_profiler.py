@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Frame-time profiler for the DoomBox kiosk loop
+Times each phase of the main loop, keeps rolling p50/p95/p99 per phase, logs a
+structured summary periodically and renders an optional on-screen HUD
+"""
+
+import os
+import sys
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+import numpy as np
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import SHOW_FPS
+except ImportError:
+    # Fallback configuration
+    SHOW_FPS = False
+
+# Main loop phases in display order; 'tick' is time spent waiting in clock.tick()
+PHASES = ('events', 'leaderboard', 'scene', 'video', 'overlay', 'hud', 'flip', 'tick')
+
+
+class FrameProfiler:
+    """
+    Per-frame phase timings for the kiosk main loop
+
+    Wrap each phase in `with profiler.phase(name):` between begin_frame() and
+    end_frame(). Phases that do not run in a frame count as 0 ms for it.
+    """
+
+    def __init__(self, window: int = 300, log_interval: float = 60.0, hud_visible: bool = None):
+        self.window = window
+        self.log_interval = log_interval
+        self.hud_visible = SHOW_FPS if hud_visible is None else hud_visible
+
+        self.samples: Dict[str, deque] = {name: deque(maxlen=window) for name in PHASES + ('busy', 'frame')}
+        self.current: Dict[str, float] = {}
+        self.frame_start = 0.0
+        self.last_frame_start = 0.0
+        self.frames = 0
+        self.last_log_time = time.perf_counter()
+
+        # HUD text is re-rendered a few times a second, not every frame
+        self.hud_surface: Optional[pygame.Surface] = None
+        self.hud_refresh_interval = 0.25
+        self.last_hud_render = 0.0
+
+    def begin_frame(self):
+        """Start timing a new frame"""
+        now = time.perf_counter()
+        if self.frame_start:
+            self.last_frame_start = self.frame_start
+        self.frame_start = now
+        self.current = {}
+
+    def pause(self):
+        """Stop the frame clock while the loop is idle (e.g. kiosk hidden during a game)"""
+        self.frame_start = 0.0
+        self.last_frame_start = 0.0
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time one phase of the current frame"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] = self.current.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def end_frame(self):
+        """Record the current frame's phase timings"""
+        for name in PHASES:
+            self.samples[name].append(self.current.get(name, 0.0))
+        self.samples['busy'].append(sum(ms for name, ms in self.current.items() if name != 'tick'))
+        if self.last_frame_start:
+            self.samples['frame'].append((self.frame_start - self.last_frame_start) * 1000)
+        self.frames += 1
+
+        now = time.perf_counter()
+        if now - self.last_log_time >= self.log_interval:
+            self.last_log_time = now
+            self.log_summary()
+
+    def percentiles(self, name: str) -> Dict[str, float]:
+        """Rolling p50/p95/p99 of a phase in milliseconds"""
+        samples = self.samples.get(name)
+        if not samples:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), (50, 95, 99))
+        return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+    def fps(self) -> float:
+        """Average frame rate over the window"""
+        frames = self.samples['frame']
+        return 1000 * len(frames) / sum(frames) if frames and sum(frames) > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Percentiles for every phase plus overall frame time"""
+        return {
+            'frames': self.frames,
+            'fps': self.fps(),
+            'frame': self.percentiles('frame'),
+            'busy': self.percentiles('busy'),
+            'phases': {name: self.percentiles(name) for name in PHASES},
+        }
+
+    def log_summary(self):
+        """Write one structured key=value line per summary, easy to grep and parse"""
+        summary = self.summary()
+        fields = [f"frames={summary['frames']}", f"fps={summary['fps']:.1f}"]
+        for name in ('frame', 'busy'):
+            fields.append(f"{name}_p50={summary[name]['p50']:.2f} {name}_p95={summary[name]['p95']:.2f} "
+                          f"{name}_p99={summary[name]['p99']:.2f}")
+        for name, pct in summary['phases'].items():
+            fields.append(f"{name}_p50={pct['p50']:.2f} {name}_p95={pct['p95']:.2f} {name}_p99={pct['p99']:.2f}")
+        logger.info("frame_profile " + " ".join(fields))
+
+    def toggle_hud(self) -> bool:
+        """Show or hide the on-screen HUD"""
+        self.hud_visible = not self.hud_visible
+        self.hud_surface = None
+        return self.hud_visible
+
+    def render_hud(self, font: pygame.font.Font) -> pygame.Surface:
+        """Get the HUD surface, re-rendering it only a few times a second"""
+        now = time.perf_counter()
+        if self.hud_surface is not None and now - self.last_hud_render < self.hud_refresh_interval:
+            return self.hud_surface
+        self.last_hud_render = now
+
+        frame = self.percentiles('frame')
+        busy = self.percentiles('busy')
+        lines = [
+            f"FPS {self.fps():5.1f}   frame p50 {frame['p50']:5.1f}  p99 {frame['p99']:5.1f} ms",
+            f"busy  p50 {busy['p50']:5.2f}  p95 {busy['p95']:5.2f}  p99 {busy['p99']:5.2f}",
+        ]
+        for name in PHASES:
+            pct = self.percentiles(name)
+            lines.append(f"{name:<11} {pct['p50']:5.2f}  {pct['p95']:5.2f}  {pct['p99']:5.2f}")
+
+        rendered = [font.render(line, True, (220, 255, 220)) for line in lines]
+        width = max(surface.get_width() for surface in rendered) + 16
+        height = sum(surface.get_height() for surface in rendered) + 12
+
+        hud = pygame.Surface((width, height), pygame.SRCALPHA)
+        hud.fill((0, 0, 0, 170))
+        y = 6
+        for surface in rendered:
+            hud.blit(surface, (8, y))
+            y += surface.get_height()
+
+        self.hud_surface = hud
+        return hud
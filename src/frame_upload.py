@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Zero-copy frame upload from OpenCV to pygame for the DoomBox video players
+Decoded BGR pixels are written straight into preallocated buffers that back
+pygame surfaces, instead of resize -> cvtColor -> swapaxes -> make_surface
+"""
+
+import logging
+from typing import Optional, Tuple, List
+
+import pygame
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+def wrap_bgr_frame(frame: np.ndarray) -> pygame.Surface:
+    """
+    Wrap a contiguous HxWx3 BGR array in a pygame surface without copying
+
+    The surface shares memory with the array (and keeps it alive), so the
+    array must not be reused while the surface is still being displayed.
+    """
+    if not frame.flags['C_CONTIGUOUS']:
+        frame = np.ascontiguousarray(frame)
+    height, width = frame.shape[:2]
+    return pygame.image.frombuffer(frame, (width, height), 'BGR')
+
+
+def legacy_frame_to_surface(frame: np.ndarray, display_size: Tuple[int, int]) -> pygame.Surface:
+    """Original conversion path, kept for comparison in the upload benchmark"""
+    if frame.shape[:2] != (display_size[1], display_size[0]):
+        frame = cv2.resize(frame, display_size, interpolation=cv2.INTER_LINEAR)
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+
+
+class FrameUploader:
+    """
+    Ring of preallocated display-sized BGR buffers, each permanently wrapped by a
+    pygame surface
+
+    Every upload writes into the next buffer in place: cv2.resize writes into it
+    directly, and pre-optimized clips that already match the display size are
+    decoded straight into it with VideoCapture.read(). The ring must be larger
+    than the number of frames that can be in flight (queued, pending and on
+    screen) so a surface is never overwritten while it is displayed.
+    """
+
+    def __init__(self, display_size: Tuple[int, int], ring_size: int = 1):
+        self.display_size = display_size
+        self.frame_shape = (display_size[1], display_size[0], 3)
+        self.ring_size = max(1, ring_size)
+
+        self.buffers: List[np.ndarray] = [np.empty(self.frame_shape, dtype=np.uint8) for _ in range(self.ring_size)]
+        self.surfaces: List[pygame.Surface] = [wrap_bgr_frame(buf) for buf in self.buffers]
+        self.index = 0
+
+        # Counters for the skip-resize fast path
+        self.direct_reads = 0
+        self.resized_uploads = 0
+        self.copied_uploads = 0
+
+    def _next_slot(self) -> int:
+        """Advance to the next ring slot"""
+        slot = self.index
+        self.index = (self.index + 1) % self.ring_size
+        return slot
+
+    def matches_display(self, width: int, height: int) -> bool:
+        """Whether a clip is already at display resolution (no resize needed)"""
+        return (width, height) == tuple(self.display_size)
+
+    def read(self, cap: cv2.VideoCapture) -> Optional[pygame.Surface]:
+        """
+        Decode the next frame from a capture directly into the ring
+
+        Returns None at end of clip.
+        """
+        slot = self.index
+        ret, frame = cap.read(self.buffers[slot])
+        if not ret:
+            return None
+
+        if frame is self.buffers[slot] or (frame.shape == self.frame_shape and
+                                           np.shares_memory(frame, self.buffers[slot])):
+            # Decoder wrote into our buffer: nothing left to do
+            self._next_slot()
+            self.direct_reads += 1
+            return self.surfaces[slot]
+
+        return self.upload(frame)
+
+    def upload(self, frame: np.ndarray) -> pygame.Surface:
+        """Write a decoded BGR frame into the next ring buffer, resizing only if needed"""
+        slot = self._next_slot()
+        buf = self.buffers[slot]
+
+        if frame.shape == self.frame_shape:
+            np.copyto(buf, frame)
+            self.copied_uploads += 1
+        else:
+            cv2.resize(frame, self.display_size, dst=buf, interpolation=cv2.INTER_LINEAR)
+            self.resized_uploads += 1
+
+        return self.surfaces[slot]
+
+    def get_stats(self) -> dict:
+        """Get upload statistics"""
+        return {
+            'ring_size': self.ring_size,
+            'ring_mb': self.ring_size * self.buffers[0].nbytes / (1024 * 1024),
+            'direct_reads': self.direct_reads,
+            'resized_uploads': self.resized_uploads,
+            'copied_uploads': self.copied_uploads,
+        }
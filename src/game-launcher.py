@@ -13,10 +13,38 @@ import time
 import threading
 import logging
 import json
-import sqlite3
+import re
+import shutil
+import hashlib
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from score_store import get_score_store, INSERT_SCORE, INSERT_SESSION_EVENT
+from score_ingest import SessionScoreIngestor, parse_levelstat_line
+from game_output import GameOutputPump
+from process_watch import ProcessExitWaiter
+from controller_inventory import get_controller_inventory
+from player_queue import PlayerQueue
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    
+    from config.config import GAME_EXIT_SETTLE_SECONDS, DISPLAY_RELEASE_TIMEOUT, GAME_READY_MARKER
+    from config.config import QUEUE_TIME_LIMIT, QUEUE_HANDOFF_SECONDS, SCORE_INGEST_BUDGET
+except ImportError:
+    # Fallback configuration
+    GAME_EXIT_SETTLE_SECONDS = 0.5
+    DISPLAY_RELEASE_TIMEOUT = 1.0
+    GAME_READY_MARKER = 'ST_Init'
+    SCORE_INGEST_BUDGET = 1.0
+    QUEUE_TIME_LIMIT = 0
+    QUEUE_HANDOFF_SECONDS = 5
+
 # Set up logging
 script_dir = os.path.dirname(os.path.abspath(__file__))
 logs_dir = os.path.join(script_dir, 'logs')
@@ -32,6 +60,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+OUTPUT_DRAIN_SECONDS = 0.2   # Wait for the last output lines to reach the score ingestor
+COMMIT_RESERVE_SECONDS = 0.2  # Part of SCORE_INGEST_BUDGET kept for the score commit
+
 class GameLauncher:
     """Handles launching and managing Doom games"""
     
@@ -40,17 +71,54 @@ class GameLauncher:
         self.base_dir = os.path.dirname(self.script_dir)  # Parent directory
         self.config_dir = os.path.join(self.base_dir, 'config')
         self.logs_dir = os.path.join(self.base_dir, 'logs')
-        self.db_path = os.path.join(self.base_dir, 'doombox_scores.db')
+        self.score_store = None
+        self.db_path = None
+        self.player_queue = None
         
         # Game process and state
         self.game_process = None
         self.current_player = None
         self.game_state = "idle"  # idle, starting, running, finished
         self.game_state_callbacks = []
+        self.score_callbacks = []
         
         # Game monitoring thread
         self.monitor_thread = None
         self.monitor_running = False
+        self.exit_waiter = None
+        self.last_exit_time = None  # time.monotonic() when the last game exit was seen
+        
+        # Launch preparation: the kiosk signals once it has let go of the display
+        self.display_released = threading.Event()
+        self.display_release_required = False
+        self.config_hash = None
+        self.config_mtime = None
+        self.launch_started = None
+        self.launch_stats = {
+            'launches': 0,
+            'config_writes': 0,
+            'display_release_timeouts': 0,
+            'last_prepare_ms': 0.0,
+            'last_display_wait_ms': 0.0,
+            'last_spawn_ms': 0.0,
+            'last_click_to_ready_ms': None
+        }
+        
+        # Per-session score ingestion
+        self.session_dir = None
+        self.score_ingestor = None
+        self.output_pump = None
+        self.output_subscribers = []
+        self.session_recorded = True
+        self.session_lock = threading.Lock()
+        self.last_session_result = None
+        
+        # Player queue scheduling
+        self.queue_running = False
+        self.queue_lock = threading.Lock()
+        self.queue_entry = None  # Queue entry of the session being played
+        self.queue_timer = None  # Pending start of the next queued player
+        self.time_limit_timer = None
         
         # Doom configuration
         self.doom_config = {
@@ -71,9 +139,15 @@ class GameLauncher:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
+        # Controller inventory is scanned once here and then follows device hotplug
+        self.controller_inventory = get_controller_inventory()
+        
         # Initialize database
         self.setup_database()
         
+        # Validate paths and write the dsda-doom config now rather than on the first launch
+        self.prepare_launch()
+        
         logger.info("GameLauncher initialized")
     
     def add_game_state_callback(self, callback):
@@ -88,6 +162,18 @@ class GameLauncher:
             except Exception as e:
                 logger.error(f"Error in game state callback: {e}")
     
+    def add_score_callback(self, callback):
+        """Add a callback to be called when a score is recorded"""
+        self.score_callbacks.append(callback)
+    
+    def _notify_score_recorded(self, player_name, score):
+        """Notify all callbacks of a new score"""
+        for callback in self.score_callbacks:
+            try:
+                callback(player_name, score)
+            except Exception as e:
+                logger.error(f"Error in score callback: {e}")
+    
     def _set_game_state(self, state):
         """Set game state and notify callbacks"""
         old_state = self.game_state
@@ -97,46 +183,48 @@ class GameLauncher:
             self._notify_game_state_change(old_state, state)
     
     def _monitor_game_process(self):
-        """Monitor game process in background thread"""
-        while self.monitor_running and self.game_process:
-            try:
-                # Check if process is still running
-                if self.game_process.poll() is None:
-                    # Game is still running
-                    if self.game_state == "starting":
-                        self._set_game_state("running")
-                    time.sleep(1)
-                else:
-                    # Game has finished
-                    exit_code = self.game_process.returncode
-                    logger.info(f"Game process finished with exit code: {exit_code}")
-                    
-                    # Log the game end
-                    if self.current_player:
-                        self.log_game_session(self.current_player, 'finished', exit_code)
-                    
-                    self._set_game_state("finished")
-                    
-                    # Clean up
-                    self.game_process = None
-                    current_player = self.current_player
-                    self.current_player = None
-                    self.monitor_running = False
-                    
-                    # After a brief pause, set back to idle (this will restore kiosk)
-                    time.sleep(3)  # Give a bit more time for cleanup
-                    self._set_game_state("idle")
-                    
-                    logger.info(f"Game session ended for player: {current_player}")
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error monitoring game process: {e}")
-                break
+        """Wait for the game process to exit, then restore the kiosk after the settle window"""
+        waiter = self.exit_waiter = ProcessExitWaiter(self.game_process)
+        try:
+            if self.game_state == "starting":
+                self._set_game_state("running")
+            
+            # Blocks on the process's pidfd, so the exit is seen immediately
+            exit_code = waiter.wait()
+            if exit_code is None or not self.monitor_running:
+                return  # Cancelled, or stop_game is handling the exit
+            
+            self.last_exit_time = time.monotonic()
+            logger.info(f"Game process finished with exit code: {exit_code} (detected via {waiter.mode})")
+            
+            # Record the score and the game end together
+            if self.current_player:
+                self._finish_session(self.current_player, 'finished', exit_code)
+            
+            self._set_game_state("finished")
+            
+            # Clean up
+            self.game_process = None
+            current_player = self.current_player
+            self.current_player = None
+            self.monitor_running = False
+            
+            # Give dsda-doom a moment to release the display, then set idle (this restores the kiosk)
+            time.sleep(GAME_EXIT_SETTLE_SECONDS)
+            self._set_game_state("idle")
+            
+            logger.info(f"Game session ended for player: {current_player}")
+            self._schedule_next_player()
+            
+        except Exception as e:
+            logger.error(f"Error monitoring game process: {e}")
+        finally:
+            waiter.close()
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         logger.info(f"Received signal {signum}, shutting down...")
+        self.stop_queue()
         self.stop_game()
         sys.exit(0)
     
@@ -154,14 +242,10 @@ class GameLauncher:
         
         # First check if any doom executable is in PATH
         for name in possible_names:
-            try:
-                result = subprocess.run(['which', name], capture_output=True, text=True)
-                if result.returncode == 0:
-                    path = result.stdout.strip()
-                    logger.info(f"Found {name} in PATH: {path}")
-                    return path
-            except:
-                pass
+            path = shutil.which(name)
+            if path:
+                logger.info(f"Found {name} in PATH: {path}")
+                return path
         
         # Then check specific paths
         for path_dir in possible_paths:
@@ -206,34 +290,11 @@ class GameLauncher:
         return '/usr/share/games/doom/doom1.wad'  # fallback
     
     def setup_database(self):
-        """Initialize the scores database"""
+        """Attach to the shared scores database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Create scores table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS scores (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    score INTEGER NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create game sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS game_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    event TEXT NOT NULL,
-                    exit_code INTEGER,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            self.score_store = get_score_store()
+            self.db_path = self.score_store.db_path
+            self.player_queue = PlayerQueue(self.score_store)
             logger.info("Database initialized successfully")
             
         except Exception as e:
@@ -249,8 +310,7 @@ class GameLauncher:
                 return False
             elif doom_exe == 'dsda-doom':
                 # Check if it's in PATH
-                result = subprocess.run(['which', 'dsda-doom'], capture_output=True, text=True)
-                if result.returncode != 0:
+                if not shutil.which('dsda-doom'):
                     logger.error("dsda-doom not found in PATH. Please install dsda-doom package.")
                     return False
             
@@ -259,6 +319,9 @@ class GameLauncher:
                 logger.error(f"DOOM WAD file not found at {self.doom_config['iwad']}")
                 logger.error("Please install doom-wad-shareware package.")
                 return False
+            if not self._is_iwad(self.doom_config['iwad']):
+                logger.error(f"{self.doom_config['iwad']} is not a valid IWAD")
+                return False
             
             logger.info("All dependencies satisfied")
             return True
@@ -307,16 +370,89 @@ save_dir """ + self.doom_config['save_dir'] + """
 demo_dir """ + self.doom_config['demo_dir'] + """
 """
             
-            with open(self.doom_config['config_file'], 'w') as f:
-                f.write(config_content)
+            # Only rewrite the file when its content would change
+            config_hash = hashlib.sha256(config_content.encode()).hexdigest()
+            config_file = self.doom_config['config_file']
+            if config_hash == self.config_hash and self._file_mtime(config_file) == self.config_mtime:
+                return True
+            
+            existing_hash = None
+            if os.path.exists(config_file):
+                with open(config_file, 'rb') as f:
+                    existing_hash = hashlib.sha256(f.read()).hexdigest()
+            
+            if existing_hash != config_hash:
+                with open(config_file, 'w') as f:
+                    f.write(config_content)
+                self.launch_stats['config_writes'] += 1
+                logger.info("dsda-doom configuration created with fullscreen enforcement and controller support")
             
-            logger.info("dsda-doom configuration created with fullscreen enforcement and controller support")
+            self.config_hash = config_hash
+            self.config_mtime = self._file_mtime(config_file)
             return True
             
         except Exception as e:
             logger.error(f"Error setting up Doom config: {e}")
             return False
     
+    def _file_mtime(self, path: str) -> Optional[int]:
+        """File modification time in ns, None if missing"""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _is_iwad(self, path: str) -> bool:
+        """Check the WAD header marks an IWAD"""
+        try:
+            with open(path, 'rb') as f:
+                return f.read(4) == b'IWAD'
+        except OSError:
+            return False
+    
+    def prepare_launch(self) -> bool:
+        """
+        Resolve the executable and IWAD and bring the dsda-doom config up to date
+        
+        Cheap when nothing changed, so launch_game calls it every time.
+        """
+        start = time.perf_counter()
+        ready = True
+        
+        executable = self.doom_config['executable']
+        if not (os.path.isfile(executable) or shutil.which(executable)):
+            self.doom_config['executable'] = self._find_doom_executable()
+            ready = False
+        
+        if not os.path.isfile(self.doom_config['iwad']):
+            self.doom_config['iwad'] = self._find_doom_wad()
+            ready = False
+        elif not self._is_iwad(self.doom_config['iwad']):
+            logger.warning(f"{self.doom_config['iwad']} does not have an IWAD header")
+        
+        self.setup_doom_config()
+        self.launch_stats['last_prepare_ms'] = (time.perf_counter() - start) * 1000
+        return ready
+    
+    def require_display_release(self):
+        """Make launches wait for release_display() before starting the game (set by the kiosk)"""
+        self.display_release_required = True
+    
+    def release_display(self):
+        """Signal that the kiosk has hidden itself and the game can take the display"""
+        self.display_released.set()
+    
+    def _on_game_ready(self, line: str):
+        """First sign of the game's main loop: record click-to-first-frame latency"""
+        if self.launch_started is None:
+            return
+        self.launch_stats['last_click_to_ready_ms'] = (time.monotonic() - self.launch_started) * 1000
+        self.launch_started = None
+        logger.info(f"Launch latency: {self.launch_stats['last_click_to_ready_ms']:.0f}ms to first game frame "
+                    f"(prepare {self.launch_stats['last_prepare_ms']:.0f}ms, "
+                    f"display {self.launch_stats['last_display_wait_ms']:.0f}ms, "
+                    f"spawn {self.launch_stats['last_spawn_ms']:.0f}ms)")
+    
     def launch_game(self, player_name: str, skill: int = 3) -> bool:
         """Launch Doom game for a player with fullscreen enforcement and controller support"""
         try:
@@ -324,15 +460,25 @@ demo_dir """ + self.doom_config['demo_dir'] + """
                 logger.warning("Game is already running")
                 return False
             
+            self.launch_started = time.monotonic()
+            self.display_released.clear()
+            
             self.current_player = player_name
             self._set_game_state("starting")
             
+            # Each session runs in its own directory so dsda-doom's levelstat.txt can be collected
+            session_id = time.strftime('%Y%m%d-%H%M%S')
+            safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', player_name)
+            self.session_dir = os.path.join(self.logs_dir, 'sessions', f"{session_id}-{safe_name}")
+            os.makedirs(self.session_dir, exist_ok=True)
+            demo_path = os.path.join(self.doom_config['demo_dir'], f"{safe_name}-{session_id}")
+            
             # Check for controllers before launching
             controllers = self.check_controllers()
             logger.info(f"Controller status: {controllers['controllers_found']} controllers, {controllers['joysticks_found']} joystick devices")
             
-            # Setup configuration before launching
-            self.setup_doom_config()
+            # Make sure paths and config are current (no-op unless something changed)
+            self.prepare_launch()
             
             # Build command line arguments with enhanced fullscreen enforcement
             cmd = [
@@ -344,7 +490,9 @@ demo_dir """ + self.doom_config['demo_dir'] + """
                 '-width', '1280',
                 '-height', '960',
                 '-fullscreen',
-                '-aspect', '1.33'
+                '-aspect', '1.33',
+                '-levelstat',  # Level summaries for score ingestion
+                '-record', demo_path
             ]
             
             logger.info(f"Launching game for player: {player_name}")
@@ -368,19 +516,35 @@ demo_dir """ + self.doom_config['demo_dir'] + """
                 'COMPIZ_OPTIONS': 'NO_EFFECTS'
             })
             
-            # Brief delay to ensure kiosk has properly minimized and freed the display
-            logger.info("Waiting for kiosk to fully minimize...")
-            time.sleep(1)
+            # Wait for the kiosk to confirm it has minimized and freed the display
+            if self.display_release_required:
+                wait_start = time.perf_counter()
+                if not self.display_released.wait(DISPLAY_RELEASE_TIMEOUT):
+                    self.launch_stats['display_release_timeouts'] += 1
+                    logger.warning("Kiosk did not release the display in time, launching anyway")
+                self.launch_stats['last_display_wait_ms'] = (time.perf_counter() - wait_start) * 1000
             
             # Launch the game with priority to ensure it gets focus
+            spawn_start = time.perf_counter()
             self.game_process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
+                errors='replace',
+                bufsize=1,
                 env=game_env,
+                cwd=self.session_dir,
                 preexec_fn=os.setsid  # Create new session to prevent interference
             )
+            self.launch_stats['last_spawn_ms'] = (time.perf_counter() - spawn_start) * 1000
+            self.launch_stats['launches'] += 1
+            
+            # Drain the game's output so the pipes never fill, scanning it for level stats
+            self.score_ingestor = SessionScoreIngestor(self.session_dir, demo_path,
+                                                       self.doom_config['executable'], self.doom_config['iwad'])
+            self.session_recorded = False
+            self._start_output_pump()
             
             # Log the game start
             self.log_game_session(player_name, 'started')
@@ -398,7 +562,7 @@ demo_dir """ + self.doom_config['demo_dir'] + """
             self._set_game_state("idle")
             return False
     
-    def stop_game(self) -> bool:
+    def stop_game(self, event: str = 'stopped') -> bool:
         """Stop the current game"""
         try:
             if self.game_process and self.game_process.poll() is None:
@@ -406,6 +570,8 @@ demo_dir """ + self.doom_config['demo_dir'] + """
                 
                 # Stop monitoring thread
                 self.monitor_running = False
+                if self.exit_waiter:
+                    self.exit_waiter.cancel()
                 
                 # Terminate the game process
                 self.game_process.terminate()
@@ -417,10 +583,11 @@ demo_dir """ + self.doom_config['demo_dir'] + """
                     logger.warning("Game didn't stop gracefully, forcing termination")
                     self.game_process.kill()
                     self.game_process.wait()
+                self.last_exit_time = time.monotonic()
                 
-                # Log the game end
+                # Record any finished levels and the game end
                 if self.current_player:
-                    self.log_game_session(self.current_player, 'stopped')
+                    self._finish_session(self.current_player, event, self.game_process.returncode)
                 
                 # Clean up
                 self.game_process = None
@@ -428,6 +595,7 @@ demo_dir """ + self.doom_config['demo_dir'] + """
                 self._set_game_state("idle")
                 
                 logger.info("Game stopped")
+                self._schedule_next_player()
                 return True
             else:
                 logger.info("No game running")
@@ -450,9 +618,9 @@ demo_dir """ + self.doom_config['demo_dir'] + """
             exit_code = self.game_process.wait()
             logger.info(f"Game finished with exit code: {exit_code}")
             
-            # Log the game end
+            # Record the score and the game end together
             if self.current_player:
-                self.log_game_session(self.current_player, 'finished', exit_code)
+                self._finish_session(self.current_player, 'finished', exit_code)
             
             return exit_code
             
@@ -460,93 +628,211 @@ demo_dir """ + self.doom_config['demo_dir'] + """
             logger.error(f"Error waiting for game: {e}")
             return None
     
+    def add_game_output_subscriber(self, callback, parser=None):
+        """Subscribe to the output of every game session (see GameOutputPump.subscribe)"""
+        self.output_subscribers.append((callback, parser))
+        if self.output_pump and self.is_game_running():
+            self.output_pump.subscribe(callback, parser)
+    
+    def _start_output_pump(self):
+        """Start draining the game's stdout and stderr into the session log"""
+        self.output_pump = GameOutputPump(self.game_process, self.session_dir)
+        self.output_pump.subscribe(self.score_ingestor.add_level, parser=parse_levelstat_line)
+        self.output_pump.subscribe(self._on_game_ready, parser=lambda line: line if GAME_READY_MARKER in line else None)
+        for callback, parser in self.output_subscribers:
+            self.output_pump.subscribe(callback, parser)
+        self.output_pump.start()
+    
+    def get_game_output_tail(self, lines: int = 50) -> list:
+        """Most recent output of the current (or last) game session"""
+        return self.output_pump.get_tail(lines) if self.output_pump else []
+    
+    def _finish_session(self, player_name: str, event: str, exit_code: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        Ingest the session's score and write it with the session end event in one transaction
+        
+        Draining output, demo replay and the commit share SCORE_INGEST_BUDGET so
+        score listeners refresh the leaderboard straight away; a commit that
+        misses the budget notifies them when it lands. Runs once per session
+        even if several paths see the exit.
+        """
+        with self.session_lock:
+            if self.session_recorded:
+                return None
+            self.session_recorded = True
+        
+        start = time.perf_counter()
+        deadline = start + SCORE_INGEST_BUDGET
+        if self.output_pump:
+            self.output_pump.close(timeout=OUTPUT_DRAIN_SECONDS)  # Let the last lines reach the ingestor
+        
+        if self.score_ingestor:
+            result = self.score_ingestor.ingest(
+                replay_timeout=max(0.1, deadline - time.perf_counter() - COMMIT_RESERVE_SECONDS),
+                crashed=exit_code is not None and exit_code != 0)
+        else:
+            result = {'score': None, 'levels': [], 'source': None}
+        
+        statements = []
+        if result['score'] is not None:
+            statements.append((INSERT_SCORE, (player_name, result['score'])))
+        statements.append((INSERT_SESSION_EVENT, (player_name, event, exit_code)))
+        
+        try:
+            future = self.score_store.submit(statements)
+            future.result(timeout=max(0.05, deadline - time.perf_counter()))
+        except FutureTimeoutError:
+            logger.warning(f"Session end for {player_name} not committed within {SCORE_INGEST_BUDGET}s, "
+                           f"announcing the score once it is")
+            future.add_done_callback(lambda done: self._session_committed(player_name, result, start, done))
+        except Exception as e:
+            logger.error(f"Error recording game session end: {e}")
+        else:
+            self._session_committed(player_name, result, start)
+        
+        # The queue write waits on the store too, so it goes after the score
+        self._close_queue_entry(event)
+        return result
+    
+    def _session_committed(self, player_name: str, result: Dict[str, Any], start: float, future=None):
+        """Announce a committed session result (future is set when the commit finished late)"""
+        if future is not None and future.exception():
+            logger.error(f"Error recording game session end: {future.exception()}")
+            return
+        
+        result['total_ms'] = (time.perf_counter() - start) * 1000
+        self.last_session_result = result
+        
+        if result['score'] is not None:
+            logger.info(f"Recorded score for {player_name}: {result['score']} from {len(result['levels'])} "
+                        f"level(s) via {result['source']} in {result['total_ms']:.0f}ms")
+            self._notify_score_recorded(player_name, result['score'])
+        else:
+            logger.info(f"No finished levels for {player_name}, no score recorded")
+    
+    def request_game(self, player_name: str, skill: int = 3, time_limit: Optional[int] = None,
+                     source: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue a player for the next free session; starts right away if the kiosk is idle
+        
+        Returns the queue result (accepted, duplicate, position, eta_seconds, depth).
+        Without a queue (no database) the game is launched directly, as before.
+        """
+        if not self.player_queue:
+            launched = self.launch_game(player_name, skill)
+            return {'accepted': launched, 'duplicate': False, 'position': 0, 'eta_seconds': 0, 'depth': 0}
+        
+        result = self.player_queue.enqueue(player_name, skill, time_limit or QUEUE_TIME_LIMIT or None, source)
+        if result['accepted'] and not result['duplicate']:
+            self._schedule_next_player(delay=0)
+        return result
+    
+    def start_queue(self):
+        """Start running queued sessions back to back (the kiosk calls this once it is ready)"""
+        self.queue_running = True
+        self._schedule_next_player(delay=0)
+    
+    def stop_queue(self):
+        """Stop starting queued sessions; waiting players stay queued"""
+        self.queue_running = False
+        with self.queue_lock:
+            for timer in (self.queue_timer, self.time_limit_timer):
+                if timer:
+                    timer.cancel()
+            self.queue_timer = None
+    
+    def _schedule_next_player(self, delay: float = None):
+        """Start the next queued player after the handoff delay"""
+        if not self.queue_running or not self.player_queue or not self.player_queue.get_snapshot()['depth']:
+            return
+        with self.queue_lock:
+            if self.queue_timer and self.queue_timer.is_alive():
+                return  # Already scheduled
+            self.queue_timer = threading.Timer(QUEUE_HANDOFF_SECONDS if delay is None else delay,
+                                               self._start_next_player)
+            self.queue_timer.daemon = True
+            self.queue_timer.start()
+    
+    def _start_next_player(self):
+        """Launch the player at the front of the queue if nothing is running"""
+        with self.queue_lock:
+            self.queue_timer = None
+            if not self.queue_running or self.game_state != "idle" or self.is_game_running():
+                return
+            entry = self.player_queue.claim_next()
+            if not entry:
+                return
+            self.queue_entry = entry
+        
+        logger.info(f"Starting queued session for {entry['player_name']}")
+        if not self.launch_game(entry['player_name'], entry['skill']):
+            self._close_queue_entry('failed')
+            self._schedule_next_player()
+            return
+        
+        if entry['time_limit']:
+            self.time_limit_timer = threading.Timer(entry['time_limit'], self._on_time_limit, args=(entry['id'],))
+            self.time_limit_timer.daemon = True
+            self.time_limit_timer.start()
+    
+    def _on_time_limit(self, entry_id: int):
+        """End a queued session that ran past its time limit"""
+        if self.queue_entry and self.queue_entry['id'] == entry_id and self.is_game_running():
+            logger.info(f"Time limit reached for {self.queue_entry['player_name']}")
+            self.stop_game(event='time_limit')
+    
+    def _close_queue_entry(self, event: str):
+        """Mark the current queue entry finished (done, stopped, time_limit, failed)"""
+        if self.time_limit_timer:
+            self.time_limit_timer.cancel()
+            self.time_limit_timer = None
+        entry, self.queue_entry = self.queue_entry, None
+        if entry:
+            try:
+                self.player_queue.finish(entry['id'], 'done' if event == 'finished' else event)
+            except Exception as e:
+                logger.error(f"Error updating player queue: {e}")
+    
     def log_game_session(self, player_name: str, event: str, exit_code: Optional[int] = None):
-        """Log game session events"""
+        """Log game session events (queued; committed by the store's writer thread)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Create game_sessions table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS game_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    event TEXT NOT NULL,
-                    exit_code INTEGER,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Insert session event
-            cursor.execute('''
-                INSERT INTO game_sessions (player_name, event, exit_code)
-                VALUES (?, ?, ?)
-            ''', (player_name, event, exit_code))
-            
-            conn.commit()
-            conn.close()
+            future = self.score_store.log_session(player_name, event, exit_code)
+            future.add_done_callback(self._log_write_error)
             
         except Exception as e:
             logger.error(f"Error logging game session: {e}")
     
-    def check_controllers(self) -> Dict[str, Any]:
-        """Check for available game controllers and joysticks"""
-        controller_info = {
-            'controllers_found': 0,
-            'controllers': [],
-            'joysticks_found': 0,
-            'joysticks': []
-        }
-        
+    def record_score(self, player_name: str, score: int) -> bool:
+        """Queue a score for a player; score listeners are notified once it is committed"""
         try:
-            # Check for joystick devices in /dev/input
-            import glob
-            js_devices = glob.glob('/dev/input/js*')
-            controller_info['joysticks_found'] = len(js_devices)
-            controller_info['joysticks'] = js_devices
-            
-            # Try to get more detailed info using pygame
-            try:
-                import pygame
-                pygame.init()
-                pygame.joystick.init()
-                
-                num_joysticks = pygame.joystick.get_count()
-                controller_info['pygame_joysticks'] = num_joysticks
-                
-                for i in range(num_joysticks):
-                    try:
-                        joystick = pygame.joystick.Joystick(i)
-                        joystick.init()
-                        controller_info['controllers'].append({
-                            'id': i,
-                            'name': joystick.get_name(),
-                            'axes': joystick.get_numaxes(),
-                            'buttons': joystick.get_numbuttons(),
-                            'hats': joystick.get_numhats()
-                        })
-                        controller_info['controllers_found'] += 1
-                    except Exception as e:
-                        logger.error(f"Error checking joystick {i}: {e}")
-                
-                pygame.quit()
-                
-            except ImportError:
-                logger.warning("Pygame not available for controller detection")
+            future = self.score_store.add_score(player_name, score)
             
-            # Check SDL controller environment
-            controller_info['sdl_env'] = {
-                'SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS': os.environ.get('SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS'),
-                'SDL_GAMECONTROLLER_ALLOW_BACKGROUND_EVENTS': os.environ.get('SDL_GAMECONTROLLER_ALLOW_BACKGROUND_EVENTS')
-            }
+            def on_committed(done):
+                if done.exception():
+                    logger.error(f"Error recording score: {done.exception()}")
+                    return
+                logger.info(f"Recorded score for {player_name}: {score}")
+                self._notify_score_recorded(player_name, score)
             
-            logger.info(f"Controller check: {controller_info['controllers_found']} controllers, {controller_info['joysticks_found']} joystick devices")
+            future.add_done_callback(on_committed)
+            return True
             
+        except Exception as e:
+            logger.error(f"Error recording score: {e}")
+            return False
+    
+    def _log_write_error(self, future):
+        """Report a failed background database write"""
+        if future.exception():
+            logger.error(f"Error logging game session: {future.exception()}")
+    
+    def check_controllers(self) -> Dict[str, Any]:
+        """Check for available game controllers and joysticks (cached snapshot, kept current by inotify)"""
+        try:
+            return self.controller_inventory.get_snapshot()
         except Exception as e:
             logger.error(f"Error checking controllers: {e}")
-            controller_info['error'] = str(e)
-        
-        return controller_info
+            return {'controllers_found': 0, 'controllers': [], 'joysticks_found': 0, 'joysticks': [], 'error': str(e)}
 
     def get_game_status(self) -> Dict[str, Any]:
         """Get current game status including controller info"""
@@ -556,7 +842,10 @@ demo_dir """ + self.doom_config['demo_dir'] + """
             'current_player': self.current_player,
             'process_id': self.game_process.pid if self.game_process else None,
             'doom_config': self.doom_config,
-            'controllers': self.check_controllers()
+            'controllers': self.check_controllers(),
+            'game_output': self.output_pump.get_stats() if self.output_pump else None,
+            'launch': dict(self.launch_stats),
+            'queue': self.player_queue.get_snapshot() if self.player_queue else None
         }
         return status
     
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Game output pump for DoomBox
+Drains a game process's stdout/stderr line by line so the pipes never fill,
+writes it to a rotating per-session log, keeps a tail in memory and hands
+lines to subscribers without ever stalling the game
+"""
+
+import os
+import sys
+import time
+import queue
+import logging
+import threading
+import logging.handlers
+from collections import deque
+from typing import Callable, Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import GAME_LOG_MAX_BYTES, GAME_LOG_BACKUPS, GAME_OUTPUT_TAIL_LINES
+except ImportError:
+    # Fallback configuration
+    GAME_LOG_MAX_BYTES = 1024 * 1024
+    GAME_LOG_BACKUPS = 2
+    GAME_OUTPUT_TAIL_LINES = 200
+
+GAME_LOG_FILE = 'game.log'
+EVENT_QUEUE_SIZE = 1024  # Lines waiting for subscribers before new ones are dropped
+
+
+class GameOutputPump:
+    """
+    Streams a subprocess's stdout and stderr
+
+    One reader thread per pipe only reads, logs and enqueues, so the game can
+    always write. Subscribers run on a separate dispatcher thread; if they fall
+    behind, lines are dropped for them (and counted) rather than blocking the
+    readers. A subscriber may pass a parser so it only sees parsed events.
+    """
+
+    def __init__(self, process, log_dir: str, tail_lines: int = None,
+                 max_bytes: int = None, backup_count: int = None):
+        self.process = process
+        self.log_path = os.path.join(log_dir, GAME_LOG_FILE)
+        self.tail = deque(maxlen=tail_lines or GAME_OUTPUT_TAIL_LINES)
+        self.tail_lock = threading.Lock()
+
+        self.subscribers: List[tuple] = []
+        self.events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+        # Standalone logger so sessions don't accumulate in the logging registry
+        os.makedirs(log_dir, exist_ok=True)
+        self.handler = logging.handlers.RotatingFileHandler(
+            self.log_path,
+            maxBytes=max_bytes or GAME_LOG_MAX_BYTES,
+            backupCount=GAME_LOG_BACKUPS if backup_count is None else backup_count
+        )
+        self.handler.setFormatter(logging.Formatter('%(asctime)s %(stream)s: %(message)s'))
+        self.game_log = logging.Logger(f"game-output:{process.pid}")
+        self.game_log.addHandler(self.handler)
+        self.game_log.propagate = False
+
+        self.readers: List[threading.Thread] = []
+        self.dispatcher = None
+
+        self.stats = {
+            'lines': {'stdout': 0, 'stderr': 0},
+            'bytes': 0,
+            'dropped_events': 0,
+            'subscriber_errors': 0
+        }
+
+    def subscribe(self, callback: Callable, parser: Optional[Callable[[str], Any]] = None):
+        """
+        Receive game output: callback(stream, line), or callback(event) for each
+        line parser(line) turns into something other than None
+        """
+        self.subscribers.append((callback, parser))
+
+    def start(self):
+        """Start the reader and dispatcher threads"""
+        for name, stream in (('stdout', self.process.stdout), ('stderr', self.process.stderr)):
+            if stream is None:
+                continue
+            thread = threading.Thread(target=self._read_stream, args=(name, stream), daemon=True)
+            thread.start()
+            self.readers.append(thread)
+
+        self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self.dispatcher.start()
+
+    def _read_stream(self, name: str, stream):
+        """Read one pipe until EOF"""
+        try:
+            for line in stream:
+                line = line.rstrip('\r\n')
+                self.stats['lines'][name] += 1
+                self.stats['bytes'] += len(line) + 1
+                self.game_log.info(line, extra={'stream': name})
+                with self.tail_lock:
+                    self.tail.append((name, line))
+                try:
+                    self.events.put_nowait((name, line))
+                except queue.Full:
+                    self.stats['dropped_events'] += 1
+        except (ValueError, OSError):
+            pass  # Stream closed under us
+
+    def _dispatch(self):
+        """Deliver queued lines to subscribers"""
+        while True:
+            item = self.events.get()
+            if item is None:
+                break
+            name, line = item
+            for callback, parser in self.subscribers:
+                try:
+                    if parser is None:
+                        callback(name, line)
+                    else:
+                        event = parser(line)
+                        if event is not None:
+                            callback(event)
+                except Exception as e:
+                    self.stats['subscriber_errors'] += 1
+                    logger.error(f"Error in game output subscriber: {e}")
+
+    def get_tail(self, lines: int = None) -> List[str]:
+        """Most recent output lines, oldest first"""
+        with self.tail_lock:
+            tail = list(self.tail)
+        if lines:
+            tail = tail[-lines:]
+        return [f"{name}: {line}" for name, line in tail]
+
+    def close(self, timeout: float = 0.5):
+        """Wait (timeout in total) for the pipes to reach EOF, deliver what is queued and close the log"""
+        deadline = time.monotonic() + timeout
+        for thread in self.readers:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        if self.dispatcher:
+            try:
+                self.events.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                pass
+            self.dispatcher.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        self.game_log.removeHandler(self.handler)
+        self.handler.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get output pump statistics"""
+        return {
+            'lines': dict(self.stats['lines']),
+            'bytes': self.stats['bytes'],
+            'dropped_events': self.stats['dropped_events'],
+            'subscriber_errors': self.stats['subscriber_errors'],
+            'queued_events': self.events.qsize(),
+            'log_path': self.log_path
+        }
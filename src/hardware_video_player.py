@@ -20,13 +20,18 @@ import numpy as np
 from PIL import Image
 import cv2
 
+from frame_upload import FrameUploader
+from video_memory import VideoMemoryBudget, get_shared_budget, frame_bytes
+from clip_prefetch import ClipPrefetcher, PrefetchedClip, TransitionStats
+
 logger = logging.getLogger(__name__)
 
 
 class HardwareVideoPlayer:
     """Hardware-accelerated video player optimized for ARM64 kiosk systems"""
     
-    def __init__(self, video_dir: str, display_size: Tuple[int, int] = (1280, 960)):
+    def __init__(self, video_dir: str, display_size: Tuple[int, int] = (1280, 960),
+                 memory_budget: VideoMemoryBudget = None):
         self.video_dir = Path(video_dir)
         self.display_size = display_size
         self.current_surface = None
@@ -38,17 +43,50 @@ class HardwareVideoPlayer:
         self.frame_buffer_size = 3  # Number of frames to buffer
         self.use_threading = True
         
+        # The upload ring counts against the shared video memory budget
+        self.memory_budget = memory_budget or get_shared_budget()
+        self.budget_key = f"hardware:{id(self)}"
+        if (self.frame_buffer_size + 3) * frame_bytes(display_size) > self.memory_budget.budget_bytes:
+            logger.warning("Video memory budget tight, buffering a single decoded frame")
+            self.frame_buffer_size = 1
+        
         # Threading components
         self.frame_queue = queue.Queue(maxsize=self.frame_buffer_size)
+        
+        # Preallocated surfaces that decoded frames are written into in place.
+        # Ring covers queued frames + pending + on screen + the one being decoded.
+        self.uploader = FrameUploader(display_size, ring_size=self.frame_buffer_size + 3)
         self.decode_thread = None
         self.running = False
         
         # Current video state
         self.current_video_cap = None
+        self.current_video_name = None
+        self.clip_serial = 0      # Bumped on every clip switch; tags queued frames
+        self.preroll_frame = None  # First frame of the new clip, decoded by the prefetcher
+        
+        # Second decoder that opens the next clip while the current one plays
+        self.prefetcher = ClipPrefetcher(self._open_clip)
+        self.transition_stats = TransitionStats()
+        self.displayed_serial = None
+        self.switch_ms = 0.0
         self.video_fps = 30
         self.frame_time = 1.0 / self.video_fps
         self.last_frame_time = 0
         
+        # Presentation clock for the current clip (frame N is due at clip_start_time + N * frame_time)
+        self.clip_start_time = 0
+        self.clip_frame_index = 0
+        self.pending_frame = None  # Decoded frame that is not due yet
+        self.display_interval = 1.0 / 30  # Measured time between get_frame() calls
+        self.last_display_call = 0
+        
+        # Frame pacing counters
+        self.frames_decoded = 0
+        self.frames_displayed = 0
+        self.frames_skipped = 0  # Passed over with grab() (late, or between display ticks)
+        self.frames_late = 0     # Decoded but superseded before they were displayed
+        
         # Hardware acceleration detection
         self.hw_decode_available = self._detect_hardware_acceleration()
         
@@ -130,8 +168,8 @@ class HardwareVideoPlayer:
             logger.error(f"Error creating video capture: {e}")
             return None
     
-    def _optimize_cv2_settings(self, cap: cv2.VideoCapture):
-        """Optimize OpenCV capture settings for performance"""
+    def _optimize_cv2_settings(self, cap: cv2.VideoCapture) -> Optional[float]:
+        """Optimize OpenCV capture settings for performance, returning the clip FPS"""
         try:
             # Set buffer size to minimum to reduce latency
             cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
@@ -147,40 +185,116 @@ class HardwareVideoPlayer:
             
             logger.info(f"Video properties: {width}x{height} @ {fps:.1f}fps")
             
-            # Update our FPS tracking
-            if fps > 0:
-                self.video_fps = fps
-                self.frame_time = 1.0 / fps
+            # Ignore bogus container values
+            if 0 < fps <= 120:
+                return fps
             
         except Exception as e:
             logger.warning(f"Could not optimize capture settings: {e}")
+        return None
+    
+    def _open_clip(self, video_path: str):
+        """Open and configure a decoder for a clip (runs on the prefetch thread)"""
+        cap = self._create_hardware_video_capture(video_path)
+        if not cap:
+            return None
+        return cap, self._optimize_cv2_settings(cap)
+    
+    def _start_clip_clock(self, fps: Optional[float]):
+        """Start the presentation clock for a new clip where the previous clip's frames run out"""
+        next_due = self._frame_due_time(self.clip_frame_index) if self.clip_start_time else 0
+        if fps:
+            self.video_fps = fps
+            self.frame_time = 1.0 / fps
+        self.clip_start_time = max(time.perf_counter(), next_due)
+        self.clip_frame_index = 0
+    
+    def _frame_due_time(self, index: int) -> float:
+        """Presentation time of a frame in the current clip"""
+        return self.clip_start_time + index * self.frame_time
+    
+    def _decode_stride(self) -> int:
+        """How many clip frames pass per displayed frame (e.g. 2 for a 60fps clip on a 30Hz loop)"""
+        return max(1, int(self.display_interval / self.frame_time + 0.1))
+    
+    def _grab_frames(self, cap: cv2.VideoCapture, count: int) -> bool:
+        """Advance past frames without decoding them; returns False at end of clip"""
+        for _ in range(count):
+            if self.preroll_frame is not None:
+                # The pre-rolled first frame is already decoded; skipping it just drops it
+                self.preroll_frame = None
+            elif not cap.grab():
+                return False
+            self.clip_frame_index += 1
+            self.frames_skipped += 1
+        return True
+    
+    def _skip_late_frames(self, cap: cv2.VideoCapture) -> bool:
+        """
+        Skip frames that are already too late to be shown, using grab() so they
+        are never decoded into pixels, resized or colour-converted.
+        
+        Returns False if the clip ended while skipping.
+        """
+        now = time.perf_counter()
+        late = int((now - self._frame_due_time(self.clip_frame_index)) / self.frame_time)
+        return self._grab_frames(cap, late) if late > 0 else True
+    
+    def _read_surface(self, cap: cv2.VideoCapture) -> Optional[pygame.Surface]:
+        """Decode the next frame into the upload ring, starting with a new clip's pre-rolled frame"""
+        if self.preroll_frame is not None:
+            frame, self.preroll_frame = self.preroll_frame, None
+            return self.uploader.upload(frame)
+        return self.uploader.read(cap)
+    
+    def _record_transition(self, serial: int, current_time: float):
+        """Measure how long the last frame of the previous clip stayed on screen"""
+        if self.displayed_serial is not None and serial != self.displayed_serial:
+            self.transition_stats.record(current_time - self.last_frame_time,
+                                         max(self.display_interval, self.frame_time))
+        self.displayed_serial = serial
     
     def _decode_thread_worker(self):
-        """Background thread for video decoding"""
+        """Background thread for paced video decoding"""
         while self.running:
             try:
-                if not self.current_video_cap or not self.current_video_cap.isOpened():
+                cap = self.current_video_cap
+                if not cap or not cap.isOpened():
                     time.sleep(0.1)
+                    self._load_next_video()
                     continue
                 
-                ret, frame = self.current_video_cap.read()
+                # Drop frames we are already too late for without decoding them
+                if not self._skip_late_frames(cap):
+                    self._load_next_video()
+                    continue
+                
+                # Decode straight into the next preallocated surface
+                surface = self._read_surface(cap)
                 
-                if not ret:
-                    # Video ended, load next video
+                if surface is None:
+                    # Video ended, swap in the prefetched clip
                     self._load_next_video()
                     continue
                 
-                # Convert and resize frame efficiently
-                surface = self._convert_frame_to_surface(frame)
+                due_time = self._frame_due_time(self.clip_frame_index)
+                self.clip_frame_index += 1
                 
                 if surface:
-                    # Try to add to queue, skip if full
-                    try:
-                        self.frame_queue.put(surface, timeout=0.001)
-                    except queue.Full:
-                        # Skip frame if queue is full
-                        pass
-                
+                    self.frames_decoded += 1
+                    
+                    # Block until there is room; the bounded queue paces the decoder
+                    while self.running:
+                        try:
+                            self.frame_queue.put((due_time, surface, self.clip_serial), timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+
+                # Frames between two display ticks would never be shown
+                if not self._grab_frames(cap, self._decode_stride() - 1):
+                    self._load_next_video()
+
             except Exception as e:
                 logger.error(f"Error in decode thread: {e}")
                 time.sleep(0.1)
@@ -188,47 +302,56 @@ class HardwareVideoPlayer:
     def _convert_frame_to_surface(self, frame) -> Optional[pygame.Surface]:
         """Efficiently convert OpenCV frame to pygame surface"""
         try:
-            # Resize frame if needed (this should be pre-done for optimized videos)
-            if frame.shape[:2] != (self.display_size[1], self.display_size[0]):
-                frame = cv2.resize(frame, self.display_size, interpolation=cv2.INTER_LINEAR)
-            
-            # Convert BGR to RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Create pygame surface
-            surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            
-            return surface
+            # Resize (if needed) straight into a preallocated BGR-backed surface
+            return self.uploader.upload(frame)
             
         except Exception as e:
             logger.error(f"Error converting frame: {e}")
             return None
     
+    def _next_video_path(self) -> str:
+        """Advance the playlist and return the clip to play after the current one"""
+        video_path = str(self.video_files[self.current_video_index])
+        
+        # Move to next video
+        self.current_video_index = (self.current_video_index + 1) % len(self.video_files)
+        
+        # Reshuffle when we've gone through all videos
+        if self.current_video_index == 0:
+            random.shuffle(self.video_files)
+            logger.info("Reshuffled video playlist")
+        
+        return video_path
+    
     def _load_next_video(self):
-        """Load the next video in the sequence"""
+        """Swap to the next clip, using the decoder prefetched while the current clip played"""
         if not self.video_files:
             return
             
         try:
-            # Release current video
-            if self.current_video_cap:
-                self.current_video_cap.release()
-            
-            # Get next video
-            video_path = str(self.video_files[self.current_video_index])
-            self.current_video_cap = self._create_hardware_video_capture(video_path)
+            switch_start = time.perf_counter()
+            clip = self.prefetcher.take(timeout=5.0)
             
-            if self.current_video_cap:
-                self._optimize_cv2_settings(self.current_video_cap)
-                logger.info(f"Loaded video: {self.video_files[self.current_video_index].name}")
+            if clip is None:
+                # Nothing prefetched yet (first clip) or the prefetch failed: open synchronously
+                video_path = self._next_video_path()
+                opened = self._open_clip(video_path)
+                clip = PrefetchedClip(video_path, opened[0], opened[1], None, 0.0) if opened else None
             
-            # Move to next video
-            self.current_video_index = (self.current_video_index + 1) % len(self.video_files)
+            old_cap = self.current_video_cap
+            if clip:
+                self.current_video_cap = clip.cap
+                self.preroll_frame = clip.first_frame
+                self.current_video_name = Path(clip.video_path).name
+                self.clip_serial += 1
+                self._start_clip_clock(clip.fps)
+                logger.info(f"Loaded video: {self.current_video_name}")
+            else:
+                self.current_video_cap = None
+            self.switch_ms = (time.perf_counter() - switch_start) * 1000
             
-            # Reshuffle when we've gone through all videos
-            if self.current_video_index == 0:
-                random.shuffle(self.video_files)
-                logger.info("Reshuffled video playlist")
+            # Start preparing the following clip; the old decoder is released on that thread too
+            self.prefetcher.prefetch(self._next_video_path(), release_cap=old_cap)
                 
         except Exception as e:
             logger.error(f"Error loading next video: {e}")
@@ -241,6 +364,7 @@ class HardwareVideoPlayer:
             return False
             
         self.running = True
+        self.memory_budget.reserve(self.budget_key, self.uploader.ring_size * frame_bytes(self.display_size))
         
         # Load first video
         self._load_next_video()
@@ -262,47 +386,87 @@ class HardwareVideoPlayer:
             
         if self.current_video_cap:
             self.current_video_cap.release()
+        self.prefetcher.cancel()
             
         # Clear frame queue
+        self.pending_frame = None
         while not self.frame_queue.empty():
             try:
                 self.frame_queue.get_nowait()
             except queue.Empty:
                 break
+        
+        self.memory_budget.release(self.budget_key)
                 
         logger.info("Video player stopped")
     
     def get_frame(self) -> Optional[pygame.Surface]:
-        """Get the current video frame"""
-        current_time = time.time()
+        """Get the video frame due at the current time"""
+        current_time = time.perf_counter()
+        
+        # Track the display loop rate so the decoder only decodes frames that will be shown
+        if self.last_display_call:
+            interval = current_time - self.last_display_call
+            if interval < 0.5:
+                self.display_interval = self.display_interval * 0.9 + interval * 0.1
+        self.last_display_call = current_time
         
         if self.use_threading:
-            # Get frame from buffer queue
-            try:
-                surface = self.frame_queue.get_nowait()
-                self.current_surface = surface
+            # Take the newest frame that is due; older due frames were never shown
+            newest = None
+            while True:
+                if self.pending_frame is None:
+                    try:
+                        self.pending_frame = self.frame_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                
+                due_time, surface, serial = self.pending_frame
+                if due_time > current_time:
+                    break
+                
+                if newest is not None:
+                    self.frames_late += 1
+                newest = surface
+                newest_serial = serial
+                self.pending_frame = None
+            
+            if newest is not None:
+                self._record_transition(newest_serial, current_time)
+                self.current_surface = newest
                 self.last_frame_time = current_time
-                return surface
-            except queue.Empty:
-                # Return last frame if queue is empty
-                return self.current_surface
+                self.frames_displayed += 1
+            
+            # Return last frame if nothing new is due
+            return self.current_surface
         else:
             # Synchronous frame reading
             if not self.current_video_cap or not self.current_video_cap.isOpened():
                 return self.current_surface
             
             # Check if it's time for next frame
-            if current_time - self.last_frame_time < self.frame_time:
+            if self._frame_due_time(self.clip_frame_index) > current_time:
                 return self.current_surface
             
-            ret, frame = self.current_video_cap.read()
+            if not self._skip_late_frames(self.current_video_cap):
+                self._load_next_video()
+            
+            surface = self._read_surface(self.current_video_cap) if self.current_video_cap else None
             
-            if not ret:
+            if surface is None:
+                # Clip ended: show the next clip's pre-rolled frame on this same tick
                 self._load_next_video()
-                return self.current_surface
+                if not self.current_video_cap:
+                    return self.current_surface
+                surface = self._read_surface(self.current_video_cap)
+                if surface is None:
+                    return self.current_surface
             
-            surface = self._convert_frame_to_surface(frame)
+            self.clip_frame_index += 1
             if surface:
+                self._record_transition(self.clip_serial, current_time)
+                self.frames_decoded += 1
+                self.frames_displayed += 1
                 self.current_surface = surface
                 self.last_frame_time = current_time
                 
@@ -312,11 +476,20 @@ class HardwareVideoPlayer:
         """Get performance statistics"""
         return {
             'video_count': len(self.video_files),
-            'current_video': self.video_files[self.current_video_index].name if self.video_files else None,
+            'current_video': self.current_video_name,
             'hardware_acceleration': self.hw_decode_available,
             'threading_enabled': self.use_threading,
             'queue_size': self.frame_queue.qsize() if self.use_threading else 0,
-            'fps': self.video_fps
+            'fps': self.video_fps,
+            'frames_decoded': self.frames_decoded,
+            'frames_displayed': self.frames_displayed,
+            'frames_dropped': self.frames_skipped + self.frames_late,
+            'frames_skipped': self.frames_skipped,
+            'frames_late': self.frames_late,
+            'upload': self.uploader.get_stats(),
+            'transitions': dict(self.transition_stats.get_stats(), last_switch_ms=self.switch_ms),
+            'prefetch': self.prefetcher.get_stats(),
+            'memory_budget': self.memory_budget.get_stats()
         }
 
 
@@ -8,7 +8,6 @@ Uses only Puffin fonts for consistent visual style
 import pygame
 import qrcode
 import json
-import sqlite3
 import subprocess
 import time
 import threading
@@ -24,7 +23,13 @@ from pathlib import Path
 import cv2
 import numpy as np
 import importlib.util
+from contextlib import contextmanager
 from fallback_video_player import create_video_player
+from leaderboard_cache import LeaderboardCache
+from retained_ui import RetainedScene, GlyphCache
+from frame_profiler import FrameProfiler
+from score_store import get_score_store
+from telemetry import TelemetryPublisher, read_soc_temperature, TELEMETRY_ENABLED
 
 # Enhanced imports for MQTT and game integration will be loaded after logger setup
 
@@ -132,6 +137,22 @@ class CleanUIRenderer:
         self.blink_timer = 0
         self.pulse_timer = 0
 
+        # Rendered text cache (text + shadow pre-merged)
+        self.glyph_cache = GlyphCache(max_entries=256)
+
+        # Gradient surfaces keyed on (size, colours, orientation, dither)
+        self.gradient_cache = {}
+
+    @contextmanager
+    def target(self, surface):
+        """Temporarily route all drawing to another surface (e.g. a retained layer)"""
+        previous = self.screen
+        self.screen = surface
+        try:
+            yield surface
+        finally:
+            self.screen = previous
+
     def draw_rounded_rect(self, rect, radius=12, color=None, border_color=None, border_width=0):
         """Draw a rounded rectangle with optional border"""
         if color:
@@ -148,33 +169,48 @@ class CleanUIRenderer:
 
     def draw_text_with_shadow(self, text, font, color, pos, shadow_color=None, shadow_offset=(2, 2)):
         """Draw text with subtle shadow for better readability"""
-        if shadow_color:
-            shadow_surf = font.render(text, True, shadow_color)
-            self.screen.blit(shadow_surf, (pos[0] + shadow_offset[0], pos[1] + shadow_offset[1]))
-        
-        text_surf = font.render(text, True, color)
-        self.screen.blit(text_surf, pos)
-        return text_surf.get_rect(topleft=pos)
+        surf, origin, size = self.glyph_cache.get(font, text, color, shadow_color, shadow_offset)
+        self.screen.blit(surf, (pos[0] - origin[0], pos[1] - origin[1]))
+        return pygame.Rect(pos, size)
 
-    def draw_gradient_background(self, rect, color1, color2, vertical=True):
-        """Draw a subtle gradient background"""
-        surf = pygame.Surface((rect[2], rect[3]))
+    def _build_gradient_surface(self, size, color1, color2, vertical=True, dither=False):
+        """Build a gradient surface in one vectorized pass with NumPy"""
+        width, height = size
+        length = height if vertical else width
+        
+        # Same blend as the per-line version: blend = i / length
+        blend = (np.arange(length, dtype=np.float32) / length)[:, None]
+        ramp = (np.array(color1[:3], dtype=np.float32) * (1 - blend) +
+                np.array(color2[:3], dtype=np.float32) * blend)
+        
+        # surfarray layout is (width, height, 3)
         if vertical:
-            for y in range(rect[3]):
-                blend = y / rect[3]
-                color = [
-                    int(color1[i] * (1 - blend) + color2[i] * blend)
-                    for i in range(3)
-                ]
-                pygame.draw.line(surf, color, (0, y), (rect[2], y))
+            pixels = np.broadcast_to(ramp[None, :, :], (width, height, 3))
         else:
-            for x in range(rect[2]):
-                blend = x / rect[2]
-                color = [
-                    int(color1[i] * (1 - blend) + color2[i] * blend)
-                    for i in range(3)
-                ]
-                pygame.draw.line(surf, color, (x, 0), (x, rect[3]))
+            pixels = np.broadcast_to(ramp[:, None, :], (width, height, 3))
+        
+        if dither:
+            # Ordered 4x4 Bayer dither spreads the rounding error to hide banding
+            bayer = np.array([[0, 8, 2, 10],
+                              [12, 4, 14, 6],
+                              [3, 11, 1, 9],
+                              [15, 7, 13, 5]], dtype=np.float32)
+            threshold = (bayer + 0.5) / 16
+            threshold = np.tile(threshold, (width // 4 + 1, height // 4 + 1))[:width, :height]
+            pixels = pixels + threshold[:, :, None]
+        
+        pixels = np.clip(np.floor(pixels), 0, 255).astype(np.uint8)
+        return pygame.surfarray.make_surface(pixels)
+
+    def draw_gradient_background(self, rect, color1, color2, vertical=True, dither=False):
+        """Draw a subtle gradient background (built once per size/colours and cached)"""
+        key = ((rect[2], rect[3]), tuple(color1), tuple(color2), vertical, dither)
+        surf = self.gradient_cache.get(key)
+        if surf is None:
+            surf = self._build_gradient_surface((rect[2], rect[3]), color1, color2, vertical, dither)
+            if len(self.gradient_cache) >= 8:
+                self.gradient_cache.pop(next(iter(self.gradient_cache)))
+            self.gradient_cache[key] = surf
         
         self.screen.blit(surf, (rect[0], rect[1]))
 
@@ -207,9 +243,15 @@ class DoomBoxKiosk:
         # Application state
         self.running = True
         self.clock = pygame.time.Clock()
+        self.profiler = FrameProfiler()  # F3 toggles the frame-time HUD
+        self.hud_font = None
+        self.hud_rect = None
         self.form_url = "http://shmeglsdoombox.spoon.rip"
         self.video_paused = False  # Track video playback state
         self.kiosk_hidden = False  # Track if kiosk is hidden for game
+        self.kiosk_wake = threading.Event()  # Set when the kiosk is restored after a game
+        self.pending_exit_time = None  # Game exit time, until the first kiosk frame after it
+        self.last_exit_to_frame_ms = None
         
         # Setup directories first
         self.setup_directories()
@@ -223,6 +265,7 @@ class DoomBoxKiosk:
         # Initialize components
         self.setup_qr_code()
         self.setup_database()
+        self.setup_retained_scene()
         self.setup_hardware_video_player()
         
         # Initialize game launcher and MQTT client
@@ -357,26 +400,18 @@ class DoomBoxKiosk:
             self.qr_surface.blit(placeholder_text, text_rect)
 
     def setup_database(self):
-        """Initialize scores database"""
+        """Attach to the shared scores database"""
         try:
-            self.db_path = os.path.join(self.base_dir, 'doombox_scores.db')
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS scores (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    score INTEGER NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            self.score_store = get_score_store()
+            self.db_path = self.score_store.db_path
             logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Database setup error: {e}")
+            self.db_path = os.path.join(self.base_dir, 'doombox_scores.db')
+        
+        # Leaderboard is served from memory and refreshed only when scores change;
+        # each player appears once, with their best score
+        self.leaderboard = LeaderboardCache(self.db_path, limit=8, distinct_players=True)
 
     def setup_hardware_video_player(self):
         """Setup optimized video player with hardware acceleration fallback"""
@@ -411,20 +446,9 @@ class DoomBoxKiosk:
             self.video_player = None
 
     def get_top_scores(self, limit=10):
-        """Get top scores from database"""
+        """Get top scores from the in-memory leaderboard cache"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT player_name, score FROM scores 
-                ORDER BY score DESC, timestamp ASC 
-                LIMIT ?
-            ''', (limit,))
-            
-            scores = cursor.fetchall()
-            conn.close()
-            return scores
+            return self.leaderboard.get_top_scores(limit)
         except Exception as e:
             logger.error(f"Database query error: {e}")
             return [("PLAYER", 0) for _ in range(3)]  # Dummy data
@@ -464,12 +488,28 @@ class DoomBoxKiosk:
                 self.crown_icon = None
                 logger.warning("Crown icon not found")
             
+            # Pre-tint icons once instead of copying and tinting them every frame
+            self.trophy_tinted = self._tint_icon(self.trophy_icon, self.ui.COLORS['GOLD_PURPLE'])
+            self.crown_tinted = self._tint_icon(self.crown_icon, self.ui.COLORS['GOLD_PURPLE'])
+            self.skull_mirrored = pygame.transform.flip(self.skull_icon, True, False) if self.skull_icon else None
+            
             logger.info("Icon setup complete")
         except Exception as e:
             logger.error(f"Icon setup error: {e}")
             self.skull_icon = None
             self.trophy_icon = None
             self.crown_icon = None
+            self.trophy_tinted = None
+            self.crown_tinted = None
+            self.skull_mirrored = None
+
+    def _tint_icon(self, icon, color):
+        """Return a tinted copy of an icon"""
+        if not icon:
+            return None
+        tinted = icon.copy()
+        tinted.fill(color, special_flags=pygame.BLEND_MULT)
+        return tinted
 
     def setup_game_integration(self):
         """Initialize game launcher and MQTT integration"""
@@ -487,6 +527,10 @@ class DoomBoxKiosk:
             
             # Add game state callback to handle video playback
             self.game_launcher.add_game_state_callback(self._on_game_state_change)
+            self.game_launcher.require_display_release()
+            
+            # Refresh the leaderboard when the launcher records a score
+            self.game_launcher.add_score_callback(self.leaderboard.on_score_update)
             
             logger.info("Game launcher initialized")
             
@@ -496,19 +540,17 @@ class DoomBoxKiosk:
             # Connect game launcher to MQTT client
             self.mqtt_client.set_game_launcher(self.game_launcher)
             
+            # Refresh the leaderboard on MQTT score updates
+            self.mqtt_client.add_score_callback(self.leaderboard.on_score_update)
+            
             # Connect to MQTT broker in a separate thread
             def connect_mqtt():
                 try:
+                    # Status is published on every (re)connect by the client itself
                     if self.mqtt_client.connect():
                         logger.info("✅ MQTT client connected successfully")
-                        # Publish initial status
-                        try:
-                            self.mqtt_client._publish_system_status()
-                        except:
-                            # Fallback if direct method doesn't work
-                            pass
                     else:
-                        logger.warning("❌ Failed to connect to MQTT broker")
+                        logger.warning("❌ MQTT broker not reachable yet, retrying in the background")
                 except Exception as e:
                     logger.error(f"MQTT connection error: {e}")
             
@@ -517,6 +559,11 @@ class DoomBoxKiosk:
             mqtt_thread = threading.Thread(target=connect_mqtt, daemon=True)
             mqtt_thread.start()
             
+            self.setup_telemetry()
+            
+            # Start queued players (including any left waiting from before a restart)
+            self.game_launcher.start_queue()
+            
             logger.info("Game integration setup complete")
             
         except Exception as e:
@@ -525,10 +572,80 @@ class DoomBoxKiosk:
             self.game_launcher = None
             self.mqtt_client = None
     
+    def setup_telemetry(self):
+        """Publish kiosk health over MQTT: retained keyframes on an interval, deltas on change"""
+        if not TELEMETRY_ENABLED or not self.mqtt_client:
+            self.telemetry = None
+            return
+        
+        self.telemetry = TelemetryPublisher(self.mqtt_client.publish_telemetry)
+        self.telemetry.add_source('frame', self._telemetry_frame)
+        self.telemetry.add_source('video', self._telemetry_video)
+        self.telemetry.add_source('database', self._telemetry_database)
+        self.telemetry.add_source('game', self._telemetry_game)
+        self.telemetry.add_source('system', lambda: {
+            'soc_temp_c': read_soc_temperature(),
+            'mqtt_outbox_depth': self.mqtt_client.outbox.get_stats()['depth'] if self.mqtt_client.outbox else None
+        })
+        
+        # Queue changes go out straight away rather than at the next sample
+        if self.game_launcher and self.game_launcher.player_queue:
+            self.game_launcher.player_queue.add_listener(lambda snapshot: self.telemetry.notify())
+        self.telemetry.start()
+    
+    def _telemetry_frame(self):
+        """Kiosk frame rate and frame-time percentiles (none while a game has the display)"""
+        if self.kiosk_hidden:
+            return {'kiosk_hidden': True, 'fps': None, 'frame_p50_ms': None, 'frame_p95_ms': None, 'frame_p99_ms': None}
+        frame = self.profiler.percentiles('frame')
+        return {
+            'kiosk_hidden': False,
+            'fps': self.profiler.fps(),
+            'frame_p50_ms': frame['p50'],
+            'frame_p95_ms': frame['p95'],
+            'frame_p99_ms': frame['p99']
+        }
+    
+    def _telemetry_video(self):
+        """Video decode counters from whichever player is active"""
+        player = self.video_player
+        if not player:
+            return {'video_player': None, 'video_frames_decoded': None, 'video_frames_dropped': None}
+        stats = player.get_stats()
+        return {
+            'video_player': type(player).__name__,
+            'video_frames_decoded': stats.get('frames_decoded'),
+            'video_frames_dropped': stats.get('frames_dropped')
+        }
+    
+    def _telemetry_database(self):
+        """Score database read/write latency"""
+        stats = self.score_store.get_stats()
+        return {
+            'db_query_p50_ms': stats['query_p50_ms'],
+            'db_query_p95_ms': stats['query_p95_ms'],
+            'db_commit_ms': stats['last_commit_ms'],
+            'leaderboard_refresh_ms': self.leaderboard.get_stats()['last_refresh_ms']
+        }
+    
+    def _telemetry_game(self):
+        """Game state and queue depth"""
+        if not self.game_launcher:
+            return {'game_state': None, 'current_player': None, 'queue_depth': None}
+        queue = self.game_launcher.player_queue
+        return {
+            'game_state': self.game_launcher.get_game_state(),
+            'current_player': self.game_launcher.current_player,
+            'queue_depth': queue.get_snapshot()['depth'] if queue else None
+        }
+    
     def _on_game_state_change(self, old_state, new_state, player_name):
         """Handle game state changes - properly close kiosk when game starts"""
         logger.info(f"Game state changed: {old_state} -> {new_state} (player: {player_name})")
         
+        if getattr(self, 'telemetry', None):
+            self.telemetry.notify()
+        
         if new_state in ["starting", "running"]:
             # Game is starting or running - properly hide kiosk and stop all resources
             logger.info("Game starting - hiding kiosk and stopping all resources for game")
@@ -556,12 +673,14 @@ class DoomBoxKiosk:
             self.video_paused = True
             self.kiosk_hidden = True
             
-        elif new_state in ["idle", "finished"]:
-            # Game is finished or idle - restore kiosk and restart video
-            logger.info("Game finished - fully restoring kiosk and restarting all components")
+            # Let the launcher start the game now that the display is free
+            if self.game_launcher:
+                self.game_launcher.release_display()
             
-            # Wait a moment for game to fully exit and release resources
-            time.sleep(2)
+        elif new_state == "idle" and self.kiosk_hidden:
+            # Game is over and the launcher's settle window has passed - restore kiosk and restart video
+            logger.info("Game finished - fully restoring kiosk and restarting all components")
+            self.pending_exit_time = self.game_launcher.last_exit_time if self.game_launcher else None
             
             # Restore kiosk display - just make sure window is restored
             try:
@@ -575,9 +694,13 @@ class DoomBoxKiosk:
             # Restart video player
             self.setup_hardware_video_player()
             
+            # Screen contents are stale after the game, force a full redraw
+            self.static_frame_drawn = False
+            
             # Resume video playback and show kiosk
             self.video_paused = False
             self.kiosk_hidden = False
+            self.kiosk_wake.set()
             logger.info("Video playback and kiosk fully resumed")
 
     def draw_doom_header(self, title_text, x, y):
@@ -592,22 +715,16 @@ class DoomBoxKiosk:
             middle_text = title_text[1:] if len(title_text) > 1 else ""
             last_char = ""
         
-        # Render each part
+        # Render each part with a black drop shadow (larger offset for more dramatic effect)
         parts = []
-        if first_char:
-            first_surf = self.font_doom_left.render(first_char, True, (220, 50, 50))  # Doom red color
-            parts.append(first_surf)
-        
-        if middle_text:
-            middle_surf = self.font_doom_text.render(middle_text, True, (220, 50, 50))  # Doom red color
-            parts.append(middle_surf)
-        
-        if last_char:
-            last_surf = self.font_doom_right.render(last_char, True, (220, 50, 50))  # Doom red color
-            parts.append(last_surf)
+        for font, text in ((self.font_doom_left, first_char),
+                           (self.font_doom_text, middle_text),
+                           (self.font_doom_right, last_char)):
+            if text:
+                parts.append(self.ui.glyph_cache.get(font, text, (220, 50, 50), (0, 0, 0), (4, 4)))  # Doom red color
         
         # Calculate total width
-        total_width = sum(part.get_width() for part in parts)
+        total_width = sum(size[0] for _, _, size in parts)
         
         # Add skull icon spacing
         skull_spacing = 80 if self.skull_icon else 0
@@ -619,319 +736,409 @@ class DoomBoxKiosk:
         # Draw left skull
         if self.skull_icon:
             skull_y = y + 10  # Slightly lower to align with text
-            self.screen.blit(self.skull_icon, (start_x, skull_y))
+            self.ui.screen.blit(self.skull_icon, (start_x, skull_y))
         
-        # Draw text parts with proper black drop shadow
+        # Draw text parts (shadow is pre-merged into each cached surface)
         current_x = start_x + skull_spacing
-        for i, part in enumerate(parts):
-            # Get the original text for shadow rendering
-            if i == 0 and first_char:
-                shadow_text = self.font_doom_left.render(first_char, True, (0, 0, 0))  # Black shadow
-            elif i == len(parts) - 1 and last_char:
-                shadow_text = self.font_doom_right.render(last_char, True, (0, 0, 0))  # Black shadow
-            else:
-                shadow_text = self.font_doom_text.render(middle_text, True, (0, 0, 0))  # Black shadow
-            
-            # Draw black drop shadow (larger offset for more dramatic effect)
-            self.screen.blit(shadow_text, (current_x + 4, y + 4))
-            
-            # Draw main text
-            self.screen.blit(part, (current_x, y))
-            current_x += part.get_width()
+        for surf, origin, size in parts:
+            self.ui.screen.blit(surf, (current_x - origin[0], y - origin[1]))
+            current_x += size[0]
         
         # Draw right skull (mirrored)
-        if self.skull_icon:
+        if self.skull_mirrored:
             skull_y = y + 10  # Slightly lower to align with text
-            mirrored_skull = pygame.transform.flip(self.skull_icon, True, False)  # Flip horizontally
-            self.screen.blit(mirrored_skull, (start_x + total_width_with_skulls - 64, skull_y))
+            self.ui.screen.blit(self.skull_mirrored, (start_x + total_width_with_skulls - 64, skull_y))
         
         return total_width_with_skulls
 
-    def draw_main_screen(self):
-        """Draw the main kiosk screen with purple color scheme and visible video background"""
+    def setup_retained_scene(self):
+        """Compute the static layout once and register the retained UI layers"""
+        content_y = self.ui.LAYOUT['HEADER_HEIGHT'] + self.ui.LAYOUT['MARGIN']
+        content_height = self.DISPLAY_SIZE[1] - content_y - self.ui.LAYOUT['MARGIN']
         
-        # Background - Hardware-accelerated video (only if not paused)
-        if self.video_player and not self.video_paused:
-            video_frame = self.video_player.get_frame()
-            if video_frame:
-                # Apply subtle purple tint to video instead of heavy darkening
-                self.screen.blit(video_frame, (0, 0))
-                
-                # Light purple overlay for better contrast but still visible video
-                video_overlay = pygame.Surface(self.DISPLAY_SIZE)
-                video_overlay.fill(self.ui.COLORS['DARK_PURPLE'])
-                video_overlay.set_alpha(60)  # Much lighter overlay
-                self.screen.blit(video_overlay, (0, 0))
-            else:
-                # Gradient background with purple theme
-                self.ui.draw_gradient_background(
-                    (0, 0, self.DISPLAY_SIZE[0], self.DISPLAY_SIZE[1]),
-                    self.ui.COLORS['OFF_BLACK'],
-                    self.ui.COLORS['DARK_PURPLE']
-                )
-        else:
-            # Show static background when video is paused or unavailable
+        # Left side - QR Code section
+        qr_section_width = 400
+        qr_section_x = self.ui.LAYOUT['MARGIN']
+        
+        # Right side - Leaderboard section
+        scores_section_x = qr_section_x + qr_section_width + self.ui.LAYOUT['MARGIN']
+        scores_section_width = self.DISPLAY_SIZE[0] - scores_section_x - self.ui.LAYOUT['MARGIN']
+        
+        # The player queue strip shares the bottom of the leaderboard panel
+        queue_height = 90
+        
+        self.layout_rects = {
+            'header': pygame.Rect(0, 0, self.DISPLAY_SIZE[0], content_y),
+            'qr': pygame.Rect(qr_section_x, content_y, qr_section_width, content_height),
+            'scores_panel': pygame.Rect(scores_section_x, content_y, scores_section_width, content_height),
+            'scores': pygame.Rect(scores_section_x, content_y, scores_section_width, content_height - queue_height),
+            'queue': pygame.Rect(scores_section_x, content_y + content_height - queue_height,
+                                 scores_section_width, queue_height),
+        }
+        
+        # Overlay over the video is allocated once and reused every frame
+        self.video_overlay = pygame.Surface(self.DISPLAY_SIZE)
+        self.video_overlay.fill(self.ui.COLORS['DARK_PURPLE'])
+        self.video_overlay.set_alpha(60)  # Much lighter overlay
+        
+        # Static background shown when there is no video frame
+        self.static_background = pygame.Surface(self.DISPLAY_SIZE)
+        with self.ui.target(self.static_background):
             self.ui.draw_gradient_background(
                 (0, 0, self.DISPLAY_SIZE[0], self.DISPLAY_SIZE[1]),
                 self.ui.COLORS['OFF_BLACK'],
-                self.ui.COLORS['DARK_PURPLE']
+                self.ui.COLORS['DARK_PURPLE'],
+                dither=True
             )
-            
-            # If video is paused due to game, show a message
-            if self.video_paused:
-                game_status_text = "GAME IN PROGRESS"
-                game_status_surface = self.font_large.render(game_status_text, True, self.ui.COLORS['GOLD_PURPLE'])
-                status_rect = game_status_surface.get_rect(center=(self.DISPLAY_SIZE[0]//2, self.DISPLAY_SIZE[1]//2))
-                
-                # Add background for better visibility
-                bg_rect = pygame.Rect(status_rect.x - 20, status_rect.y - 10, status_rect.width + 40, status_rect.height + 20)
-                bg_surface = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(bg_surface, (*self.ui.COLORS['OFF_BLACK'], 180), (0, 0, bg_rect.width, bg_rect.height), border_radius=12)
-                self.screen.blit(bg_surface, (bg_rect.x, bg_rect.y))
-                
-                self.screen.blit(game_status_surface, status_rect)
-                
-                # Show current player if available
-                if hasattr(self, 'game_launcher') and self.game_launcher and self.game_launcher.current_player:
-                    player_text = f"Player: {self.game_launcher.current_player}"
-                    player_surface = self.font_medium.render(player_text, True, self.ui.COLORS['LIGHT_PURPLE'])
-                    player_rect = player_surface.get_rect(center=(self.DISPLAY_SIZE[0]//2, self.DISPLAY_SIZE[1]//2 + 60))
-                    self.screen.blit(player_surface, player_rect)
-                
-                return  # Don't draw the normal kiosk interface when game is running
-
-        # === HEADER SECTION ===
-        # Remove header background div - let header text appear directly on video
+        self.static_frame_drawn = False  # Whether the screen already holds a full static frame
         
-        # Main title with Doom 2016 font and skull icons (no background)
-        title_y = 20
-        self.draw_doom_header(
-            "Slaughter with Shmegl",
-            self.DISPLAY_SIZE[0]//2,
-            title_y
-        )
+        self.scene = RetainedScene(self.DISPLAY_SIZE)
+        self.scene.add_layer('header', self.layout_rects['header'], self._build_header_layer)
+        self.scene.add_layer('qr', self.layout_rects['qr'], self._build_qr_layer)
+        self.scene.add_layer('scores', self.layout_rects['scores'], self._build_scores_layer)
+        self.scene.add_layer('queue', self.layout_rects['queue'], self._build_queue_layer)
+        logger.info("Retained UI scene initialized")
 
-        # Subtitle
-        subtitle_y = title_y + 95
-        self.ui.draw_text_with_shadow(
-            "Get the high score on Doom to win a free tattoo from Petra",
-            self.font_subtitle,
-            self.ui.COLORS['WARNING_PURPLE'],
-            (self.DISPLAY_SIZE[0]//2 - self.font_subtitle.size("Get the high score on Doom to win a free tattoo from Petra")[0]//2, subtitle_y),
-            self.ui.COLORS['OFF_BLACK'],
-            (2, 2)
-        )
-
-        # === MAIN CONTENT AREA ===
-        content_y = self.ui.LAYOUT['HEADER_HEIGHT'] + self.ui.LAYOUT['MARGIN']
-        content_height = self.DISPLAY_SIZE[1] - content_y - self.ui.LAYOUT['MARGIN']
-
-        # Left side - QR Code section
-        qr_section_width = 400
-        qr_section_x = self.ui.LAYOUT['MARGIN']
-        qr_section_rect = (qr_section_x, content_y, qr_section_width, content_height)
-        
-        # QR code rounded background box with 50% opacity
-        qr_bg_surface = pygame.Surface((qr_section_rect[2], qr_section_rect[3]), pygame.SRCALPHA)
-        qr_bg_color = (*self.ui.COLORS['OVERLAY_DARK'], 128)  # 50% opacity (128/255)
-        pygame.draw.rect(qr_bg_surface, qr_bg_color, (0, 0, qr_section_rect[2], qr_section_rect[3]), border_radius=self.ui.LAYOUT['BORDER_RADIUS'])
-        self.screen.blit(qr_bg_surface, (qr_section_rect[0], qr_section_rect[1]))
+    def _draw_section_panel(self, rect):
+        """Draw a rounded 50% opacity section background with border"""
+        panel_surface = pygame.Surface((rect[2], rect[3]), pygame.SRCALPHA)
+        panel_color = (*self.ui.COLORS['OVERLAY_DARK'], 128)  # 50% opacity (128/255)
+        pygame.draw.rect(panel_surface, panel_color, (0, 0, rect[2], rect[3]), border_radius=self.ui.LAYOUT['BORDER_RADIUS'])
+        self.ui.screen.blit(panel_surface, (rect[0], rect[1]))
         
         # Optional border
         self.ui.draw_rounded_rect(
-            qr_section_rect,
+            rect,
             self.ui.LAYOUT['BORDER_RADIUS'],
             None,
             self.ui.COLORS['BORDER_LIGHT'],
             2
         )
 
-        # QR section title - split into two lines
-        qr_title_y = content_y + self.ui.LAYOUT['PADDING']
-        qr_title_lines = [
-            "Scan the QR code to enter",
-            "your name and play"
-        ]
-        for i, line in enumerate(qr_title_lines):
-            line_y = qr_title_y + i * 30
-            self.ui.draw_text_with_shadow(
-                line,
-                self.font_medium,
-                self.ui.COLORS['PURPLE_BLUE'],
-                (qr_section_x + qr_section_width//2 - self.font_medium.size(line)[0]//2, line_y),
-                self.ui.COLORS['OFF_BLACK']
-            )
-
-        # QR Code - Properly centered in the section with extra space for two-line title
-        qr_y = qr_title_y + 80
-        qr_x = qr_section_x + (qr_section_width - self.ui.LAYOUT['QR_SIZE']) // 2
-        
-        # QR background with purple tint
-        qr_bg_rect = (qr_x - 15, qr_y - 15, self.ui.LAYOUT['QR_SIZE'] + 30, self.ui.LAYOUT['QR_SIZE'] + 30)
-        self.ui.draw_rounded_rect(qr_bg_rect, 12, self.ui.COLORS['OFF_WHITE'])
-        
-        # Add subtle purple border
-        self.ui.draw_rounded_rect(qr_bg_rect, 12, None, self.ui.COLORS['LIGHT_PURPLE'], 3)
-        
-        # Center the QR code perfectly
-        qr_centered_x = qr_section_x + (qr_section_width - self.ui.LAYOUT['QR_SIZE']) // 2
-        qr_centered_y = qr_y
-        self.screen.blit(self.qr_surface, (qr_centered_x, qr_centered_y))
-
-        # URL below QR - centered
-        url_y = qr_centered_y + self.ui.LAYOUT['QR_SIZE'] + 25
-        url_lines = [
-            "shmeglsdoombox",
-            ".spoon.rip"
-        ]
-        for i, line in enumerate(url_lines):
-            line_y = url_y + i * 25
-            self.ui.draw_text_with_shadow(
-                line,
-                self.font_small,
-                self.ui.COLORS['LIGHT_GRAY'],
-                (qr_section_x + qr_section_width//2 - self.font_small.size(line)[0]//2, line_y),
-                self.ui.COLORS['OFF_BLACK']
+    def _build_header_layer(self, surface):
+        """Build the title and subtitle layer"""
+        with self.ui.target(surface):
+            # Main title with Doom 2016 font and skull icons (no background)
+            title_y = 20
+            self.draw_doom_header(
+                "Slaughter with Shmegl",
+                self.DISPLAY_SIZE[0]//2,
+                title_y
             )
 
-        # Instagram requirement text
-        instagram_y = url_y + 60
-        instagram_lines = [
-            "Contestants must follow petra on",
-            "Instagram @shmegl & share their",
-            "last post to be able to win"
-        ]
-        for i, line in enumerate(instagram_lines):
-            line_y = instagram_y + i * 20
+            # Subtitle
+            subtitle_y = title_y + 95
+            subtitle = "Get the high score on Doom to win a free tattoo from Petra"
             self.ui.draw_text_with_shadow(
-                line,
-                self.font_tiny,
-                self.ui.COLORS['MEDIUM_GRAY'],
-                (qr_section_x + qr_section_width//2 - self.font_tiny.size(line)[0]//2, line_y),
-                self.ui.COLORS['OFF_BLACK']
+                subtitle,
+                self.font_subtitle,
+                self.ui.COLORS['WARNING_PURPLE'],
+                (self.DISPLAY_SIZE[0]//2 - self.font_subtitle.size(subtitle)[0]//2, subtitle_y),
+                self.ui.COLORS['OFF_BLACK'],
+                (2, 2)
             )
 
-        # Right side - Leaderboard section
-        scores_section_x = qr_section_x + qr_section_width + self.ui.LAYOUT['MARGIN']
-        scores_section_width = self.DISPLAY_SIZE[0] - scores_section_x - self.ui.LAYOUT['MARGIN']
-        scores_section_rect = (scores_section_x, content_y, scores_section_width, content_height)
+    def _build_qr_layer(self, surface):
+        """Build the QR code panel layer"""
+        qr_section_rect = self.layout_rects['qr']
+        qr_section_x, content_y, qr_section_width, _ = qr_section_rect
         
-        # Scores rounded background box with 50% opacity
-        scores_bg_surface = pygame.Surface((scores_section_rect[2], scores_section_rect[3]), pygame.SRCALPHA)
-        scores_bg_color = (*self.ui.COLORS['OVERLAY_DARK'], 128)  # 50% opacity (128/255)
-        pygame.draw.rect(scores_bg_surface, scores_bg_color, (0, 0, scores_section_rect[2], scores_section_rect[3]), border_radius=self.ui.LAYOUT['BORDER_RADIUS'])
-        self.screen.blit(scores_bg_surface, (scores_section_rect[0], scores_section_rect[1]))
-        
-        # Optional border
-        self.ui.draw_rounded_rect(
-            scores_section_rect,
-            self.ui.LAYOUT['BORDER_RADIUS'],
-            None,
-            self.ui.COLORS['BORDER_LIGHT'],
-            2
-        )
+        with self.ui.target(surface):
+            self._draw_section_panel(qr_section_rect)
 
-        # Leaderboard title with trophy icon
-        scores_title_y = content_y + self.ui.LAYOUT['PADDING']
-        title_text = "TOP SCORES"
-        title_width = self.font_large.size(title_text)[0]
-        
-        # Center the title text
-        title_x = scores_section_x + scores_section_width//2 - title_width//2
-        
-        # Draw trophy icons on either side of the text
-        if self.trophy_icon:
-            trophy_y = scores_title_y + 5  # Slightly lower to align with text
-            trophy_spacing = 15  # Space between text and trophies
+            # QR section title - split into two lines
+            qr_title_y = content_y + self.ui.LAYOUT['PADDING']
+            qr_title_lines = [
+                "Scan the QR code to enter",
+                "your name and play"
+            ]
+            for i, line in enumerate(qr_title_lines):
+                line_y = qr_title_y + i * 30
+                self.ui.draw_text_with_shadow(
+                    line,
+                    self.font_medium,
+                    self.ui.COLORS['PURPLE_BLUE'],
+                    (qr_section_x + qr_section_width//2 - self.font_medium.size(line)[0]//2, line_y),
+                    self.ui.COLORS['OFF_BLACK']
+                )
+
+            # QR Code - Properly centered in the section with extra space for two-line title
+            qr_y = qr_title_y + 80
+            qr_x = qr_section_x + (qr_section_width - self.ui.LAYOUT['QR_SIZE']) // 2
             
-            # Tint the trophy icons gold
-            trophy_tinted = self.trophy_icon.copy()
-            trophy_tinted.fill(self.ui.COLORS['GOLD_PURPLE'], special_flags=pygame.BLEND_MULT)
+            # QR background with purple tint
+            qr_bg_rect = (qr_x - 15, qr_y - 15, self.ui.LAYOUT['QR_SIZE'] + 30, self.ui.LAYOUT['QR_SIZE'] + 30)
+            self.ui.draw_rounded_rect(qr_bg_rect, 12, self.ui.COLORS['OFF_WHITE'])
             
-            # Left trophy (before text)
-            self.screen.blit(trophy_tinted, (title_x - trophy_spacing - 32, trophy_y))
+            # Add subtle purple border
+            self.ui.draw_rounded_rect(qr_bg_rect, 12, None, self.ui.COLORS['LIGHT_PURPLE'], 3)
             
-            # Right trophy (after text)
-            self.screen.blit(trophy_tinted, (title_x + title_width + trophy_spacing, trophy_y))
+            # Center the QR code perfectly
+            surface.blit(self.qr_surface, (qr_x, qr_y))
+
+            # URL below QR - centered
+            url_y = qr_y + self.ui.LAYOUT['QR_SIZE'] + 25
+            url_lines = [
+                "shmeglsdoombox",
+                ".spoon.rip"
+            ]
+            for i, line in enumerate(url_lines):
+                line_y = url_y + i * 25
+                self.ui.draw_text_with_shadow(
+                    line,
+                    self.font_small,
+                    self.ui.COLORS['LIGHT_GRAY'],
+                    (qr_section_x + qr_section_width//2 - self.font_small.size(line)[0]//2, line_y),
+                    self.ui.COLORS['OFF_BLACK']
+                )
+
+            # Instagram requirement text
+            instagram_y = url_y + 60
+            instagram_lines = [
+                "Contestants must follow petra on",
+                "Instagram @shmegl & share their",
+                "last post to be able to win"
+            ]
+            for i, line in enumerate(instagram_lines):
+                line_y = instagram_y + i * 20
+                self.ui.draw_text_with_shadow(
+                    line,
+                    self.font_tiny,
+                    self.ui.COLORS['MEDIUM_GRAY'],
+                    (qr_section_x + qr_section_width//2 - self.font_tiny.size(line)[0]//2, line_y),
+                    self.ui.COLORS['OFF_BLACK']
+                )
+
+    def _build_scores_layer(self, surface):
+        """Build the leaderboard panel layer from the current top scores"""
+        scores_section_rect = self.layout_rects['scores']
+        scores_section_x, content_y, scores_section_width, _ = scores_section_rect
+        scores = self.scene.layers['scores'].key or ()
         
-        # Draw title text (centered)
-        self.ui.draw_text_with_shadow(
-            title_text,
-            self.font_large,
-            self.ui.COLORS['GOLD_PURPLE'],
-            (title_x, scores_title_y),
-            self.ui.COLORS['OFF_BLACK']
-        )
+        with self.ui.target(surface):
+            self._draw_section_panel(self.layout_rects['scores_panel'])
 
-        # Score entries
-        scores = self.get_top_scores(8)  # Show top 8 for clean layout
-        scores_start_y = scores_title_y + 60
-        line_height = 50
-
-        for i, (player_name, score) in enumerate(scores):
-            entry_y = scores_start_y + i * line_height
-            
-            # Rank colors with purple theme and proper icons
-            if i == 0:
-                rank_color = self.ui.COLORS['GOLD_PURPLE']
-                name_color = self.ui.COLORS['GOLD_PURPLE']
-                rank_icon = self.crown_icon
-            elif i == 1:
-                rank_color = self.ui.COLORS['LIGHT_PURPLE']
-                name_color = self.ui.COLORS['LIGHT_PURPLE']
-                rank_icon = None  # No specific icon for 2nd place
-            elif i == 2:
-                rank_color = self.ui.COLORS['WARNING_PURPLE']
-                name_color = self.ui.COLORS['WARNING_PURPLE']
-                rank_icon = None  # No specific icon for 3rd place
-            else:
-                rank_color = self.ui.COLORS['MEDIUM_GRAY']
-                name_color = self.ui.COLORS['OFF_WHITE']
-                rank_icon = None
-
-            # Draw rank icon (only for first place)
-            icon_offset = 0
-            if rank_icon:
-                icon_y = entry_y + 8  # Center with text
-                # Tint the crown icon gold
-                crown_tinted = rank_icon.copy()
-                crown_tinted.fill(self.ui.COLORS['GOLD_PURPLE'], special_flags=pygame.BLEND_MULT)
-                self.screen.blit(crown_tinted, (scores_section_x + 15, icon_y))
-                icon_offset = 40
-
-            # Rank number
-            rank_text = f"{i+1}."
+            # Leaderboard title with trophy icon
+            scores_title_y = content_y + self.ui.LAYOUT['PADDING']
+            title_text = "TOP SCORES"
+            title_width = self.font_large.size(title_text)[0]
+            
+            # Center the title text
+            title_x = scores_section_x + scores_section_width//2 - title_width//2
+            
+            # Draw trophy icons on either side of the text
+            if self.trophy_tinted:
+                trophy_y = scores_title_y + 5  # Slightly lower to align with text
+                trophy_spacing = 15  # Space between text and trophies
+                
+                # Left trophy (before text)
+                surface.blit(self.trophy_tinted, (title_x - trophy_spacing - 32, trophy_y))
+                
+                # Right trophy (after text)
+                surface.blit(self.trophy_tinted, (title_x + title_width + trophy_spacing, trophy_y))
+            
+            # Draw title text (centered)
             self.ui.draw_text_with_shadow(
-                rank_text,
-                self.font_medium,
-                rank_color,
-                (scores_section_x + 15 + icon_offset, entry_y),
+                title_text,
+                self.font_large,
+                self.ui.COLORS['GOLD_PURPLE'],
+                (title_x, scores_title_y),
                 self.ui.COLORS['OFF_BLACK']
             )
 
-            # Player name (truncate if too long)
-            display_name = player_name[:15] + "..." if len(player_name) > 15 else player_name
-            self.ui.draw_text_with_shadow(
-                display_name,
-                self.font_medium,
-                name_color,
-                (scores_section_x + 65 + icon_offset, entry_y),
-                self.ui.COLORS['OFF_BLACK']
-            )
+            # Score entries
+            scores_start_y = scores_title_y + 60
+            line_height = 50
+
+            for i, (player_name, score) in enumerate(scores):
+                entry_y = scores_start_y + i * line_height
+                
+                # Rank colors with purple theme and proper icons
+                if i == 0:
+                    rank_color = self.ui.COLORS['GOLD_PURPLE']
+                    name_color = self.ui.COLORS['GOLD_PURPLE']
+                    rank_icon = self.crown_tinted
+                elif i == 1:
+                    rank_color = self.ui.COLORS['LIGHT_PURPLE']
+                    name_color = self.ui.COLORS['LIGHT_PURPLE']
+                    rank_icon = None  # No specific icon for 2nd place
+                elif i == 2:
+                    rank_color = self.ui.COLORS['WARNING_PURPLE']
+                    name_color = self.ui.COLORS['WARNING_PURPLE']
+                    rank_icon = None  # No specific icon for 3rd place
+                else:
+                    rank_color = self.ui.COLORS['MEDIUM_GRAY']
+                    name_color = self.ui.COLORS['OFF_WHITE']
+                    rank_icon = None
+
+                # Draw rank icon (only for first place)
+                icon_offset = 0
+                if rank_icon:
+                    icon_y = entry_y + 8  # Center with text
+                    surface.blit(rank_icon, (scores_section_x + 15, icon_y))
+                    icon_offset = 40
+
+                # Rank number
+                rank_text = f"{i+1}."
+                self.ui.draw_text_with_shadow(
+                    rank_text,
+                    self.font_medium,
+                    rank_color,
+                    (scores_section_x + 15 + icon_offset, entry_y),
+                    self.ui.COLORS['OFF_BLACK']
+                )
+
+                # Player name (truncate if too long)
+                display_name = player_name[:15] + "..." if len(player_name) > 15 else player_name
+                self.ui.draw_text_with_shadow(
+                    display_name,
+                    self.font_medium,
+                    name_color,
+                    (scores_section_x + 65 + icon_offset, entry_y),
+                    self.ui.COLORS['OFF_BLACK']
+                )
 
-            # Score
-            score_text = f"{score:,}"
-            score_width = self.font_medium.size(score_text)[0]
+                # Score
+                score_text = f"{score:,}"
+                score_width = self.font_medium.size(score_text)[0]
+                self.ui.draw_text_with_shadow(
+                    score_text,
+                    self.font_medium,
+                    self.ui.COLORS['PURPLE_BLUE'],
+                    (scores_section_x + scores_section_width - score_width - 30, entry_y),
+                    self.ui.COLORS['OFF_BLACK']
+                )
+
+    def get_queue_summary(self):
+        """Queue line for the kiosk: (next player, others waiting, minutes until they start)"""
+        if not (getattr(self, 'game_launcher', None) and self.game_launcher.player_queue):
+            return None
+        players = self.game_launcher.player_queue.get_snapshot()['players']
+        if not players:
+            return None
+        wait_minutes = max(0, math.ceil((players[0]['start_at'] - time.time()) / 60))
+        return (players[0]['player_name'], len(players) - 1, wait_minutes)
+
+    def _build_queue_layer(self, surface):
+        """Build the next-up strip at the bottom of the leaderboard panel"""
+        queue_rect = self.layout_rects['queue']
+        summary = self.scene.layers['queue'].key
+        
+        with self.ui.target(surface):
+            self._draw_section_panel(self.layout_rects['scores_panel'])
+            
+            if summary:
+                player_name, others, wait_minutes = summary
+                display_name = player_name[:15] + "..." if len(player_name) > 15 else player_name
+                line = f"NEXT UP: {display_name}"
+                if others:
+                    line += f"  +{others} WAITING"
+                line += f"  ~{wait_minutes} MIN" if wait_minutes else "  GET READY!"
+                color = self.ui.COLORS['GOLD_PURPLE']
+            else:
+                line = "NO QUEUE - SCAN TO PLAY NEXT"
+                color = self.ui.COLORS['MEDIUM_GRAY']
+            
             self.ui.draw_text_with_shadow(
-                score_text,
+                line,
                 self.font_medium,
-                self.ui.COLORS['PURPLE_BLUE'],
-                (scores_section_x + scores_section_width - score_width - 30, entry_y),
+                color,
+                (queue_rect.centerx - self.font_medium.size(line)[0]//2, queue_rect.y + 20),
                 self.ui.COLORS['OFF_BLACK']
             )
 
-        # Update animations
-        self.ui.update_animations()
+    def draw_game_in_progress(self):
+        """Draw the static screen shown while a game is running"""
+        self.screen.blit(self.static_background, (0, 0))
+        self.static_frame_drawn = False
+        
+        game_status_text = "GAME IN PROGRESS"
+        game_status_surface, _, _ = self.ui.glyph_cache.get(self.font_large, game_status_text, self.ui.COLORS['GOLD_PURPLE'])
+        status_rect = game_status_surface.get_rect(center=(self.DISPLAY_SIZE[0]//2, self.DISPLAY_SIZE[1]//2))
+        
+        # Add background for better visibility
+        bg_rect = pygame.Rect(status_rect.x - 20, status_rect.y - 10, status_rect.width + 40, status_rect.height + 20)
+        bg_surface = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
+        pygame.draw.rect(bg_surface, (*self.ui.COLORS['OFF_BLACK'], 180), (0, 0, bg_rect.width, bg_rect.height), border_radius=12)
+        self.screen.blit(bg_surface, (bg_rect.x, bg_rect.y))
+        
+        self.screen.blit(game_status_surface, status_rect)
+        
+        # Show current player if available
+        if hasattr(self, 'game_launcher') and self.game_launcher and self.game_launcher.current_player:
+            player_text = f"Player: {self.game_launcher.current_player}"
+            player_surface, _, _ = self.ui.glyph_cache.get(self.font_medium, player_text, self.ui.COLORS['LIGHT_PURPLE'])
+            player_rect = player_surface.get_rect(center=(self.DISPLAY_SIZE[0]//2, self.DISPLAY_SIZE[1]//2 + 60))
+            self.screen.blit(player_surface, player_rect)
+
+    def draw_main_screen(self):
+        """
+        Draw the main kiosk screen with purple color scheme and visible video background
+        
+        Per frame this is one video blit, one overlay blit and one cached-UI blit.
+        Returns None when the whole screen changed (caller should flip), or the
+        list of dirty rects when only parts of a static frame changed.
+        """
+        if self.video_paused:
+            self.draw_game_in_progress()
+            return None  # Don't draw the normal kiosk interface when game is running
+        
+        # Rebuild only the UI layers whose data changed
+        with self.profiler.phase('leaderboard'):
+            scores = tuple(self.get_top_scores(8))  # Show top 8 for clean layout
+        with self.profiler.phase('scene'):
+            dirty_rects = self.scene.update({'scores': scores, 'queue': self.get_queue_summary()})
+            
+            # Update animations
+            self.ui.update_animations()
+        
+        # Background - Hardware-accelerated video
+        with self.profiler.phase('video'):
+            video_frame = self.video_player.get_frame() if self.video_player else None
+        if video_frame:
+            with self.profiler.phase('overlay'):
+                self.screen.blit(video_frame, (0, 0))
+                
+                # Light purple overlay for better contrast but still visible video
+                self.screen.blit(self.video_overlay, (0, 0))
+            with self.profiler.phase('scene'):
+                self.scene.draw(self.screen)
+            self.static_frame_drawn = False
+            return None
+        
+        # Static gradient background: only redraw what changed
+        with self.profiler.phase('scene'):
+            if not self.static_frame_drawn:
+                self.screen.blit(self.static_background, (0, 0))
+                self.scene.draw(self.screen)
+                self.static_frame_drawn = True
+                return None
+            
+            for rect in dirty_rects:
+                self.screen.blit(self.static_background, rect, rect)
+            self.scene.draw(self.screen, dirty_rects)
+        return dirty_rects
+
+    def draw_perf_hud(self, dirty_rects):
+        """Draw the frame-time HUD in the top-left corner; returns dirty rects including it"""
+        if self.hud_font is None:
+            self.hud_font = pygame.font.SysFont('monospace', 16)
+        
+        hud = self.profiler.render_hud(self.hud_font)
+        hud_rect = hud.get_rect(topleft=(10, 10))
+        
+        if dirty_rects is None:
+            self.screen.blit(hud, hud_rect)
+            self.hud_rect = hud_rect
+            return None
+        
+        # Static frame: restore what is under the old and new HUD before drawing the new numbers
+        restore_rect = hud_rect.union(self.hud_rect) if self.hud_rect else hud_rect
+        self.screen.blit(self.static_background, restore_rect, restore_rect)
+        self.scene.draw(self.screen, [restore_rect])
+        self.screen.blit(hud, hud_rect)
+        self.hud_rect = hud_rect
+        return dirty_rects + [restore_rect]
 
     def signal_handler(self, signum, frame):
         """Handle shutdown signals"""
@@ -950,33 +1157,55 @@ class DoomBoxKiosk:
             while self.running:
                 # Skip main loop if kiosk is hidden for game
                 if hasattr(self, 'kiosk_hidden') and self.kiosk_hidden:
-                    # Kiosk is hidden while game is running - just sleep to avoid busy loop
-                    time.sleep(1)
+                    # Kiosk is hidden while game is running - sleep until restored
+                    self.profiler.pause()
+                    self.kiosk_wake.wait(1)
+                    self.kiosk_wake.clear()
                     continue
                 
+                self.profiler.begin_frame()
+                
                 # Handle events only if kiosk is visible
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_ESCAPE:
+                with self.profiler.phase('events'):
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT:
                             self.running = False
-                        elif event.key == pygame.K_F11:
-                            pygame.display.toggle_fullscreen()
-                        elif event.key == pygame.K_g:  # Test key to launch game
-                            if hasattr(self, 'game_launcher') and self.game_launcher:
-                                if not self.game_launcher.is_game_running():
-                                    logger.info("Test game launch triggered")
-                                    self.game_launcher.launch_game("TestPlayer")
+                        elif event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_ESCAPE:
+                                self.running = False
+                            elif event.key == pygame.K_F11:
+                                pygame.display.toggle_fullscreen()
+                            elif event.key == pygame.K_F3:  # Toggle frame-time HUD
+                                self.profiler.toggle_hud()
+                                self.static_frame_drawn = False
+                                self.hud_rect = None
+                            elif event.key == pygame.K_g:  # Test key to launch game
+                                if hasattr(self, 'game_launcher') and self.game_launcher:
+                                    if not self.game_launcher.is_game_running():
+                                        logger.info("Test game launch triggered")
+                                        self.game_launcher.launch_game("TestPlayer")
 
                 # Draw main screen only if kiosk is visible
                 if hasattr(self, 'screen') and self.screen:
-                    self.draw_main_screen()
+                    dirty_rects = self.draw_main_screen()
+                    
+                    if self.profiler.hud_visible:
+                        with self.profiler.phase('hud'):
+                            dirty_rects = self.draw_perf_hud(dirty_rects)
                     
-                    # Update display
-                    pygame.display.flip()
+                    # Update display - full flip, or only the rects that changed
+                    with self.profiler.phase('flip'):
+                        if dirty_rects is None:
+                            pygame.display.flip()
+                        elif dirty_rects:
+                            pygame.display.update(dirty_rects)
+                    
+                    if self.pending_exit_time is not None:
+                        self.record_exit_to_frame_latency()
                 
-                self.clock.tick(30)  # 30 FPS for smooth performance on ARM
+                with self.profiler.phase('tick'):
+                    self.clock.tick(30)  # 30 FPS for smooth performance on ARM
+                self.profiler.end_frame()
 
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
@@ -985,10 +1214,20 @@ class DoomBoxKiosk:
         finally:
             self.cleanup()
 
+    def record_exit_to_frame_latency(self):
+        """Log how long the kiosk took to show a frame after the game exited"""
+        self.last_exit_to_frame_ms = (time.monotonic() - self.pending_exit_time) * 1000
+        self.pending_exit_time = None
+        logger.info(f"Game exit to first kiosk frame: {self.last_exit_to_frame_ms:.0f}ms")
+
     def cleanup(self):
         """Clean shutdown"""
         logger.info("Cleaning up DoomBox kiosk...")
         
+        if hasattr(self, 'telemetry') and self.telemetry:
+            self.telemetry.stop()
+            logger.info(f"Telemetry stats: {self.telemetry.get_stats()}")
+        
         # Clean up MQTT client
         if hasattr(self, 'mqtt_client') and self.mqtt_client:
             self.mqtt_client.disconnect()
@@ -996,6 +1235,7 @@ class DoomBoxKiosk:
         
         # Clean up game launcher
         if hasattr(self, 'game_launcher') and self.game_launcher:
+            self.game_launcher.stop_queue()
             self.game_launcher.stop_game()
             self.game_launcher.monitor_running = False
             logger.info("Game launcher stopped")
@@ -1004,6 +1244,20 @@ class DoomBoxKiosk:
             self.video_player.stop()
             logger.info("Hardware video player stopped")
         
+        if hasattr(self, 'leaderboard') and self.leaderboard:
+            logger.info(f"Leaderboard cache stats: {self.leaderboard.get_stats()}")
+            self.leaderboard.close()
+        
+        if hasattr(self, 'score_store') and self.score_store:
+            logger.info(f"Score store stats: {self.score_store.get_stats()}")
+            self.score_store.close()
+        
+        if hasattr(self, 'ui') and self.ui:
+            logger.info(f"Glyph cache stats: {self.ui.glyph_cache.get_stats()}")
+        
+        if hasattr(self, 'profiler') and self.profiler.frames:
+            self.profiler.log_summary()
+        
         pygame.quit()
         logger.info("Cleanup complete")
 
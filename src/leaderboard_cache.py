@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+In-memory leaderboard cache for the DoomBox kiosk
+Loads the top scores once and only re-queries SQLite when the scores change
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from typing import List, Tuple, Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardCache:
+    """
+    Caches the top-N leaderboard rows so the render loop never touches SQLite
+
+    The cache is refreshed when it is explicitly invalidated (score insert from
+    the game launcher, MQTT score_update) or when the database file changes on
+    disk, detected through the file mtime and PRAGMA data_version.
+    """
+
+    def __init__(self, db_path: str, limit: int = 10, check_interval: float = 1.0,
+                 distinct_players: bool = False):
+        self.db_path = db_path
+        self.limit = limit
+        self.distinct_players = distinct_players  # One row per player from player_best
+        self.check_interval = check_interval  # Seconds between on-disk change checks
+
+        self.rows: List[Tuple[str, int]] = []
+        self.loaded = False
+        self.dirty = True
+        self.lock = threading.Lock()
+
+        # Change detection state
+        self.conn: Optional[sqlite3.Connection] = None
+        self.last_check_time = 0
+        self.last_mtime = None
+        self.last_data_version = None
+
+        # Counters so we can confirm the per-frame query is gone
+        self.stats = {
+            'hits': 0,
+            'refreshes': 0,
+            'invalidations': 0,
+            'change_checks': 0,
+            'errors': 0,
+            'last_refresh_ms': 0.0,
+            'last_refresh_reason': None,
+        }
+        self.pending_reason = 'initial'
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Open the long-lived read connection used for refreshes and change checks"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self.conn
+
+    def _get_mtime(self) -> Optional[float]:
+        """Get the database file modification time"""
+        try:
+            return os.stat(self.db_path).st_mtime
+        except OSError:
+            return None
+
+    def _get_data_version(self) -> Optional[int]:
+        """Get PRAGMA data_version, which changes when another connection commits"""
+        try:
+            return self._get_connection().execute('PRAGMA data_version').fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def invalidate(self, reason: str = 'manual'):
+        """Mark the cached leaderboard as stale; it is reloaded on next access"""
+        with self.lock:
+            self.dirty = True
+            self.pending_reason = reason
+            self.stats['invalidations'] += 1
+        logger.debug(f"Leaderboard cache invalidated: {reason}")
+
+    def on_score_update(self, player_name: str = None, score: int = None):
+        """Callback for score inserts from the game launcher or MQTT"""
+        self.invalidate(f"score_update:{player_name}")
+
+    def _check_for_changes(self):
+        """Check the database file for changes made outside of our callbacks"""
+        now = time.time()
+        if now - self.last_check_time < self.check_interval:
+            return
+        self.last_check_time = now
+        self.stats['change_checks'] += 1
+
+        mtime = self._get_mtime()
+        data_version = self._get_data_version()
+
+        if self.loaded and (mtime != self.last_mtime or data_version != self.last_data_version):
+            self.dirty = True
+            self.pending_reason = 'db_changed'
+
+        self.last_mtime = mtime
+        self.last_data_version = data_version
+
+    def _refresh(self, limit: int):
+        """Reload the top scores from the database"""
+        start = time.perf_counter()
+        cursor = self._get_connection().cursor()
+        cursor.execute('''
+            SELECT player_name, score FROM {}
+            ORDER BY score DESC, timestamp ASC
+            LIMIT ?
+        '''.format('player_best' if self.distinct_players else 'scores'), (limit,))
+        self.rows = cursor.fetchall()
+        cursor.close()
+
+        self.limit = limit
+        self.loaded = True
+        self.dirty = False
+        self.last_mtime = self._get_mtime()
+        self.last_data_version = self._get_data_version()
+
+        self.stats['refreshes'] += 1
+        self.stats['last_refresh_ms'] = (time.perf_counter() - start) * 1000
+        self.stats['last_refresh_reason'] = self.pending_reason
+        logger.info(f"Leaderboard refreshed ({self.pending_reason}): {len(self.rows)} rows "
+                    f"in {self.stats['last_refresh_ms']:.1f}ms")
+
+    def get_top_scores(self, limit: int = None) -> List[Tuple[str, int]]:
+        """Get the top scores, hitting the database only if something changed"""
+        limit = limit or self.limit
+
+        with self.lock:
+            try:
+                self._check_for_changes()
+                if self.dirty or not self.loaded or limit > self.limit:
+                    self._refresh(max(limit, self.limit))
+                else:
+                    self.stats['hits'] += 1
+            except sqlite3.Error as e:
+                self.stats['errors'] += 1
+                logger.error(f"Leaderboard refresh error: {e}")
+                # Drop the connection so the next refresh starts clean
+                self.close()
+                if not self.loaded:
+                    raise
+
+            return self.rows[:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total = self.stats['hits'] + self.stats['refreshes']
+        stats = dict(self.stats)
+        stats['cached_rows'] = len(self.rows)
+        stats['hit_rate'] = self.stats['hits'] / total if total else 0.0
+        return stats
+
+    def close(self):
+        """Close the read connection"""
+        if self.conn:
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+            self.conn = None
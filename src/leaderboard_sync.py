@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Leaderboard replication for DoomBox
+The kiosk publishes a retained, versioned top-N snapshot plus a sequenced
+delta per recorded score; subscribers keep an up-to-date copy by applying
+deltas in order and refetch the snapshot when they detect a gap
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import LEADERBOARD_SYNC_LIMIT
+except ImportError:
+    # Fallback configuration
+    LEADERBOARD_SYNC_LIMIT = 10
+
+REFETCH_RETRY_SECONDS = 2.0  # Ask for the snapshot again if it hasn't arrived by then
+
+
+def apply_score(rows: List[Dict[str, Any]], player_name: str, score: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Fold one score into a best-score-per-player top-N
+
+    Matches ScoreStore.top_scores(): names are compared exactly, as the
+    player_best key is, a player's row only ever improves, and ties keep the
+    earlier score first.
+    """
+    rows = [dict(row) for row in rows]
+    for row in rows:
+        if row['player_name'] == player_name:
+            if score <= row['score']:
+                return rows
+            rows.remove(row)
+            break
+    rows.append({'player_name': player_name, 'score': int(score)})
+    rows.sort(key=lambda row: -row['score'])  # Stable, so earlier ties stay ahead
+    return rows[:limit]
+
+
+class LeaderboardPublisher:
+    """
+    Source side of the leaderboard stream
+
+    Sequence numbers count deltas within an epoch. The epoch is the start time
+    in milliseconds, so a restart (which resets the sequence) is visible to
+    subscribers as a newer epoch; the snapshot's version is the sequence
+    number of the last delta it includes.
+    """
+
+    def __init__(self, store, limit: int = None):
+        self.store = store
+        self.limit = limit or LEADERBOARD_SYNC_LIMIT
+        self.epoch = int(time.time() * 1000)
+        self.seq = 0
+        self.rows = self._top_rows()  # Top-N as last published
+        self.lock = threading.Lock()
+
+    def _top_rows(self) -> List[Dict[str, Any]]:
+        return [{'player_name': name, 'score': score} for name, score in self.store.top_scores(self.limit)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current top-N as a versioned snapshot message"""
+        with self.lock:
+            self.rows = self._top_rows()
+            return {
+                'epoch': self.epoch,
+                'version': self.seq,
+                'limit': self.limit,
+                'rows': [dict(row) for row in self.rows],
+                'timestamp': datetime.now().isoformat()
+            }
+
+    def _delta(self, player_name: str, score: int) -> Dict[str, Any]:
+        self.seq += 1
+        return {
+            'epoch': self.epoch,
+            'seq': self.seq,
+            'player_name': player_name,
+            'score': int(score),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def record(self, player_name: str, score: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Sequence a recorded score; returns (delta, snapshot including it)"""
+        with self.lock:
+            delta = self._delta(player_name, score)
+        return delta, self.snapshot()
+
+    def record_batch(self, scores: List[Tuple[str, int]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Sequence a batch of scores (e.g. merged from another kiosk); returns (deltas, snapshot)
+
+        Only scores that change the last published top-N get a delta, since the
+        rest leave every in-sync replica as it is; the snapshot covers the batch.
+        """
+        with self.lock:
+            rows = self.rows
+            deltas = []
+            for player_name, score in scores:
+                updated = apply_score(rows, player_name, score, self.limit)
+                if updated != rows:
+                    rows = updated
+                    deltas.append(self._delta(player_name, score))
+        return deltas, self.snapshot()
+
+
+class LeaderboardReplica:
+    """
+    Subscriber side: a top-N kept current from snapshots and deltas
+
+    Deltas must arrive in sequence. A missing sequence number, or a delta from
+    a newer epoch, means the copy can no longer be trusted: later deltas are
+    held back and request_snapshot() is called (for MQTT, re-subscribing to
+    the retained snapshot topic). When the snapshot arrives, held deltas it
+    does not already include are applied on top.
+    """
+
+    def __init__(self, limit: int = None, request_snapshot: Callable[[], None] = None,
+                 on_change: Callable[[List[Dict[str, Any]]], None] = None):
+        self.limit = limit or LEADERBOARD_SYNC_LIMIT
+        self.request_snapshot = request_snapshot
+        self.on_change = on_change
+
+        self.lock = threading.Lock()
+        self.epoch: Optional[int] = None
+        self.version = 0
+        self.rows: List[Dict[str, Any]] = []
+        self.held: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self.awaiting_since: Optional[float] = None
+
+        self.stats = {
+            'snapshots': 0,
+            'deltas': 0,
+            'duplicates': 0,
+            'stale': 0,
+            'gaps': 0,
+            'refetches': 0
+        }
+
+    def _should_refetch(self) -> bool:
+        """Mark a snapshot as wanted; True if it should be requested now (at most once per retry window)"""
+        now = time.monotonic()
+        if self.awaiting_since is not None and now - self.awaiting_since < REFETCH_RETRY_SECONDS:
+            return False
+        self.awaiting_since = now
+        self.stats['refetches'] += 1
+        return True
+
+    def _refetch(self):
+        """Ask for a fresh snapshot; called without the lock, since the answer may arrive synchronously"""
+        if self.request_snapshot:
+            try:
+                self.request_snapshot()
+            except Exception as e:
+                logger.error(f"Leaderboard snapshot request failed: {e}")
+
+    def _drain_held(self) -> bool:
+        """Apply held deltas that now follow on; returns True if anything changed"""
+        changed = False
+        for key in sorted(self.held):
+            epoch, seq = key
+            if epoch < self.epoch or (epoch == self.epoch and seq <= self.version):
+                del self.held[key]
+            elif epoch == self.epoch and seq == self.version + 1:
+                delta = self.held.pop(key)
+                self.rows = apply_score(self.rows, delta['player_name'], delta['score'], self.limit)
+                self.version = seq
+                self.stats['deltas'] += 1
+                changed = True
+        return changed
+
+    def apply_snapshot(self, snapshot: Dict[str, Any]) -> bool:
+        """Replace the copy with a snapshot unless it is older than what we have"""
+        with self.lock:
+            if self.epoch is not None and (snapshot['epoch'], snapshot['version']) < (self.epoch, self.version):
+                self.stats['stale'] += 1
+                return False
+            self.epoch = snapshot['epoch']
+            self.version = snapshot['version']
+            self.rows = [dict(row) for row in snapshot['rows']][:self.limit]
+            self.stats['snapshots'] += 1
+            self._drain_held()
+            self.awaiting_since = None
+            # Still a hole between the snapshot and what we hold
+            refetch = bool(self.held) and self._should_refetch()
+            rows = list(self.rows)
+        if refetch:
+            self._refetch()
+        self._notify(rows)
+        return True
+
+    def apply_delta(self, delta: Dict[str, Any]) -> bool:
+        """Apply a delta if it is the next in sequence; returns True if the copy changed"""
+        with self.lock:
+            key = (delta['epoch'], delta['seq'])
+            if self.epoch is not None and key <= (self.epoch, self.version):
+                self.stats['duplicates' if delta['epoch'] == self.epoch else 'stale'] += 1
+                return False
+
+            self.held[key] = delta
+            refetch = False
+            if self.epoch is not None and self.awaiting_since is None and key == (self.epoch, self.version + 1):
+                self._drain_held()
+                rows = list(self.rows)
+            else:
+                # Gap, newer epoch, or no snapshot yet: hold it until a snapshot fills the hole
+                if self.epoch is not None:
+                    self.stats['gaps'] += 1
+                    logger.info(f"Leaderboard gap: have {self.epoch}:{self.version}, got {key[0]}:{key[1]}")
+                refetch = self._should_refetch()
+                rows = None
+        if refetch:
+            self._refetch()
+        if rows is None:
+            return False
+        self._notify(rows)
+        return True
+
+    def _notify(self, rows: List[Dict[str, Any]]):
+        if self.on_change:
+            try:
+                self.on_change(rows)
+            except Exception as e:
+                logger.error(f"Error in leaderboard change callback: {e}")
+
+    def get_rows(self) -> List[Dict[str, Any]]:
+        """Current top-N"""
+        with self.lock:
+            return [dict(row) for row in self.rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get replica statistics"""
+        with self.lock:
+            return dict(self.stats, epoch=self.epoch, version=self.version, held=len(self.held),
+                        in_sync=self.awaiting_since is None and not self.held)
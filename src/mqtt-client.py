@@ -10,9 +10,17 @@ import json
 import logging
 import time
 import threading
+import uuid
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 
+from command_executor import CommandExecutor
+from topic_router import TopicRouter
+from mqtt_outbox import MQTTOutbox
+from leaderboard_sync import LeaderboardPublisher
+from score_replication import ScoreReplicator
+from score_store import get_score_store
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,10 +28,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+EARLY_ACK_TTL = 30.0  # Seconds an ack may wait for _send() to record its mid
+
 class DoomBoxMQTTClient:
     """MQTT client for DoomBox remote control"""
     
-    def __init__(self, broker_host: str = None, broker_port: int = None):
+    def __init__(self, broker_host: str = None, broker_port: int = None, store=None):
         # Try to import configuration
         try:
             # Add parent directory to path for config import
@@ -33,10 +43,17 @@ class DoomBoxMQTTClient:
             if parent_dir not in sys.path:
                 sys.path.insert(0, parent_dir)
             
-            from config.config import MQTT_BROKER, MQTT_PORT, MQTT_TOPICS
+            from config.config import (MQTT_BROKER, MQTT_PORT, MQTT_TOPICS, MQTT_COMMAND_TOPICS, MQTT_KEEPALIVE,
+                                       MQTT_QOS, MQTT_RECONNECT_MIN_DELAY, MQTT_RECONNECT_MAX_DELAY,
+                                       REPLICATION_ENABLED)
             self.broker_host = broker_host or MQTT_BROKER
             self.broker_port = broker_port or MQTT_PORT
             self.topics = MQTT_TOPICS
+            self.command_topics = MQTT_COMMAND_TOPICS
+            self.keepalive = MQTT_KEEPALIVE
+            self.qos = MQTT_QOS
+            self.reconnect_delays = (MQTT_RECONNECT_MIN_DELAY, MQTT_RECONNECT_MAX_DELAY)
+            self.replication_enabled = REPLICATION_ENABLED
         except ImportError as e:
             # Fallback configuration
             logger.warning(f"Could not import config: {e}, using fallback localhost")
@@ -48,76 +65,222 @@ class DoomBoxMQTTClient:
                 'scores': 'doombox/scores',
                 'players': 'doombox/players',
                 'system': 'doombox/system',
-                'start_game': 'doombox/start_game'
+                'start_game': 'doombox/start_game',
+                'queue': 'doombox/queue',
+                'telemetry': 'doombox/telemetry',
+                'scores_snapshot': 'doombox/scores/snapshot',
+                'scores_delta': 'doombox/scores/delta'
             }
+            self.command_topics = ['commands', 'start_game', 'players', 'system']
+            self.keepalive = 60
+            self.qos = 1
+            self.reconnect_delays = (1, 60)
+            self.replication_enabled = False
         
         self.client_id = f"doombox_{int(time.time())}"
         
         # MQTT client
         self.client = mqtt.Client(client_id=self.client_id)
+        # paho's network loop reconnects on its own, doubling the delay after each failure
+        self.client.reconnect_delay_set(*self.reconnect_delays)
         self.connected = False
+        self.connected_event = threading.Event()
+        self.connection_stats = {'connects': 0, 'disconnects': 0}
+        
+        # Publishes are kept in the outbox until the broker acknowledges them (mid -> outbox id)
+        self.outbox = None
+        self.leaderboard = None
+        self.replicator = None
+        try:
+            store = store or get_score_store()
+            self.outbox = MQTTOutbox(store)
+            # Retained top-N snapshot plus a sequenced delta per recorded score
+            self.leaderboard = LeaderboardPublisher(store)
+            if self.replication_enabled:
+                self.replicator = ScoreReplicator(store, self._publish_replication)
+        except Exception as e:
+            logger.warning(f"MQTT outbox unavailable, messages published while offline will be lost: {e}")
+        # Every mid paho has not acknowledged yet; untracked (non-durable) publishes map to None
+        self.inflight: Dict[int, Optional[int]] = {}
+        self.early_acks: Dict[int, float] = {}  # mid -> time, for acks that beat _send() to the lock
+        self.inflight_lock = threading.Lock()  # Never held while calling into paho
         
         # Callbacks
         self.message_callbacks: Dict[str, Callable] = {}
+        self.score_callbacks = []
         
         # Setup MQTT client
         self.client.on_connect = self._on_connect
         self.client.on_disconnect = self._on_disconnect
         self.client.on_message = self._on_message
+        self.client.on_publish = self._on_publish
         
         # Game launcher reference (to be set externally)
         self.game_launcher = None
         
+        # Handlers run here, off paho's network thread, so keepalives never stall
+        self.executor = CommandExecutor(max_pending=32, name='mqtt-commands')
+        
+        # Only command topics are subscribed; status, scores and queue are published only,
+        # so our own output never comes back as input
+        self.router = TopicRouter(self.client_id)
+        self._register_routes()
+        if self.replicator:
+            self._setup_replication()
+        
         logger.info(f"MQTT client initialized: {self.client_id}")
     
+    def _register_routes(self):
+        """Map the command topics to their handlers"""
+        handlers = {
+            'commands': lambda topic, data: self._dispatch(data.get('command'), self._handle_command, data,
+                                                           acknowledge=True),
+            'start_game': lambda topic, data: self._dispatch('start_game', self._handle_start_game, data,
+                                                             acknowledge=True),
+            'players': lambda topic, data: self._dispatch('players', self._handle_player_message, data),
+            'system': lambda topic, data: self._dispatch('system', self._handle_system_message, data)
+        }
+        for name in self.command_topics:
+            self.router.add_route(self.topics[name], handlers[name])
+    
+    def _setup_replication(self):
+        """Exchange scores with the other kiosks at the event"""
+        # Merges touch the database, so they run on the executor rather than the network thread
+        self.router.add_route(self.replicator.subscription, lambda topic, data: self.executor.submit(
+            'replication', self.replicator.handle, data))
+        self.replicator.add_listener(self._on_replicated_scores)
+        logger.info(f"Score replication enabled as kiosk {self.replicator.kiosk_id}")
+    
+    def _publish_replication(self, topic: str, message: Dict[str, Any]) -> bool:
+        """Replication messages skip the outbox; summaries repair anything lost"""
+        return self.publish(topic, json.dumps(self.router.stamp(message)), durable=False)
+    
+    def _on_replicated_scores(self, scores):
+        """
+        Scores recorded on other kiosks were merged: refresh and republish the leaderboard once
+        
+        Score callbacks hear about the batch's best score; deltas go out only for
+        scores that change the top-N, followed by one snapshot for the batch.
+        """
+        best_player, best_score = max(scores, key=lambda row: row[1])
+        for callback in self.score_callbacks:
+            try:
+                callback(best_player, best_score)
+            except Exception as e:
+                logger.error(f"Error in score callback: {e}")
+        if not self.leaderboard:
+            return
+        deltas, snapshot = self.leaderboard.record_batch(scores)
+        for delta in deltas:
+            self.publish(self.topics['scores_delta'], json.dumps(self.router.stamp(delta)))
+        self.publish(self.topics['scores_snapshot'], json.dumps(self.router.stamp(snapshot)), retain=True,
+                     durable=False)
+    
+    def add_route(self, pattern: str, handler: Callable[[str, Any], None]):
+        """Handle messages on topics matching pattern (+ and # wildcards) with handler(topic, data)"""
+        self.router.add_route(pattern, handler)
+        if self.connected:
+            self.client.subscribe(pattern)
+    
     def _on_connect(self, client, userdata, flags, rc):
         """Called when MQTT client connects"""
         if rc == 0:
             self.connected = True
+            self.connection_stats['connects'] += 1
             logger.info(f"Connected to MQTT broker at {self.broker_host}:{self.broker_port}")
             
             # Subscribe to command topics
-            for topic in self.topics.values():
+            for topic in self.router.subscriptions():
                 client.subscribe(topic)
                 logger.info(f"Subscribed to topic: {topic}")
+            
+            # Replay and snapshots read the database, so they run off the network thread
+            if not self.executor.submit('reconnect', self._resume_session):
+                threading.Thread(target=self._resume_session, name='mqtt-resume', daemon=True).start()
+            if self.replicator:
+                self.replicator.sync_now()  # Catch up on scores recorded elsewhere while we were away
+            self.connected_event.set()
         else:
             logger.error(f"Failed to connect to MQTT broker: {rc}")
     
+    def _resume_session(self):
+        """After (re)connecting: resend the outbox and republish the retained snapshots"""
+        self._replay_outbox()
+        self._publish_system_status()
+        self.publish_leaderboard_snapshot()
+        if self.game_launcher and self.game_launcher.player_queue:
+            self.publish_queue(self.game_launcher.player_queue.get_snapshot())
+    
     def _on_disconnect(self, client, userdata, rc):
         """Called when MQTT client disconnects"""
         self.connected = False
-        logger.info("Disconnected from MQTT broker")
+        self.connected_event.clear()
+        self.connection_stats['disconnects'] += 1
+        if rc == 0:
+            logger.info("Disconnected from MQTT broker")
+        else:
+            logger.warning(f"Lost connection to MQTT broker (rc={rc}), reconnecting in the background")
+        with self.inflight_lock:
+            # Durable messages are re-sent by paho and stay tracked; an untracked one may never be
+            # acked (QoS 0), and a late ack for one simply expires from early_acks
+            self.inflight = {mid: row_id for mid, row_id in self.inflight.items() if row_id is not None}
+    
+    def _on_publish(self, client, userdata, mid):
+        """Called when the broker acknowledges a publish"""
+        with self.inflight_lock:
+            if mid not in self.inflight:
+                # Acked before _send() recorded the mid; expire it in case it is never claimed,
+                # so a reused mid can't be taken as acknowledged
+                now = time.monotonic()
+                self.early_acks = {m: t for m, t in self.early_acks.items() if now - t < EARLY_ACK_TTL}
+                self.early_acks[mid] = now
+                return
+            row_id = self.inflight.pop(mid)
+        if row_id is not None:
+            self.outbox.remove(row_id)
+    
+    def _replay_outbox(self):
+        """Send outbox messages the broker never acknowledged (paho re-sends the ones it still holds itself)"""
+        if not self.outbox:
+            return
+        with self.inflight_lock:
+            held = set(self.inflight.values())
+        pending = [row for row in self.outbox.pending() if row[0] not in held]
+        for row_id, topic, payload, qos, retain in pending:
+            self._send(topic, payload, retain, row_id, qos)
+        if pending:
+            self.outbox.mark_replayed(len(pending))
+            logger.info(f"Replayed {len(pending)} MQTT messages from the outbox")
     
     def _on_message(self, client, userdata, msg):
         """Called when a message is received"""
         try:
-            topic = msg.topic
-            payload = msg.payload.decode('utf-8')
-            
-            logger.info(f"Received message on {topic}: {payload}")
-            
-            # Parse JSON payload
-            try:
-                data = json.loads(payload)
-            except json.JSONDecodeError:
-                logger.error(f"Invalid JSON payload: {payload}")
-                return
-            
-            # Route message to appropriate handler
-            if topic == self.topics['commands']:
-                self._handle_command(data)
-            elif topic == self.topics['start_game']:
-                self._handle_start_game(data)
-            elif topic == self.topics['status']:
-                self._handle_status_request(data)
-            elif topic == self.topics['players']:
-                self._handle_player_message(data)
-            elif topic == self.topics['system']:
-                self._handle_system_message(data)
+            logger.debug(f"Received message on {msg.topic}: {msg.payload[:200]!r}")
+            self.router.route(msg.topic, msg.payload)
             
         except Exception as e:
             logger.error(f"Error processing message: {e}")
     
+    def _dispatch(self, command: str, handler: Callable, data: Dict[str, Any], acknowledge: bool = False):
+        """
+        Queue a handler on the command executor
+        
+        Commands are acknowledged straight away with their request_id (taken from
+        the message, or generated); the handler's response carries the same id.
+        """
+        request_id = str(data.get('request_id') or uuid.uuid4().hex[:12])
+        data['request_id'] = request_id
+        
+        accepted = self.executor.submit(f"{command} ({request_id})", handler, data)
+        if acknowledge:
+            # Sent from paho's network thread, so it skips the outbox rather than wait on a database
+            # commit; the handler's own response is durable
+            self._publish_response('command_accepted' if accepted else 'command_rejected', {
+                'command': command,
+                'reason': None if accepted else 'busy',
+                'queued': self.executor.jobs.qsize()
+            }, request_id, durable=False)
+    
     def _handle_command(self, data: Dict[str, Any]):
         """Handle command messages"""
         command = data.get('command')
@@ -126,18 +289,33 @@ class DoomBoxMQTTClient:
             player_name = data.get('player_name', 'Unknown')
             skill = data.get('skill', 3)
             
-            logger.info(f"Launching game for {player_name} (skill: {skill})")
+            logger.info(f"Queueing game for {player_name} (skill: {skill})")
             
             if self.game_launcher:
-                success = self.game_launcher.launch_game(player_name, skill)
-                self._publish_response('game_launch_response', {
-                    'success': success,
+                result = self.game_launcher.request_game(player_name, skill, data.get('time_limit'), 'mqtt')
+                self._publish_response('game_launch_response', dict(result, **{
+                    'success': result['accepted'],
                     'player_name': player_name,
                     'timestamp': datetime.now().isoformat()
-                })
+                }), data.get('request_id'))
             else:
                 logger.error("Game launcher not available")
         
+        elif command == 'leave_queue':
+            player_name = data.get('player_name')
+            
+            if self.game_launcher and self.game_launcher.player_queue and player_name:
+                success = self.game_launcher.player_queue.cancel(player_name)
+                self._publish_response('queue_leave_response', {
+                    'success': success,
+                    'player_name': player_name,
+                    'timestamp': datetime.now().isoformat()
+                }, data.get('request_id'))
+        
+        elif command == 'get_queue':
+            if self.game_launcher and self.game_launcher.player_queue:
+                self.publish_queue(self.game_launcher.player_queue.get_snapshot())
+        
         elif command == 'stop_game':
             logger.info("Stopping current game")
             
@@ -146,15 +324,22 @@ class DoomBoxMQTTClient:
                 self._publish_response('game_stop_response', {
                     'success': success,
                     'timestamp': datetime.now().isoformat()
-                })
+                }, data.get('request_id'))
             else:
                 logger.error("Game launcher not available")
         
         elif command == 'get_status':
             self._publish_system_status()
         
+        elif command == 'get_leaderboard':
+            self.publish_leaderboard_snapshot()
+        
         else:
             logger.warning(f"Unknown command: {command}")
+            self._publish_response('command_error', {
+                'command': command,
+                'error': 'unknown_command'
+            }, data.get('request_id'))
     
     def _handle_start_game(self, data: Dict[str, Any]):
         """Handle start game messages from web form"""
@@ -164,20 +349,17 @@ class DoomBoxMQTTClient:
         logger.info(f"Start game request from web form: {player_name}")
         
         if self.game_launcher:
-            success = self.game_launcher.launch_game(player_name, skill)
-            self._publish_response('game_launch_response', {
-                'success': success,
+            # Queued rather than dropped when a game is already running; repeat scans keep their place
+            result = self.game_launcher.request_game(player_name, skill, source='web_form')
+            self._publish_response('game_launch_response', dict(result, **{
+                'success': result['accepted'],
                 'player_name': player_name,
                 'source': 'web_form',
                 'timestamp': datetime.now().isoformat()
-            })
+            }), data.get('request_id'))
         else:
             logger.error("Game launcher not available")
     
-    def _handle_status_request(self, data: Dict[str, Any]):
-        """Handle status request messages"""
-        self._publish_system_status()
-    
     def _handle_player_message(self, data: Dict[str, Any]):
         """Handle player-related messages"""
         action = data.get('action')
@@ -191,7 +373,12 @@ class DoomBoxMQTTClient:
             player_name = data.get('player_name')
             score = data.get('score')
             logger.info(f"Score update: {player_name} = {score}")
-            # Handle score update
+            
+            for callback in self.score_callbacks:
+                try:
+                    callback(player_name, score)
+                except Exception as e:
+                    logger.error(f"Error in score callback: {e}")
     
     def _handle_system_message(self, data: Dict[str, Any]):
         """Handle system messages"""
@@ -205,15 +392,17 @@ class DoomBoxMQTTClient:
             logger.info("System shutdown requested")
             # Handle system shutdown
     
-    def _publish_response(self, response_type: str, data: Dict[str, Any]):
-        """Publish response message"""
+    def _publish_response(self, response_type: str, data: Dict[str, Any], request_id: str = None,
+                          durable: bool = True):
+        """Publish response message, tagged with the request it answers"""
         message = {
             'type': response_type,
+            'request_id': request_id,
             'data': data,
             'timestamp': datetime.now().isoformat()
         }
         
-        self.publish(self.topics['status'], json.dumps(message))
+        self.publish(self.topics['status'], json.dumps(self.router.stamp(message)), durable=durable)
     
     def _publish_system_status(self):
         """Publish current system status"""
@@ -222,68 +411,192 @@ class DoomBoxMQTTClient:
             'client_id': self.client_id,
             'game_running': self.game_launcher.is_game_running() if self.game_launcher else False,
             'current_player': self.game_launcher.current_player if self.game_launcher else None,
+            'queue_depth': (self.game_launcher.player_queue.get_snapshot()['depth']
+                            if self.game_launcher and self.game_launcher.player_queue else 0),
+            'messages': self.router.get_stats(),
+            'outbox_depth': self.outbox.get_stats()['depth'] if self.outbox else 0,
+            'reconnects': max(0, self.connection_stats['connects'] - 1),
             'timestamp': datetime.now().isoformat()
         }
         
-        self.publish(self.topics['status'], json.dumps(status))
+        # A status snapshot is stale once replayed, so it skips the outbox
+        self.publish(self.topics['status'], json.dumps(self.router.stamp(status)), durable=False)
     
-    def connect(self) -> bool:
-        """Connect to MQTT broker"""
+    def connect(self, timeout: float = 10.0) -> bool:
+        """
+        Start the network loop and wait up to timeout for the first connection
+        
+        The loop keeps retrying with exponential backoff after a failed attempt
+        or a dropped connection, so False only means "not connected yet".
+        """
         try:
-            self.client.connect(self.broker_host, self.broker_port, 60)
+            self.client.connect_async(self.broker_host, self.broker_port, self.keepalive)
             self.client.loop_start()
-            
-            # Wait for connection
-            timeout = 10
-            while not self.connected and timeout > 0:
-                time.sleep(0.1)
-                timeout -= 0.1
-            
-            return self.connected
-            
+            if self.replicator:
+                self.replicator.start()
         except Exception as e:
-            logger.error(f"Failed to connect to MQTT broker: {e}")
+            logger.error(f"Failed to start MQTT client: {e}")
             return False
+        
+        return self.connected_event.wait(timeout)
     
     def disconnect(self):
         """Disconnect from MQTT broker"""
-        if self.connected:
-            self.client.loop_stop()
-            self.client.disconnect()
+        if self.replicator:
+            self.replicator.stop()
+        self.executor.stop()
+        logger.info(f"MQTT client stats: {self.get_stats()}")
+        self.client.disconnect()
+        self.client.loop_stop()
     
-    def publish(self, topic: str, payload: str) -> bool:
-        """Publish message to topic"""
-        if not self.connected:
-            logger.warning("Not connected to MQTT broker")
-            return False
-        
+    def _send(self, topic: str, payload: str, retain: bool, row_id: Optional[int], qos: int = None) -> bool:
+        """Hand a message to paho and track it until the broker acknowledges it"""
+        qos = self.qos if qos is None else qos
         try:
-            result = self.client.publish(topic, payload)
-            if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                logger.debug(f"Published to {topic}: {payload}")
-                return True
-            else:
-                logger.error(f"Failed to publish to {topic}: {result.rc}")
-                return False
-                
+            result = self.client.publish(topic, payload, qos=qos, retain=retain)
         except Exception as e:
             logger.error(f"Error publishing message: {e}")
             return False
+        
+        # NO_CONN: the connection dropped under us; paho holds QoS 1+ messages and sends them on reconnect
+        if result.rc not in (mqtt.MQTT_ERR_SUCCESS, mqtt.MQTT_ERR_NO_CONN):
+            logger.error(f"Failed to publish to {topic}: {result.rc}")
+            return False
+        
+        # Record every mid that will be acked, durable or not, so its ack is never mistaken for another's
+        if qos > 0 or result.rc == mqtt.MQTT_ERR_SUCCESS:
+            with self.inflight_lock:
+                acked = self.early_acks.pop(result.mid, None) is not None
+                if not acked:
+                    self.inflight[result.mid] = row_id
+            if acked and row_id is not None:
+                self.outbox.remove(row_id)
+        
+        logger.debug(f"Published to {topic}: {payload}")
+        return result.rc == mqtt.MQTT_ERR_SUCCESS or row_id is not None
+    
+    def publish(self, topic: str, payload: str, retain: bool = False, durable: bool = True) -> bool:
+        """
+        Publish message to topic
+        
+        Durable messages go to the outbox first and are delivered once the broker
+        is reachable; others (status snapshots) are only sent while connected.
+        """
+        row_id = None
+        if durable and self.outbox:
+            try:
+                row_id = self.outbox.add(topic, payload, self.qos, retain)
+            except Exception as e:
+                logger.error(f"Could not store MQTT message in the outbox: {e}")
+        
+        if not self.connected:
+            if row_id is None:
+                logger.warning("Not connected to MQTT broker")
+                return False
+            logger.debug(f"Broker offline, kept message for {topic} in the outbox")
+            return True
+        
+        return self._send(topic, payload, retain, row_id)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection, outbox, message and executor statistics"""
+        with self.inflight_lock:
+            inflight = len(self.inflight)
+        return {
+            'connected': self.connected,
+            'connects': self.connection_stats['connects'],
+            'reconnects': max(0, self.connection_stats['connects'] - 1),
+            'disconnects': self.connection_stats['disconnects'],
+            'inflight': inflight,
+            'outbox': self.outbox.get_stats() if self.outbox else None,
+            'messages': self.router.get_stats(),
+            'executor': self.executor.get_stats(),
+            'replication': self.replicator.get_stats() if self.replicator else None
+        }
     
     def set_game_launcher(self, game_launcher):
         """Set game launcher reference"""
         self.game_launcher = game_launcher
+        game_launcher.add_score_callback(self._on_local_score)
+        if self.replicator:
+            game_launcher.add_score_callback(self.replicator.push_local)
+        if game_launcher.player_queue:
+            game_launcher.player_queue.add_listener(self.publish_queue)
         logger.info("Game launcher reference set")
     
+    def add_score_callback(self, callback: Callable):
+        """Add a callback to be called on score_update messages"""
+        self.score_callbacks.append(callback)
+    
+    def _on_local_score(self, player_name: str, score: int):
+        """
+        A score was committed locally; publish it from the executor
+        
+        Score callbacks run on the ScoreStore writer thread, where the durable
+        publish would wait on its own outbox insert.
+        """
+        if not self.executor.submit(f"score ({player_name})", self.publish_score, player_name, score):
+            logger.warning(f"Could not queue leaderboard update for {player_name}; the next snapshot will carry it")
+    
     def publish_score(self, player_name: str, score: int):
-        """Publish score update"""
+        """
+        Publish a recorded score as the next leaderboard delta, then the snapshot that includes it
+        
+        Deltas go through the outbox so subscribers never silently miss one;
+        the snapshot is retained and republished on every connect instead.
+        """
+        if not self.leaderboard:
+            return
+        delta, snapshot = self.leaderboard.record(player_name, score)
+        self.publish(self.topics['scores_delta'], json.dumps(self.router.stamp(delta)))
+        self.publish(self.topics['scores_snapshot'], json.dumps(self.router.stamp(snapshot)), retain=True,
+                     durable=False)
+    
+    def publish_leaderboard_snapshot(self):
+        """Publish the retained top-N snapshot"""
+        if not self.leaderboard:
+            return
+        snapshot = self.leaderboard.snapshot()
+        self.publish(self.topics['scores_snapshot'], json.dumps(self.router.stamp(snapshot)), retain=True,
+                     durable=False)
+    
+    def follow_leaderboard(self, replica, snapshot_topic: str = None, delta_topic: str = None):
+        """
+        Keep a LeaderboardReplica in sync with a leaderboard stream
+        
+        A gap makes the replica re-subscribe to the snapshot topic, which has
+        the broker send the retained snapshot again.
+        """
+        snapshot_topic = snapshot_topic or self.topics['scores_snapshot']
+        delta_topic = delta_topic or self.topics['scores_delta']
+        
+        def request_snapshot():
+            self.client.unsubscribe(snapshot_topic)
+            self.client.subscribe(snapshot_topic)
+        
+        replica.request_snapshot = request_snapshot
+        self.add_route(snapshot_topic, lambda topic, data: replica.apply_snapshot(data))
+        self.add_route(delta_topic, lambda topic, data: replica.apply_delta(data))
+    
+    def publish_queue(self, snapshot: Dict[str, Any]):
+        """Publish queue depth and per-player ETAs (retained, so new subscribers see it at once)"""
         message = {
-            'player_name': player_name,
-            'score': score,
+            'depth': snapshot['depth'],
+            'now_playing': snapshot['now_playing'],
+            'players': [
+                {'player_name': player['player_name'], 'position': player['position'],
+                 'eta_seconds': player['eta_seconds']}
+                for player in snapshot['players']
+            ],
             'timestamp': datetime.now().isoformat()
         }
         
-        self.publish(self.topics['scores'], json.dumps(message))
+        # Not durable: the current snapshot is republished on every connect
+        self.publish(self.topics['queue'], json.dumps(self.router.stamp(message)), retain=True, durable=False)
+    
+    def publish_telemetry(self, message: Dict[str, Any], retain: bool = False):
+        """Publish a telemetry keyframe (retained) or delta; stale health data is never replayed"""
+        self.publish(self.topics['telemetry'], json.dumps(self.router.stamp(message)), retain=retain, durable=False)
     
     def publish_player_registered(self, player_name: str):
         """Publish player registration"""
@@ -293,7 +606,7 @@ class DoomBoxMQTTClient:
             'timestamp': datetime.now().isoformat()
         }
         
-        self.publish(self.topics['players'], json.dumps(message))
+        self.publish(self.topics['players'], json.dumps(self.router.stamp(message)))
 
 def main():
     """Test MQTT client"""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Durable MQTT outbox for DoomBox
+Keeps outgoing messages in the score database until the broker acknowledges
+them, so launch responses and scores published during a Wi-Fi drop are sent
+once the connection comes back, even across a restart
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import MQTT_OUTBOX_MAX_MESSAGES
+except ImportError:
+    # Fallback configuration
+    MQTT_OUTBOX_MAX_MESSAGES = 1000
+
+INSERT_MESSAGE = 'INSERT INTO mqtt_outbox (topic, payload, qos, retain, created_at) VALUES (?, ?, ?, ?, ?)'
+# Keep the newest max_messages rows
+TRIM_MESSAGES = 'DELETE FROM mqtt_outbox WHERE id NOT IN (SELECT id FROM mqtt_outbox ORDER BY id DESC LIMIT ?)'
+PENDING_MESSAGES = 'SELECT id, topic, payload, qos, retain FROM mqtt_outbox ORDER BY id LIMIT ?'
+
+
+class MQTTOutbox:
+    """
+    Size-bounded FIFO of unacknowledged messages in the mqtt_outbox table
+
+    Messages are added before they are handed to paho and removed when the
+    PUBACK arrives, so anything unacknowledged at a disconnect or crash is
+    replayed later (at-least-once). When the outbox is full the oldest
+    messages are dropped. Writes go through the ScoreStore writer thread.
+    """
+
+    def __init__(self, store, max_messages: int = None):
+        self.store = store
+        self.max_messages = max_messages or MQTT_OUTBOX_MAX_MESSAGES
+        self.lock = threading.Lock()
+        self.depth = store.query('SELECT COUNT(*) FROM mqtt_outbox')[0][0]
+
+        self.stats = {
+            'stored': 0,
+            'delivered': 0,
+            'replayed': 0,
+            'dropped': 0,
+            'late': 0
+        }
+
+        if self.depth:
+            logger.info(f"MQTT outbox has {self.depth} undelivered messages from before")
+
+    def add(self, topic: str, payload: str, qos: int = 1, retain: bool = False, timeout: float = 5.0) -> int:
+        """
+        Store a message; returns its outbox id
+
+        If the insert isn't committed within timeout the caller sends the message
+        untracked, so a row that lands later is deleted rather than replayed.
+        """
+        future = self.store.submit([
+            (INSERT_MESSAGE, (topic, payload, qos, int(retain), time.time())),
+        ])
+        try:
+            row_id = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.add_done_callback(self._discard_late)
+            with self.lock:
+                self.stats['late'] += 1
+            raise
+
+        with self.lock:
+            self.depth += 1
+            self.stats['stored'] += 1
+            overflow = self.depth - self.max_messages
+            if overflow > 0:
+                self.depth = self.max_messages
+                self.stats['dropped'] += overflow
+        if overflow > 0:
+            logger.warning(f"MQTT outbox full, dropping {overflow} oldest message(s)")
+            self.store.submit([(TRIM_MESSAGES, (self.max_messages,))])
+        return row_id
+
+    def _discard_late(self, future):
+        """Delete a row whose insert committed after add() gave up on it"""
+        if future.exception() is None:
+            self.store.submit([('DELETE FROM mqtt_outbox WHERE id = ?', (future.result(),))])
+
+    def remove(self, row_id: int):
+        """Forget a message the broker has acknowledged"""
+        self.store.submit([('DELETE FROM mqtt_outbox WHERE id = ?', (row_id,))])
+        with self.lock:
+            self.depth = max(0, self.depth - 1)
+            self.stats['delivered'] += 1
+
+    def pending(self, limit: int = None) -> List[Tuple[int, str, str, int, bool]]:
+        """Undelivered messages, oldest first: (id, topic, payload, qos, retain)"""
+        self.store.flush(timeout=5)
+        rows = self.store.query(PENDING_MESSAGES, (limit or self.max_messages,))
+        with self.lock:
+            # Resync; acks for trimmed messages can leave the running count off
+            self.depth = self.store.query('SELECT COUNT(*) FROM mqtt_outbox')[0][0]
+        return [(row_id, topic, payload, qos, bool(retain)) for row_id, topic, payload, qos, retain in rows]
+
+    def mark_replayed(self, count: int):
+        """Count messages re-sent after a reconnect"""
+        with self.lock:
+            self.stats['replayed'] += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get outbox statistics"""
+        with self.lock:
+            return dict(self.stats, depth=self.depth)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Player queue for DoomBox
+Persistent FIFO of players waiting for the next game session, stored in the
+score database so it survives restarts, with repeat submissions deduplicated
+and per-player ETAs
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from typing import Callable, Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import QUEUE_MAX_DEPTH, QUEUE_DEFAULT_SESSION_SECONDS, QUEUE_HANDOFF_SECONDS
+except ImportError:
+    # Fallback configuration
+    QUEUE_MAX_DEPTH = 50
+    QUEUE_DEFAULT_SESSION_SECONDS = 300
+    QUEUE_HANDOFF_SECONDS = 5
+
+# Queue entry statuses; an active entry is waiting or playing
+WAITING = 'waiting'
+PLAYING = 'playing'
+ENTRY_COLUMNS = 'id, player_name, skill, time_limit, source, status, enqueued_at, started_at'
+
+ENQUEUE = '''
+    INSERT OR IGNORE INTO player_queue (player_name, skill, time_limit, source, status, enqueued_at)
+    VALUES (?, ?, ?, ?, 'waiting', ?)
+'''
+ACTIVE_ENTRIES = f"SELECT {ENTRY_COLUMNS} FROM player_queue WHERE status IN ('waiting', 'playing') ORDER BY id"
+SESSION_SAMPLE = 20  # Recent sessions averaged for ETAs
+
+
+class PlayerQueue:
+    """
+    FIFO of players waiting to play, backed by the player_queue table
+
+    The unique index on active entries makes enqueueing the same player twice a
+    no-op, even across restarts. Writes go through the shared ScoreStore writer;
+    an in-memory snapshot (depth, order, ETAs) is refreshed after every change
+    and handed to listeners, so the kiosk and MQTT never query per frame.
+    """
+
+    def __init__(self, store, max_depth: int = None, default_session_seconds: float = None,
+                 handoff_seconds: float = None):
+        self.store = store
+        self.max_depth = max_depth or QUEUE_MAX_DEPTH
+        self.default_session_seconds = default_session_seconds or QUEUE_DEFAULT_SESSION_SECONDS
+        self.handoff_seconds = QUEUE_HANDOFF_SECONDS if handoff_seconds is None else handoff_seconds
+
+        self.lock = threading.RLock()
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.snapshot: Dict[str, Any] = {}
+
+        self.stats = {
+            'enqueued': 0,
+            'duplicates': 0,
+            'rejected_full': 0,
+            'started': 0,
+            'finished': 0,
+            'cancelled': 0
+        }
+
+        self.recover()
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call callback(snapshot) whenever the queue changes"""
+        self.listeners.append(callback)
+
+    def _entry(self, row) -> Dict[str, Any]:
+        """Turn a player_queue row into a dict"""
+        keys = [column.strip() for column in ENTRY_COLUMNS.split(',')]
+        return dict(zip(keys, row))
+
+    def _write(self, sql: str, params: tuple):
+        """Commit one statement through the store and wait for it"""
+        return self.store.submit([(sql, params)]).result(timeout=5)
+
+    def recover(self):
+        """Close out sessions that were playing when the kiosk last stopped; waiting players keep their place"""
+        with self.lock:
+            self._write("UPDATE player_queue SET status = 'interrupted', finished_at = ? WHERE status = 'playing'",
+                        (time.time(),))
+            self.refresh()
+            if self.snapshot['depth']:
+                logger.info(f"Player queue restored with {self.snapshot['depth']} waiting")
+
+    def average_session_seconds(self) -> float:
+        """Average length of recent queued sessions, or the configured default"""
+        rows = self.store.query(
+            "SELECT AVG(finished_at - started_at) FROM (SELECT finished_at, started_at FROM player_queue "
+            "WHERE status = 'done' AND started_at IS NOT NULL ORDER BY id DESC LIMIT ?)",
+            (SESSION_SAMPLE,))
+        average = rows[0][0] if rows else None
+        return float(average) if average else float(self.default_session_seconds)
+
+    def refresh(self) -> Dict[str, Any]:
+        """Rebuild the snapshot from the database and notify listeners"""
+        with self.lock:
+            now = time.time()
+            entries = [self._entry(row) for row in self.store.query(ACTIVE_ENTRIES)]
+            playing = next((entry for entry in entries if entry['status'] == PLAYING), None)
+            waiting = [entry for entry in entries if entry['status'] == WAITING]
+            average = self.average_session_seconds()
+
+            # The next player starts when the current session ends (its time limit or a typical length)
+            next_start = now
+            if playing:
+                expected = playing['time_limit'] or average
+                next_start = max(now, playing['started_at'] + expected) + self.handoff_seconds
+
+            players = []
+            for position, entry in enumerate(waiting, start=1):
+                players.append({
+                    'player_name': entry['player_name'],
+                    'position': position,
+                    'start_at': next_start,
+                    'eta_seconds': round(next_start - now)
+                })
+                next_start += (entry['time_limit'] or average) + self.handoff_seconds
+
+            self.snapshot = {
+                'depth': len(waiting),
+                'now_playing': playing['player_name'] if playing else None,
+                'players': players,
+                'avg_session_seconds': round(average),
+                'updated_at': now
+            }
+            snapshot = self.snapshot
+
+        for callback in self.listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Error in player queue listener: {e}")
+        return snapshot
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Cached queue state: depth, now_playing, players with position and ETA"""
+        with self.lock:
+            return self.snapshot
+
+    def position(self, player_name: str) -> Optional[Dict[str, Any]]:
+        """A waiting player's place in the queue"""
+        for player in self.get_snapshot()['players']:
+            if player['player_name'].lower() == player_name.lower():
+                return player
+        return None
+
+    def enqueue(self, player_name: str, skill: int = 3, time_limit: Optional[int] = None,
+                source: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Add a player to the back of the queue
+
+        Returns accepted, duplicate (already waiting or playing), position and
+        eta_seconds. A full queue rejects new players.
+        """
+        with self.lock:
+            snapshot = self.get_snapshot()
+            active = player_name.lower() == (snapshot['now_playing'] or '').lower() or self.position(player_name)
+            if not active and snapshot['depth'] >= self.max_depth:
+                self.stats['rejected_full'] += 1
+                logger.warning(f"Player queue full ({snapshot['depth']}), rejecting {player_name}")
+                return {'accepted': False, 'duplicate': False, 'reason': 'queue_full', 'depth': snapshot['depth']}
+
+            if not active:
+                self._write(ENQUEUE, (player_name, skill, time_limit, source, time.time()))
+                snapshot = self.refresh()
+                self.stats['enqueued'] += 1
+                logger.info(f"Queued {player_name} ({snapshot['depth']} waiting)")
+            else:
+                self.stats['duplicates'] += 1
+                logger.info(f"{player_name} is already queued, ignoring repeat request")
+
+            entry = self.position(player_name)
+            return {
+                'accepted': True,
+                'duplicate': bool(active),
+                'position': entry['position'] if entry else 0,  # 0: already playing
+                'eta_seconds': entry['eta_seconds'] if entry else 0,
+                'depth': snapshot['depth']
+            }
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Mark the player at the front as playing and return their entry"""
+        with self.lock:
+            rows = self.store.query(
+                f"SELECT {ENTRY_COLUMNS} FROM player_queue WHERE status = 'waiting' ORDER BY id LIMIT 1")
+            if not rows:
+                return None
+            entry = self._entry(rows[0])
+            entry['started_at'] = time.time()
+            self._write("UPDATE player_queue SET status = 'playing', started_at = ? WHERE id = ?",
+                        (entry['started_at'], entry['id']))
+            entry['status'] = PLAYING
+            self.stats['started'] += 1
+            self.refresh()
+            return entry
+
+    def finish(self, entry_id: int, status: str = 'done'):
+        """Close out a queue entry (done, stopped, time_limit, failed)"""
+        with self.lock:
+            self._write("UPDATE player_queue SET status = ?, finished_at = ? WHERE id = ?",
+                        (status, time.time(), entry_id))
+            self.stats['finished'] += 1
+            self.refresh()
+
+    def cancel(self, player_name: str) -> bool:
+        """Remove a waiting player from the queue"""
+        with self.lock:
+            if not self.position(player_name):
+                return False
+            self._write("UPDATE player_queue SET status = 'cancelled', finished_at = ? "
+                        "WHERE player_name = ? AND status = 'waiting'", (time.time(), player_name))
+            self.stats['cancelled'] += 1
+            self.refresh()
+            logger.info(f"Removed {player_name} from the queue")
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        with self.lock:
+            return dict(self.stats, depth=self.snapshot.get('depth', 0))
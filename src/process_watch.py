@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Process exit watching for DoomBox
+Blocks on a child process's pidfd so a game exit is seen the moment it
+happens, instead of polling
+"""
+
+import os
+import select
+import threading
+import logging
+import subprocess
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_WAIT_SLICE = 0.05  # Seconds per wait() when pidfds are unavailable
+
+
+class ProcessExitWaiter:
+    """
+    Waits for a subprocess.Popen to exit
+
+    Uses os.pidfd_open (Linux 5.3+, Python 3.9+) and poll(), together with a
+    wake-up pipe so another thread can cancel the wait. Where pidfds are not
+    available it falls back to short wait() slices.
+    """
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.cancelled = False
+        self.pidfd = None
+        self.fd_lock = threading.Lock()  # cancel() may race close() from another thread
+        self.wake_read, self.wake_write = os.pipe()
+
+        if hasattr(os, 'pidfd_open'):
+            try:
+                self.pidfd = os.pidfd_open(process.pid)
+            except OSError as e:
+                # Already reaped, or the kernel lacks pidfd support
+                logger.debug(f"pidfd_open failed for {process.pid}: {e}")
+
+        self.mode = 'pidfd' if self.pidfd is not None else 'wait'
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Block until the process exits; returns its exit code, or None if cancelled or timed out"""
+        if self.pidfd is not None:
+            poller = select.poll()
+            poller.register(self.pidfd, select.POLLIN)
+            poller.register(self.wake_read, select.POLLIN)
+            events = poller.poll(None if timeout is None else timeout * 1000)
+            if any(fd == self.pidfd for fd, _ in events):
+                return self.process.wait()
+            return None
+
+        remaining = timeout
+        while not self.cancelled:
+            slice_timeout = FALLBACK_WAIT_SLICE if remaining is None else min(FALLBACK_WAIT_SLICE, remaining)
+            try:
+                return self.process.wait(timeout=slice_timeout)
+            except subprocess.TimeoutExpired:
+                if remaining is not None:
+                    remaining -= slice_timeout
+                    if remaining <= 0:
+                        return None
+        return None
+
+    def cancel(self):
+        """Wake up a blocked wait() without the process exiting"""
+        self.cancelled = True
+        with self.fd_lock:
+            if self.wake_write is not None:
+                os.write(self.wake_write, b'x')
+
+    def close(self):
+        """Release the pidfd and wake-up pipe"""
+        with self.fd_lock:
+            for fd in (self.pidfd, self.wake_read, self.wake_write):
+                if fd is not None:
+                    os.close(fd)
+            self.pidfd = self.wake_read = self.wake_write = None
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Retained-mode UI layer for the DoomBox kiosk
+Pre-composites static panels into one cached surface and rebuilds only what changed
+Also caches rendered text so identical strings are rasterized once
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Tuple
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+
+class GlyphCache:
+    """
+    Bounded LRU cache of rendered text surfaces
+
+    Entries are keyed on (font, text, color, shadow color, shadow offset) and hold
+    a single surface with the shadow and text already merged, so drawing a cached
+    string is one blit instead of two font.render() calls and two blits.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[tuple, Tuple[pygame.Surface, Tuple[int, int], Tuple[int, int]]]" = OrderedDict()
+        self.memory_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _surface_bytes(self, surface: pygame.Surface) -> int:
+        """Approximate pixel memory held by a surface"""
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def _render(self, font, text: str, color, shadow_color, shadow_offset):
+        """Render text and its shadow into one SRCALPHA surface"""
+        text_surf = font.render(text, True, color)
+        if not shadow_color:
+            return text_surf, (0, 0), text_surf.get_size()
+
+        dx, dy = shadow_offset
+        width = text_surf.get_width() + abs(dx)
+        height = text_surf.get_height() + abs(dy)
+
+        # Where the text sits inside the merged surface (shadow may be up/left of it)
+        origin = (max(0, -dx), max(0, -dy))
+
+        merged = pygame.Surface((width, height), pygame.SRCALPHA)
+        shadow_surf = font.render(text, True, shadow_color)
+        merged.blit(shadow_surf, (origin[0] + dx, origin[1] + dy))
+        merged.blit(text_surf, origin)
+        return merged, origin, text_surf.get_size()
+
+    def get(self, font, text: str, color, shadow_color=None,
+            shadow_offset: Tuple[int, int] = (2, 2)) -> Tuple[pygame.Surface, Tuple[int, int], Tuple[int, int]]:
+        """
+        Get a rendered text surface
+
+        Returns (surface, text_origin, text_size); blit the surface at
+        pos - text_origin to place the text itself at pos.
+        """
+        key = (
+            font,
+            text,
+            tuple(color),
+            tuple(shadow_color) if shadow_color else None,
+            tuple(shadow_offset) if shadow_color else None,
+        )
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self._render(font, text, color, shadow_color, shadow_offset)
+        self.entries[key] = entry
+        self.memory_bytes += self._surface_bytes(entry[0])
+
+        while len(self.entries) > self.max_entries:
+            _, (evicted, _, _) = self.entries.popitem(last=False)
+            self.memory_bytes -= self._surface_bytes(evicted)
+            self.evictions += 1
+
+        return entry
+
+    def clear(self):
+        """Drop all cached surfaces"""
+        self.entries.clear()
+        self.memory_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'memory_kb': self.memory_bytes / 1024,
+        }
+
+
+class RetainedLayer:
+    """A screen region whose contents are rebuilt only when its key changes"""
+
+    def __init__(self, name: str, rect, builder: Callable[[pygame.Surface], None]):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.builder = builder  # Draws the layer onto the scene surface in screen coordinates
+        self.key = None
+        self.dirty = True
+        self.builds = 0
+        self.last_build_ms = 0.0
+
+
+class RetainedScene:
+    """
+    Composites all UI layers into a single SRCALPHA surface
+
+    Each layer owns a non-overlapping rect of the scene surface. When a layer is
+    invalidated (or its data key changes) only that rect is cleared and redrawn,
+    and the rect is reported back as dirty so static frames can use
+    pygame.display.update() instead of a full flip.
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        self.size = size
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.layers: Dict[str, RetainedLayer] = {}
+
+        self.stats = {
+            'updates': 0,
+            'layer_rebuilds': 0,
+            'clean_updates': 0,
+        }
+
+    def add_layer(self, name: str, rect, builder: Callable[[pygame.Surface], None]) -> RetainedLayer:
+        """Register a layer; layers are drawn in the order they are added"""
+        layer = RetainedLayer(name, rect, builder)
+        self.layers[name] = layer
+        return layer
+
+    def invalidate(self, name: str = None):
+        """Force a layer (or every layer) to be rebuilt on the next update"""
+        if name is None:
+            for layer in self.layers.values():
+                layer.dirty = True
+        elif name in self.layers:
+            self.layers[name].dirty = True
+
+    def _rebuild(self, layer: RetainedLayer):
+        """Clear the layer rect and redraw it"""
+        start = time.perf_counter()
+
+        self.surface.set_clip(layer.rect)
+        self.surface.fill((0, 0, 0, 0), layer.rect)
+        try:
+            layer.builder(self.surface)
+        except Exception as e:
+            logger.error(f"Error building UI layer '{layer.name}': {e}")
+        finally:
+            self.surface.set_clip(None)
+
+        layer.dirty = False
+        layer.builds += 1
+        layer.last_build_ms = (time.perf_counter() - start) * 1000
+        self.stats['layer_rebuilds'] += 1
+        logger.debug(f"Rebuilt UI layer '{layer.name}' in {layer.last_build_ms:.1f}ms")
+
+    def update(self, keys: Dict[str, Any] = None) -> List[pygame.Rect]:
+        """
+        Rebuild layers that are dirty or whose data key changed
+
+        Returns the list of rects that changed since the last update.
+        """
+        keys = keys or {}
+        dirty_rects = []
+
+        for name, layer in self.layers.items():
+            key = keys.get(name)
+            if layer.dirty or key != layer.key:
+                layer.key = key
+                self._rebuild(layer)
+                dirty_rects.append(layer.rect)
+
+        self.stats['updates'] += 1
+        if not dirty_rects:
+            self.stats['clean_updates'] += 1
+
+        return dirty_rects
+
+    def draw(self, target: pygame.Surface, rects: List[pygame.Rect] = None):
+        """Blit the composited scene, either whole or only the given rects"""
+        if rects is None:
+            target.blit(self.surface, (0, 0))
+        else:
+            for rect in rects:
+                target.blit(self.surface, rect, rect)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scene statistics"""
+        stats = dict(self.stats)
+        stats['layers'] = {
+            name: {'builds': layer.builds, 'last_build_ms': layer.last_build_ms}
+            for name, layer in self.layers.items()
+        }
+        return stats
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Score ingestion for DoomBox game sessions
+Pulls end-of-level stats from a finished dsda-doom session (levelstat.txt,
+streamed stdout, or a replay of the recorded demo) and turns them into a score
+"""
+
+import os
+import re
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# dsda-doom -levelstat line, e.g. "E1M1 - 1:08.94 (1:08)  K: 18/19  I: 31/37  S: 3/6"
+LEVELSTAT_PATTERN = re.compile(
+    r'(?P<map>E\dM\d+|MAP\d+)\s+-\s+(?P<time>[\d:.]+)\s+\((?P<total_time>[\d:.]+)\)\s+'
+    r'K:\s*(?P<kills>\d+)/(?P<max_kills>\d+)\s+'
+    r'I:\s*(?P<items>\d+)/(?P<max_items>\d+)\s+'
+    r'S:\s*(?P<secrets>\d+)/(?P<max_secrets>\d+)'
+)
+
+LEVELSTAT_FILE = 'levelstat.txt'
+
+# Scoring: every finished level is worth a flat bonus plus its kills, items and
+# secrets, and finishing quickly earns a bonus that runs out at SPEED_BONUS_SECONDS
+LEVEL_BONUS = 1000
+KILL_POINTS = 100
+ITEM_POINTS = 25
+SECRET_POINTS = 500
+SPEED_BONUS_SECONDS = 300
+SPEED_BONUS_PER_SECOND = 5
+
+
+def parse_time(text: str) -> float:
+    """Parse a dsda-doom time ("m:ss.cc" or "h:mm:ss") into seconds"""
+    seconds = 0.0
+    for part in text.split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_levelstat_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one level summary line; returns None if the line is not one"""
+    match = LEVELSTAT_PATTERN.search(line)
+    if not match:
+        return None
+
+    level = {key: int(value) for key, value in match.groupdict().items()
+             if key not in ('map', 'time', 'total_time')}
+    level['map'] = match.group('map')
+    level['seconds'] = parse_time(match.group('time'))
+    return level
+
+
+def parse_levelstat(text: str) -> List[Dict[str, Any]]:
+    """Parse every level summary in a block of text"""
+    return [level for level in map(parse_levelstat_line, text.splitlines()) if level]
+
+
+def compute_score(levels: List[Dict[str, Any]]) -> int:
+    """Score a session from its finished levels"""
+    score = 0
+    for level in levels:
+        score += LEVEL_BONUS
+        score += level['kills'] * KILL_POINTS
+        score += level['items'] * ITEM_POINTS
+        score += level['secrets'] * SECRET_POINTS
+        score += int(max(0.0, SPEED_BONUS_SECONDS - level['seconds']) * SPEED_BONUS_PER_SECOND)
+    return score
+
+
+class SessionScoreIngestor:
+    """
+    Collects end-of-level stats for one game session
+
+    The game runs with -levelstat in session_dir, so dsda-doom writes
+    levelstat.txt there on exit; that file is authoritative. Level lines seen on
+    the game's stdout/stderr (fed in through feed_line or add_level) are the second source,
+    and replaying the recorded demo with -fastdemo is the last resort after a
+    crash, bounded by replay_timeout so ingestion stays within the
+    exit-to-leaderboard budget.
+    """
+
+    def __init__(self, session_dir: str, demo_path: str = None, executable: str = None,
+                 iwad: str = None, replay_timeout: float = 0.5):
+        self.session_dir = session_dir
+        self.demo_path = demo_path
+        self.executable = executable
+        self.iwad = iwad
+        self.replay_timeout = replay_timeout
+
+        self.streamed_levels: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+
+    def feed_line(self, line: str):
+        """Take one line of game output"""
+        level = parse_levelstat_line(line)
+        if level:
+            self.add_level(level)
+
+    def add_level(self, level: Dict[str, Any]):
+        """Take one level summary already parsed from the game's output"""
+        with self.lock:
+            self.streamed_levels.append(level)
+        logger.info(f"Level finished: {level['map']} in {level['seconds']:.1f}s "
+                    f"(K {level['kills']}/{level['max_kills']})")
+
+    def _read_levelstat_file(self, directory: str) -> Optional[List[Dict[str, Any]]]:
+        """Parse levelstat.txt in a directory; None if the game didn't write one"""
+        path = os.path.join(directory, LEVELSTAT_FILE)
+        try:
+            with open(path, 'r', errors='replace') as f:
+                return parse_levelstat(f.read())
+        except OSError:
+            return None
+
+    def _replay_demo(self, timeout: float) -> List[Dict[str, Any]]:
+        """Replay the recorded demo headless to regenerate level stats"""
+        if not (self.demo_path and self.executable and self.iwad):
+            return []
+        demo = self.demo_path if self.demo_path.endswith('.lmp') else self.demo_path + '.lmp'
+        if not os.path.exists(demo) or not (shutil.which(self.executable) or os.path.exists(self.executable)):
+            return []
+
+        replay_dir = tempfile.mkdtemp(prefix='doombox-replay-')
+        try:
+            subprocess.run(
+                [self.executable, '-iwad', self.iwad, '-fastdemo', demo,
+                 '-nodraw', '-nosound', '-nomusic', '-levelstat'],
+                cwd=replay_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                env=dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy'),
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Demo replay for score ingestion timed out after {timeout:.1f}s")
+        except OSError as e:
+            logger.warning(f"Could not replay demo for score ingestion: {e}")
+        try:
+            return self._read_levelstat_file(replay_dir) or []
+        finally:
+            shutil.rmtree(replay_dir, ignore_errors=True)
+
+    def collect(self, replay_timeout: float = None,
+                crashed: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get the session's finished levels and which source they came from
+
+        A levelstat.txt, even an empty one, means the game exited cleanly and is
+        the answer. The demo is only replayed for a crashed game (non-zero exit)
+        that left neither the file nor level lines on its output.
+        """
+        levels = self._read_levelstat_file(self.session_dir)
+        if levels is not None:
+            return levels, 'levelstat'
+
+        with self.lock:
+            levels = list(self.streamed_levels)
+        if levels:
+            return levels, 'stdout'
+
+        if crashed:
+            levels = self._replay_demo(self.replay_timeout if replay_timeout is None else replay_timeout)
+            if levels:
+                return levels, 'demo'
+
+        return [], None
+
+    def ingest(self, replay_timeout: float = None, crashed: bool = False) -> Dict[str, Any]:
+        """Compute the session result: score (None if no level was finished), levels, source, timing"""
+        start = time.perf_counter()
+        levels, source = self.collect(replay_timeout, crashed)
+        return {
+            'score': compute_score(levels) if levels else None,
+            'levels': levels,
+            'source': source,
+            'ingest_ms': (time.perf_counter() - start) * 1000,
+        }
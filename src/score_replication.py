@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Multi-kiosk score replication for DoomBox
+Each kiosk gossips the scores it records over MQTT and merges the ones other
+kiosks record into its own database, so every leaderboard converges without
+a central server
+"""
+
+import os
+import sys
+import time
+import socket
+import logging
+import threading
+from typing import Callable, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import KIOSK_ID, REPLICATION_TOPIC, REPLICATION_SYNC_INTERVAL, REPLICATION_BATCH_SIZE
+except ImportError:
+    # Fallback configuration
+    KIOSK_ID = os.environ.get('DOOMBOX_KIOSK_ID') or socket.gethostname()
+    REPLICATION_TOPIC = 'doombox/replication'
+    REPLICATION_SYNC_INTERVAL = 10
+    REPLICATION_BATCH_SIZE = 50
+
+ROW_COLUMNS = 'kiosk_id, origin_seq, player_name, score, timestamp'
+MERGE_SCORE = f'INSERT OR IGNORE INTO scores ({ROW_COLUMNS}) VALUES (?, ?, ?, ?, ?)'
+ROWS_AFTER = f'SELECT {ROW_COLUMNS} FROM scores WHERE kiosk_id = ? AND origin_seq > ? ORDER BY origin_seq LIMIT ?'
+# First sequence number after which an origin's scores stop being contiguous
+CONTIGUOUS_END = '''
+    SELECT MIN(origin_seq) FROM scores AS a
+    WHERE kiosk_id = ? AND NOT EXISTS (
+        SELECT 1 FROM scores AS b WHERE b.kiosk_id = a.kiosk_id AND b.origin_seq = a.origin_seq + 1
+    )
+'''
+
+
+class ScoreReplicator:
+    """
+    Gossip replication of the scores table between kiosks
+
+    Every score is keyed by (kiosk_id, origin_seq): the kiosk that recorded it
+    and that kiosk's own counter. Merging is INSERT OR IGNORE on that key, so
+    receiving a score twice, out of order, or relayed by a third kiosk is
+    harmless, and the leaderboards (best score per player) converge.
+
+    Two message types go to REPLICATION_TOPIC/<kiosk_id>:
+      scores   new rows, pushed as soon as they are recorded
+      summary  per origin, the highest sequence held without gaps; sent every
+               REPLICATION_SYNC_INTERVAL and after a gap is noticed, and
+               answered by peers with whatever the sender is missing
+    so messages lost while a kiosk or the broker was away are repaired.
+    """
+
+    def __init__(self, store, publish: Callable[[str, Dict[str, Any]], Any], kiosk_id: str = None,
+                 topic: str = None, sync_interval: float = None, batch_size: int = None):
+        self.store = store
+        self.publish = publish
+        self.kiosk_id = kiosk_id or KIOSK_ID
+        self.topic = topic or REPLICATION_TOPIC
+        self.sync_interval = sync_interval or REPLICATION_SYNC_INTERVAL
+        self.batch_size = batch_size or REPLICATION_BATCH_SIZE
+
+        self.lock = threading.Lock()
+        self.listeners: List[Callable[[List[Tuple[str, int]]], None]] = []
+        self.last_pushed = 0
+        self.peers: Dict[str, float] = {}
+        self.wake = threading.Event()
+        self.summary_requested = False
+        self.running = False
+        self.thread = None
+
+        self.stats = {
+            'pushed': 0,
+            'merged': 0,
+            'duplicates': 0,
+            'repairs_sent': 0,
+            'summaries_sent': 0,
+            'gaps_seen': 0
+        }
+
+        self._claim_identity()
+
+    @property
+    def subscription(self) -> str:
+        """Topic pattern covering every kiosk"""
+        return f"{self.topic}/+"
+
+    def _claim_identity(self):
+        """Record this kiosk's id so new scores are stamped, and adopt scores recorded before replication"""
+        self.store.submit([
+            ('INSERT OR REPLACE INTO replication_identity (id, kiosk_id) VALUES (1, ?)', (self.kiosk_id,)),
+        ]).result(timeout=5)
+
+        unclaimed = self.store.query('SELECT id FROM scores WHERE kiosk_id IS NULL ORDER BY id')
+        if unclaimed:
+            next_seq = self._contiguous_seq(self.kiosk_id) + 1
+            self.store.submit([
+                ('UPDATE scores SET kiosk_id = ?, origin_seq = ? WHERE id = ?', (self.kiosk_id, seq, row_id))
+                for seq, (row_id,) in enumerate(unclaimed, start=next_seq)
+            ]).result(timeout=5)
+            logger.info(f"Stamped {len(unclaimed)} existing scores with kiosk id {self.kiosk_id}")
+
+        # Earlier scores reach peers through summaries; pushes start from here
+        self.last_pushed = self._contiguous_seq(self.kiosk_id)
+
+    def add_listener(self, callback: Callable[[List[Tuple[str, int]]], None]):
+        """Call callback([(player_name, score), ...]) once per batch of scores merged from other kiosks"""
+        self.listeners.append(callback)
+
+    def _contiguous_seq(self, kiosk_id: str) -> int:
+        """Highest sequence number held for an origin with nothing missing before it"""
+        first = self.store.query('SELECT MIN(origin_seq) FROM scores WHERE kiosk_id = ?', (kiosk_id,))[0][0]
+        if first != 1:
+            return 0
+        return self.store.query(CONTIGUOUS_END, (kiosk_id,))[0][0]
+
+    def _rows(self, kiosk_id: str, after: int) -> List[Dict[str, Any]]:
+        """Rows recorded by an origin after a sequence number"""
+        keys = [column.strip() for column in ROW_COLUMNS.split(',')]
+        return [dict(zip(keys, row)) for row in self.store.query(ROWS_AFTER, (kiosk_id, after, self.batch_size))]
+
+    def _send(self, message_type: str, **fields) -> bool:
+        message = dict(fields, type=message_type, kiosk_id=self.kiosk_id, sent_at=time.time())
+        return bool(self.publish(f"{self.topic}/{self.kiosk_id}", message))
+
+    def summary(self) -> Dict[str, int]:
+        """Per origin, the highest sequence number held without gaps"""
+        self.store.flush(timeout=5)
+        origins = [row[0] for row in self.store.query('SELECT DISTINCT kiosk_id FROM scores WHERE kiosk_id IS NOT NULL')]
+        return {origin: self._contiguous_seq(origin) for origin in origins}
+
+    def push_local(self, player_name: str = None, score: int = None):
+        """
+        Have the sync thread send newly recorded scores (usable directly as a score callback)
+
+        Score callbacks run on the store's writer thread, which must not wait on
+        the store itself, so the flush and push happen on the sync thread.
+        """
+        self.wake.set()
+
+    def _push_new(self):
+        """Send scores recorded here since the last push"""
+        self.store.flush(timeout=5)
+        with self.lock:
+            rows = self._rows(self.kiosk_id, self.last_pushed)
+            if rows and self._send('scores', rows=rows):
+                self.last_pushed = rows[-1]['origin_seq']
+                self.stats['pushed'] += len(rows)
+
+    def send_summary(self):
+        """Tell peers what we hold so they can send what we're missing"""
+        if self._send('summary', have=self.summary()):
+            self.stats['summaries_sent'] += 1
+
+    def handle(self, message: Dict[str, Any]):
+        """Process a replication message from another kiosk"""
+        sender = message.get('kiosk_id')
+        if not sender or sender == self.kiosk_id:
+            return
+        self.peers[sender] = time.time()
+
+        if message.get('type') == 'scores':
+            self._merge(message.get('rows', []))
+        elif message.get('type') == 'summary':
+            self._answer_summary(message.get('have', {}))
+
+    def _merge(self, rows: List[Dict[str, Any]]):
+        """Insert rows from other kiosks, ignoring ones already held"""
+        rows = [row for row in rows if row['kiosk_id'] != self.kiosk_id]
+        if not rows:
+            return
+
+        with self.lock:
+            held = set()
+            for origin in {row['kiosk_id'] for row in rows}:
+                seqs = [row['origin_seq'] for row in rows if row['kiosk_id'] == origin]
+                placeholders = ','.join('?' * len(seqs))
+                held.update((origin, seq) for (seq,) in self.store.query(
+                    f'SELECT origin_seq FROM scores WHERE kiosk_id = ? AND origin_seq IN ({placeholders})',
+                    (origin, *seqs)))
+
+            new_rows = [row for row in rows if (row['kiosk_id'], row['origin_seq']) not in held]
+            self.stats['duplicates'] += len(rows) - len(new_rows)
+            if new_rows:
+                self.store.submit([
+                    (MERGE_SCORE, tuple(row[key.strip()] for key in ROW_COLUMNS.split(',')))
+                    for row in new_rows
+                ]).result(timeout=5)
+                self.stats['merged'] += len(new_rows)
+
+            # A hole before what just arrived: ask peers to fill it
+            gap = any(self._contiguous_seq(origin) < max(row['origin_seq'] for row in rows if row['kiosk_id'] == origin)
+                      for origin in {row['kiosk_id'] for row in new_rows})
+
+        if new_rows:
+            scores = [(row['player_name'], row['score']) for row in new_rows]
+            for callback in self.listeners:
+                try:
+                    callback(scores)
+                except Exception as e:
+                    logger.error(f"Error in replication listener: {e}")
+        if gap:
+            self.stats['gaps_seen'] += 1
+            self.sync_now()
+
+    def _answer_summary(self, have: Dict[str, int]):
+        """Send a peer the rows it is missing, for every origin we hold"""
+        mine = self.summary()
+        for origin, our_seq in mine.items():
+            their_seq = have.get(origin, 0)
+            if our_seq <= their_seq:
+                continue
+            rows = self._rows(origin, their_seq)
+            if rows and self._send('scores', rows=rows):
+                self.stats['repairs_sent'] += len(rows)
+
+    def start(self):
+        """Start periodic summaries"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._sync_loop, name='score-replication', daemon=True)
+        self.thread.start()
+
+    def _sync_loop(self):
+        next_summary = 0.0
+        while self.running:
+            self.wake.clear()  # Before the work, so a wake during it isn't lost
+            try:
+                self._push_new()
+                if self.summary_requested or time.monotonic() >= next_summary:
+                    self.summary_requested = False
+                    self.send_summary()
+                    next_summary = time.monotonic() + self.sync_interval
+            except Exception as e:
+                logger.error(f"Score replication sync failed: {e}")
+            self.wake.wait(max(0.0, next_summary - time.monotonic()))
+
+    def sync_now(self):
+        """Push and exchange summaries straight away (e.g. after reconnecting)"""
+        self.summary_requested = True
+        self.wake.set()
+
+    def stop(self):
+        """Stop periodic summaries"""
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get replication statistics"""
+        return dict(self.stats, kiosk_id=self.kiosk_id, peers=sorted(self.peers), last_pushed=self.last_pushed)
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Shared score and session store for DoomBox
+One SQLite database for the kiosk and game launcher, with long-lived per-thread
+connections in WAL mode and a single writer thread that batches inserts
+"""
+
+import os
+import sys
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import List, Tuple, Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import SCORE_DATABASE, DB_TIMEOUT, DB_RETRY_ATTEMPTS, AUTO_VACUUM
+except ImportError:
+    # Fallback configuration
+    SCORE_DATABASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'doombox_scores.db')
+    DB_TIMEOUT = 30
+    DB_RETRY_ATTEMPTS = 3
+    AUTO_VACUUM = True
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    # 1: scores and session events
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS game_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            event TEXT NOT NULL,
+            exit_code INTEGER,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ],
+    # 2: leaderboard index and per-player best scores, kept current by triggers
+    [
+        'CREATE INDEX IF NOT EXISTS idx_scores_score_timestamp ON scores (score DESC, timestamp)',
+        '''
+        CREATE TABLE IF NOT EXISTS player_best (
+            player_name TEXT PRIMARY KEY,
+            score INTEGER NOT NULL,
+            timestamp DATETIME,
+            score_id INTEGER
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_player_best_score ON player_best (score DESC, timestamp)',
+        '''
+        CREATE TRIGGER IF NOT EXISTS scores_player_best_insert AFTER INSERT ON scores
+        BEGIN
+            INSERT INTO player_best (player_name, score, timestamp, score_id)
+            VALUES (NEW.player_name, NEW.score, NEW.timestamp, NEW.id)
+            ON CONFLICT(player_name) DO UPDATE SET
+                score = excluded.score, timestamp = excluded.timestamp, score_id = excluded.score_id
+            WHERE excluded.score > player_best.score;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS scores_player_best_delete AFTER DELETE ON scores
+        BEGIN
+            DELETE FROM player_best WHERE player_name = OLD.player_name;
+            INSERT INTO player_best (player_name, score, timestamp, score_id)
+            SELECT player_name, score, timestamp, id FROM scores
+            WHERE player_name = OLD.player_name
+            ORDER BY score DESC, timestamp ASC LIMIT 1;
+        END
+        ''',
+        # Backfill from the scores already recorded
+        'DELETE FROM player_best',
+        '''
+        INSERT INTO player_best (player_name, score, timestamp, score_id)
+        SELECT player_name, score, timestamp, id FROM (
+            SELECT player_name, score, timestamp, id,
+                   ROW_NUMBER() OVER (PARTITION BY player_name ORDER BY score DESC, timestamp ASC) AS rank
+            FROM scores
+        ) WHERE rank = 1
+        ''',
+    ],
+    # 3: persistent player queue; one active (waiting or playing) entry per player
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS player_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL COLLATE NOCASE,
+            skill INTEGER NOT NULL DEFAULT 3,
+            time_limit INTEGER,
+            source TEXT,
+            status TEXT NOT NULL DEFAULT 'waiting',
+            enqueued_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+        ''',
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_player_queue_active ON player_queue (player_name) "
+        "WHERE status IN ('waiting', 'playing')",
+        'CREATE INDEX IF NOT EXISTS idx_player_queue_status ON player_queue (status, id)',
+    ],
+    # 4: MQTT messages waiting for the broker to acknowledge them
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS mqtt_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            qos INTEGER NOT NULL DEFAULT 1,
+            retain INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL
+        )
+        ''',
+    ],
+    # 5: score origins for multi-kiosk replication. Each score is identified by
+    # (kiosk_id, origin_seq); local inserts are stamped by trigger once this
+    # kiosk has an identity, so every writer keeps using INSERT_SCORE
+    [
+        'ALTER TABLE scores ADD COLUMN kiosk_id TEXT',
+        'ALTER TABLE scores ADD COLUMN origin_seq INTEGER',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_scores_origin ON scores (kiosk_id, origin_seq)',
+        '''
+        CREATE TABLE IF NOT EXISTS replication_identity (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            kiosk_id TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS scores_stamp_origin AFTER INSERT ON scores
+        WHEN NEW.kiosk_id IS NULL AND EXISTS (SELECT 1 FROM replication_identity)
+        BEGIN
+            UPDATE scores SET
+                kiosk_id = (SELECT kiosk_id FROM replication_identity),
+                origin_seq = (SELECT COALESCE(MAX(origin_seq), 0) + 1 FROM scores
+                              WHERE kiosk_id = (SELECT kiosk_id FROM replication_identity))
+            WHERE id = NEW.id;
+        END
+        ''',
+        # Equal best scores resolve to the earliest, so replicas agree whatever order scores arrive in
+        'DROP TRIGGER IF EXISTS scores_player_best_insert',
+        '''
+        CREATE TRIGGER scores_player_best_insert AFTER INSERT ON scores
+        BEGIN
+            INSERT INTO player_best (player_name, score, timestamp, score_id)
+            VALUES (NEW.player_name, NEW.score, NEW.timestamp, NEW.id)
+            ON CONFLICT(player_name) DO UPDATE SET
+                score = excluded.score, timestamp = excluded.timestamp, score_id = excluded.score_id
+            WHERE excluded.score > player_best.score
+               OR (excluded.score = player_best.score AND excluded.timestamp < player_best.timestamp);
+        END
+        ''',
+    ],
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+TOP_SCORES = 'SELECT player_name, score FROM scores ORDER BY score DESC, timestamp ASC LIMIT ?'
+TOP_PLAYERS = 'SELECT player_name, score FROM player_best ORDER BY score DESC, timestamp ASC LIMIT ?'
+INSERT_SCORE = 'INSERT INTO scores (player_name, score) VALUES (?, ?)'
+INSERT_SESSION_EVENT = 'INSERT INTO game_sessions (player_name, event, exit_code) VALUES (?, ?, ?)'
+
+# A write is a list of (sql, params) statements committed together
+Statements = List[Tuple[str, tuple]]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Schema version recorded in the database"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """Apply pending schema migrations, each in its own transaction; returns (old, new) version"""
+    old_version = schema_version(conn)
+    for version, statements in enumerate(MIGRATIONS, start=1):
+        if version <= old_version:
+            continue
+        try:
+            conn.execute('BEGIN')
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+            logger.info(f"Migrated score database to schema version {version}")
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    return old_version, schema_version(conn)
+
+
+class ScoreStore:
+    """
+    Score and session database shared by every DoomBox component
+
+    Reads use a long-lived connection per thread, so the render thread never
+    opens a connection or waits on another thread's. All writes go through one
+    queue drained by a writer thread, which commits whatever has queued up in a
+    single transaction. WAL mode lets readers keep reading while it commits.
+    """
+
+    def __init__(self, db_path: str = None, timeout: float = None, auto_vacuum: bool = None,
+                 batch_size: int = 64, vacuum_interval: float = 3600):
+        self.db_path = db_path or SCORE_DATABASE
+        self.timeout = DB_TIMEOUT if timeout is None else timeout
+        self.auto_vacuum = AUTO_VACUUM if auto_vacuum is None else auto_vacuum
+        self.batch_size = batch_size
+        self.vacuum_interval = vacuum_interval
+
+        self.local = threading.local()
+        self.connections: List[sqlite3.Connection] = []
+        self.connections_lock = threading.Lock()
+
+        self.write_queue: "queue.Queue[Optional[Tuple[Statements, Future]]]" = queue.Queue()
+        self.writer_thread = None
+        self.running = False
+        self.last_vacuum = time.time()
+
+        self.stats = {
+            'reads': 0,
+            'writes': 0,
+            'batches': 0,
+            'max_batch': 0,
+            'retries': 0,
+            'errors': 0,
+            'last_commit_ms': 0.0,
+        }
+        self.query_ms = deque(maxlen=256)  # Recent read latencies
+
+        self._init_database()
+        self.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the store's pragmas applied"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=128)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        with self.connections_lock:
+            self.connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Long-lived connection for the calling thread"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self.local.conn = conn
+        return conn
+
+    def _init_database(self):
+        """Create the schema and apply the auto-vacuum setting"""
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = self.connection()
+        if self.auto_vacuum:
+            mode = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+            if mode != 2:  # 2 = INCREMENTAL
+                # Switching an existing database (even an empty WAL one) needs a VACUUM; it runs once
+                logger.info("Converting score database to incremental auto-vacuum")
+                conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                conn.execute('VACUUM')
+
+        migrate(conn)
+        logger.info(f"Score store ready: {self.db_path}")
+
+    def start(self):
+        """Start the writer thread"""
+        if self.running:
+            return
+        self.running = True
+        self.writer_thread = threading.Thread(target=self._writer_loop, name='score-store-writer', daemon=True)
+        self.writer_thread.start()
+
+    def _writer_loop(self):
+        """Drain the write queue, committing each batch in one transaction"""
+        conn = self.connection()
+        while True:
+            try:
+                item = self.write_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not self.running:
+                    break
+                self._maybe_vacuum(conn)
+                continue
+
+            if item is None:
+                break
+
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.running = False
+                    break
+                batch.append(item)
+
+            self._commit_batch(conn, batch)
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[Tuple[Statements, Future]]):
+        """Commit a batch of writes, retrying while the database is locked"""
+        start = time.perf_counter()
+        for attempt in range(DB_RETRY_ATTEMPTS):
+            try:
+                results = []
+                with conn:
+                    for statements, _ in batch:
+                        cursor = None
+                        for sql, params in statements:
+                            cursor = conn.execute(sql, params)
+                        results.append(cursor.lastrowid if cursor else None)
+                break
+            except sqlite3.Error as e:
+                locked = isinstance(e, sqlite3.OperationalError) and 'locked' in str(e)
+                if locked and attempt < DB_RETRY_ATTEMPTS - 1:
+                    self.stats['retries'] += 1
+                    time.sleep(0.05 * (attempt + 1))
+                    continue
+                if not locked and len(batch) > 1:
+                    # One bad write must not take the rest of the batch down with it
+                    for item in batch:
+                        self._commit_batch(conn, [item])
+                    return
+                self._fail_batch(batch, e)
+                return
+
+        self.stats['batches'] += 1
+        self.stats['writes'] += len(batch)
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+        self.stats['last_commit_ms'] = (time.perf_counter() - start) * 1000
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _fail_batch(self, batch: List[Tuple[Statements, Future]], error: Exception):
+        """Report a failed batch to every waiting writer"""
+        self.stats['errors'] += 1
+        logger.error(f"Score store write failed ({len(batch)} queued writes): {error}")
+        for _, future in batch:
+            future.set_exception(error)
+
+    def _maybe_vacuum(self, conn: sqlite3.Connection):
+        """Return free pages to the filesystem while the writer is idle"""
+        if not self.auto_vacuum or time.time() - self.last_vacuum < self.vacuum_interval:
+            return
+        self.last_vacuum = time.time()
+        try:
+            conn.execute('PRAGMA incremental_vacuum')
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Incremental vacuum failed: {e}")
+
+    def submit(self, statements: Statements) -> Future:
+        """Queue statements to be committed together; the future resolves to the last row id"""
+        future = Future()
+        if not self.running:
+            future.set_exception(RuntimeError("Score store is closed"))
+            return future
+        self.write_queue.put((statements, future))
+        return future
+
+    def add_score(self, player_name: str, score: int) -> Future:
+        """Queue a score insert"""
+        return self.submit([(INSERT_SCORE, (player_name, int(score)))])
+
+    def log_session(self, player_name: str, event: str, exit_code: Optional[int] = None) -> Future:
+        """Queue a game session event"""
+        return self.submit([(INSERT_SESSION_EVENT, (player_name, event, exit_code))])
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a read on the calling thread's connection"""
+        self.stats['reads'] += 1
+        start = time.perf_counter()
+        rows = self.connection().execute(sql, params).fetchall()
+        self.query_ms.append((time.perf_counter() - start) * 1000)
+        return rows
+
+    def top_scores(self, limit: int = 10, distinct_players: bool = True) -> List[Tuple[str, int]]:
+        """Leaderboard rows, one per player (best score) unless distinct_players is False"""
+        return self.query(TOP_PLAYERS if distinct_players else TOP_SCORES, (limit,))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until everything queued so far is committed"""
+        try:
+            self.submit([]).result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        stats = dict(self.stats)
+        stats['queued'] = self.write_queue.qsize()
+        stats['connections'] = len(self.connections)
+        stats['avg_batch'] = self.stats['writes'] / self.stats['batches'] if self.stats['batches'] else 0.0
+        recent = sorted(self.query_ms)
+        stats['query_p50_ms'] = recent[len(recent) // 2] if recent else 0.0
+        stats['query_p95_ms'] = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return stats
+
+    def close(self):
+        """Flush pending writes, stop the writer and close every connection"""
+        if self.running:
+            self.write_queue.put(None)
+            self.running = False
+            if self.writer_thread:
+                self.writer_thread.join(timeout=self.timeout)
+
+        with self.connections_lock:
+            for conn in self.connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self.connections = []
+        self.local = threading.local()
+
+
+_stores: Dict[str, ScoreStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_score_store(db_path: str = None) -> ScoreStore:
+    """Get the process-wide store for a database, creating it on first use"""
+    path = os.path.abspath(db_path or SCORE_DATABASE)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None or not store.running:
+            store = ScoreStore(path)
+            _stores[path] = store
+        return store
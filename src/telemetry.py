@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Telemetry publisher for DoomBox
+Samples kiosk health (frame rate, video, database, game, queue, SoC
+temperature) and publishes it over MQTT as retained keyframes plus deltas,
+on a fixed interval and whenever something significant changes
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import (TELEMETRY_ENABLED, TELEMETRY_INTERVAL, TELEMETRY_CHECK_INTERVAL,
+                               TELEMETRY_CHANGE_THRESHOLDS, SOC_TEMP_PATH)
+except ImportError:
+    # Fallback configuration
+    TELEMETRY_ENABLED = True
+    TELEMETRY_INTERVAL = 30
+    TELEMETRY_CHECK_INTERVAL = 1.0
+    TELEMETRY_CHANGE_THRESHOLDS = {
+        'game_state': 0,
+        'queue_depth': 0,
+        'fps': 5.0,
+        'frame_p95_ms': 8.0,
+        'db_query_p95_ms': 10.0,
+        'soc_temp_c': 3.0
+    }
+    SOC_TEMP_PATH = '/sys/class/thermal/thermal_zone0/temp'
+
+
+def read_soc_temperature(path: str = SOC_TEMP_PATH) -> Optional[float]:
+    """SoC temperature in degrees C from a thermal zone (millidegrees), None if unavailable"""
+    try:
+        with open(path, 'r') as f:
+            return round(int(f.read().strip()) / 1000.0, 1)
+    except (OSError, ValueError):
+        return None
+
+
+def _normalize(value: Any) -> Any:
+    """Round floats so jitter below display precision doesn't show up as a change"""
+    if isinstance(value, float):
+        return round(value, 1)
+    return value
+
+
+class TelemetryPublisher:
+    """
+    Periodic, change-driven telemetry stream
+
+    Each source is a callable returning a flat dict of fields. Every check
+    interval all sources are sampled; a keyframe (every field, retained) goes
+    out every `interval` seconds, and in between a delta is sent as soon as a
+    field moves by more than its threshold in TELEMETRY_CHANGE_THRESHOLDS
+    (fields not listed ride along but never trigger a send on their own).
+
+    Deltas are cumulative against the last keyframe and carry its sequence
+    number as `base`, so a dashboard that has the retained keyframe is
+    current after applying any single delta, and a missed delta costs nothing.
+    """
+
+    def __init__(self, publish: Callable[[Dict[str, Any], bool], Any], interval: float = None,
+                 check_interval: float = None, thresholds: Dict[str, float] = None):
+        self.publish = publish
+        self.interval = interval or TELEMETRY_INTERVAL
+        self.check_interval = check_interval or TELEMETRY_CHECK_INTERVAL
+        self.thresholds = TELEMETRY_CHANGE_THRESHOLDS if thresholds is None else thresholds
+
+        self.sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.running = False
+        self.thread = None
+
+        self.seq = 0
+        self.keyframe: Dict[str, Any] = {}
+        self.keyframe_seq = 0
+        self.keyframe_time = 0.0
+        self.last_sent: Dict[str, Any] = {}
+
+        self.stats = {
+            'keyframes': 0,
+            'deltas': 0,
+            'samples': 0,
+            'source_errors': 0,
+            'last_sample_ms': 0.0
+        }
+
+    def add_source(self, name: str, sampler: Callable[[], Dict[str, Any]]):
+        """Register a sampler returning a flat dict of telemetry fields"""
+        with self.lock:
+            self.sources[name] = sampler
+
+    def sample(self) -> Dict[str, Any]:
+        """Read every source once"""
+        start = time.perf_counter()
+        with self.lock:
+            sources = list(self.sources.items())
+        fields = {}
+        for name, sampler in sources:
+            try:
+                fields.update({key: _normalize(value) for key, value in sampler().items()})
+            except Exception as e:
+                self.stats['source_errors'] += 1
+                logger.debug(f"Telemetry source {name} failed: {e}")
+        self.stats['samples'] += 1
+        self.stats['last_sample_ms'] = (time.perf_counter() - start) * 1000
+        return fields
+
+    def _significant(self, fields: Dict[str, Any]) -> bool:
+        """Has any trigger field moved past its threshold since it was last sent?"""
+        for key, threshold in self.thresholds.items():
+            old, new = self.last_sent.get(key), fields.get(key)
+            if old == new:
+                continue
+            if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+                if abs(new - old) > threshold:
+                    return True
+            else:
+                return True  # Appeared, disappeared or a state change
+        return False
+
+    def _message(self, kind: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        self.seq += 1
+        return {
+            'type': kind,
+            'seq': self.seq,
+            'base': self.keyframe_seq if kind == 'delta' else self.seq,
+            'fields': fields,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def check(self, force_keyframe: bool = False) -> Optional[str]:
+        """Sample and publish if due; returns 'keyframe', 'delta' or None"""
+        fields = self.sample()
+        now = time.monotonic()
+
+        if force_keyframe or not self.keyframe or now - self.keyframe_time >= self.interval:
+            message = self._message('keyframe', fields)
+            self.keyframe, self.keyframe_seq, self.keyframe_time = fields, message['seq'], now
+            self.last_sent = fields
+            self.stats['keyframes'] += 1
+            self.publish(message, True)
+            return 'keyframe'
+
+        if self._significant(fields):
+            changed = {key: value for key, value in fields.items() if self.keyframe.get(key) != value}
+            removed = [key for key in self.keyframe if key not in fields]
+            if removed:
+                changed.update({key: None for key in removed})
+            self.last_sent = fields
+            self.stats['deltas'] += 1
+            self.publish(self._message('delta', changed), False)
+            return 'delta'
+        return None
+
+    def notify(self):
+        """Check now instead of at the next interval (e.g. on a game state change)"""
+        self.wake.set()
+
+    def start(self):
+        """Start the sampling thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name='telemetry', daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        while self.running:
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Telemetry publish failed: {e}")
+            self.wake.wait(self.check_interval)
+            self.wake.clear()
+
+    def stop(self):
+        """Stop the sampling thread"""
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get publisher statistics"""
+        return dict(self.stats, seq=self.seq, fields=len(self.keyframe))
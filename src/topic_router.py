@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+MQTT topic router for DoomBox
+Matches incoming messages against a registry of topic patterns (MQTT + and #
+wildcards), drops messages this client published itself, and counts what was
+handled and dropped per topic
+"""
+
+import json
+import logging
+import threading
+from typing import Callable, Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Messages published by DoomBox carry the sender's id under this key
+ORIGIN_KEY = 'origin'
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """MQTT subscription matching: + is one level, # is the rest (including none)"""
+    pattern_levels = pattern.split('/')
+    topic_levels = topic.split('/')
+    for index, level in enumerate(pattern_levels):
+        if level == '#':
+            return index == len(pattern_levels) - 1
+        if index >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[index]:
+            return False
+    return len(pattern_levels) == len(topic_levels)
+
+
+class TopicRouter:
+    """
+    Registry of topic pattern -> handler(topic, data)
+
+    route() decodes the JSON payload, drops messages stamped with our own
+    origin id (brokers deliver a client's publishes back to it when it is also
+    subscribed), and calls every handler whose pattern matches. Messages with
+    no matching route, bad JSON, or a failing handler count as dropped.
+    """
+
+    def __init__(self, origin_id: str):
+        self.origin_id = origin_id
+        self.routes: List[tuple] = []
+        self.lock = threading.Lock()
+        self.topic_stats: Dict[str, Dict[str, int]] = {}
+        self.drop_reasons = {
+            'self_echo': 0,
+            'invalid_json': 0,
+            'no_route': 0,
+            'handler_error': 0
+        }
+
+    def add_route(self, pattern: str, handler: Callable[[str, Any], None]):
+        """Send messages on topics matching pattern to handler(topic, data)"""
+        with self.lock:
+            self.routes.append((pattern, handler))
+
+    def subscriptions(self) -> List[str]:
+        """Distinct patterns to subscribe to, in registration order"""
+        with self.lock:
+            return list(dict.fromkeys(pattern for pattern, _ in self.routes))
+
+    def stamp(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark an outgoing message as ours"""
+        message[ORIGIN_KEY] = self.origin_id
+        return message
+
+    def _count(self, topic: str, outcome: str, reason: str = None):
+        with self.lock:
+            counts = self.topic_stats.setdefault(topic, {'handled': 0, 'dropped': 0})
+            counts[outcome] += 1
+            if reason:
+                self.drop_reasons[reason] += 1
+
+    def route(self, topic: str, payload: bytes) -> bool:
+        """Deliver one message; returns True if at least one handler took it"""
+        try:
+            data = json.loads(payload.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            logger.error(f"Invalid JSON payload on {topic}: {payload[:200]!r}")
+            self._count(topic, 'dropped', 'invalid_json')
+            return False
+
+        if isinstance(data, dict) and data.get(ORIGIN_KEY) == self.origin_id:
+            self._count(topic, 'dropped', 'self_echo')
+            return False
+
+        with self.lock:
+            handlers = [handler for pattern, handler in self.routes if topic_matches(pattern, topic)]
+        if not handlers:
+            self._count(topic, 'dropped', 'no_route')
+            return False
+
+        handled = False
+        for handler in handlers:
+            try:
+                handler(topic, data)
+                handled = True
+            except Exception as e:
+                logger.error(f"Error handling message on {topic}: {e}")
+        self._count(topic, 'handled' if handled else 'dropped', None if handled else 'handler_error')
+        return handled
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-topic handled/dropped counts and drop reasons"""
+        with self.lock:
+            return {
+                'topics': {topic: dict(counts) for topic, counts in self.topic_stats.items()},
+                'dropped': dict(self.drop_reasons),
+                'routes': len(self.routes)
+            }
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Memory budget for DoomBox video frame caches
+Derives cache frame counts from resolution and available RAM, evicts least
+recently used clips across players, and degrades FPS or resolution when the
+budget is too tight to hold a full clip
+"""
+
+import os
+import sys
+import math
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import configuration
+try:
+    # Add parent directory to path for config import
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from config.config import VIDEO_CACHE_BUDGET_MB, VIDEO_CACHE_MIN_SECONDS
+except ImportError:
+    # Fallback configuration
+    VIDEO_CACHE_BUDGET_MB = 0  # 0 = auto
+    VIDEO_CACHE_MIN_SECONDS = 2.0
+
+AUTO_BUDGET_FRACTION = 0.25  # Share of available RAM used when no budget is configured
+MIN_BUDGET_MB = 32
+
+
+def available_memory_mb() -> float:
+    """Get available system memory in MB"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        return 1024.0
+
+
+def frame_bytes(frame_size: Tuple[int, int]) -> int:
+    """Bytes needed for one 24-bit frame"""
+    return frame_size[0] * frame_size[1] * 3
+
+
+class VideoMemoryBudget:
+    """
+    Shared memory budget for all video frame caches
+
+    Caches reserve bytes under a key before holding frames. When a reservation
+    does not fit, the least recently used evictable reservations are evicted
+    through their callbacks until it does.
+    """
+
+    def __init__(self, budget_mb: float = None, min_seconds: float = None):
+        if not budget_mb:
+            budget_mb = VIDEO_CACHE_BUDGET_MB or max(MIN_BUDGET_MB, available_memory_mb() * AUTO_BUDGET_FRACTION)
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.min_seconds = min_seconds if min_seconds is not None else VIDEO_CACHE_MIN_SECONDS
+
+        # key -> (bytes, evict callback or None for pinned reservations), oldest first
+        self.reservations: "OrderedDict[str, Tuple[int, Optional[Callable[[str], None]]]]" = OrderedDict()
+        self.lock = threading.RLock()
+
+        self.stats = {
+            'evictions': 0,
+            'evicted_mb': 0.0,
+            'over_budget': 0,
+            'degraded_fps': 0,
+            'degraded_resolution': 0,
+        }
+
+        logger.info(f"Video memory budget: {budget_mb:.0f} MB")
+
+    @property
+    def used_bytes(self) -> int:
+        with self.lock:
+            return sum(nbytes for nbytes, _ in self.reservations.values())
+
+    def plan_clip(self, display_size: Tuple[int, int], fps: float, max_frames: int) -> Dict[str, Any]:
+        """
+        Decide how a clip should be cached within the budget
+
+        Tries full resolution and FPS first, then every other frame (half FPS,
+        same duration), then half resolution at half FPS.
+        """
+        min_frames = max(1, int(self.min_seconds * fps))
+        candidates = [
+            (None, display_size, 1),
+            ('fps', display_size, 2),
+            ('resolution', (display_size[0] // 2, display_size[1] // 2), 2),
+        ]
+
+        for degraded, frame_size, frame_step in candidates:
+            frames = math.ceil(max_frames / frame_step)
+            if frames * frame_bytes(frame_size) <= self.budget_bytes:
+                break
+        else:
+            # Not even the smallest plan fits: keep as many frames as we can, but at least min_seconds worth
+            frames = max(min_frames // frame_step, self.budget_bytes // frame_bytes(frame_size), 1)
+            self.stats['over_budget'] += 1
+
+        if degraded:
+            self.stats[f'degraded_{degraded}'] += 1
+            logger.warning(f"Video cache budget tight: caching {frames} frames at "
+                           f"{frame_size[0]}x{frame_size[1]}, every {frame_step} frame(s)")
+
+        return {
+            'frame_size': frame_size,
+            'frame_step': frame_step,
+            'frames': frames,
+            'degraded': degraded,
+        }
+
+    def reserve(self, key: str, nbytes: int, evict_callback: Callable[[str], None] = None) -> bool:
+        """
+        Reserve memory for a cache entry, evicting LRU entries to make room
+
+        Reservations without an evict callback are pinned and never evicted.
+        Returns False if the reservation could not fit even after evicting.
+        """
+        evicted = []
+        with self.lock:
+            if key in self.reservations:
+                self.reservations.pop(key)
+
+            used = self.used_bytes
+            for other_key in list(self.reservations.keys()):
+                if used + nbytes <= self.budget_bytes:
+                    break
+                other_bytes, callback = self.reservations[other_key]
+                if callback is None:
+                    continue
+                del self.reservations[other_key]
+                used -= other_bytes
+                evicted.append((other_key, other_bytes, callback))
+
+            self.reservations[key] = (nbytes, evict_callback)
+            fits = used + nbytes <= self.budget_bytes
+            if not fits:
+                self.stats['over_budget'] += 1
+
+        # Run callbacks outside the lock; they take their owners' locks
+        for other_key, other_bytes, callback in evicted:
+            self.stats['evictions'] += 1
+            self.stats['evicted_mb'] += other_bytes / (1024 * 1024)
+            logger.info(f"Evicting video cache entry {other_key} ({other_bytes / (1024 * 1024):.0f} MB)")
+            try:
+                callback(other_key)
+            except Exception as e:
+                logger.error(f"Error evicting video cache entry {other_key}: {e}")
+
+        return fits
+
+    def touch(self, key: str):
+        """Mark a reservation as recently used"""
+        with self.lock:
+            if key in self.reservations:
+                self.reservations.move_to_end(key)
+
+    def release(self, key: str):
+        """Drop a reservation"""
+        with self.lock:
+            self.reservations.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budget statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['budget_mb'] = self.budget_bytes / (1024 * 1024)
+            stats['used_mb'] = self.used_bytes / (1024 * 1024)
+            stats['entries'] = len(self.reservations)
+        return stats
+
+
+_shared_budget = None
+_shared_budget_lock = threading.Lock()
+
+
+def get_shared_budget() -> VideoMemoryBudget:
+    """Get the process-wide budget shared by all video players"""
+    global _shared_budget
+    with _shared_budget_lock:
+        if _shared_budget is None:
+            _shared_budget = VideoMemoryBudget()
+        return _shared_budget
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the pre-decoded clip cache hits, invalidates and prunes
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from clip_cache import ClipFrameCache
+
+DISPLAY_SIZE = (64, 48)
+
+def write_clip(path, value, frames=15):
+    """Write a short solid-colour test clip"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (160, 120))
+    for _ in range(frames):
+        writer.write(np.full((120, 160, 3), value, dtype=np.uint8))
+    writer.release()
+    return path
+
+def test_miss_then_hit():
+    """Test that the first load decodes the clip and the next one maps the cached frames"""
+    print("Testing cache miss and hit...")
+
+    root = tempfile.mkdtemp()
+    try:
+        clip = write_clip(os.path.join(root, 'clip.mp4'), 120)
+        cache = ClipFrameCache(os.path.join(root, 'cache'), display_size=DISPLAY_SIZE)
+
+        cached_before = cache.has(clip)
+        first = cache.load(clip)
+        second = cache.load(clip)
+        stats = cache.get_stats()
+
+        print(f"Frames: {first.shape}, mean: {second.mean():.0f}, stats: {stats}")
+        return (not cached_before and cache.has(clip) and first.shape == (15, 48, 64, 3) and
+                isinstance(second, np.memmap) and abs(second.mean() - 120) < 5 and
+                stats['builds'] == 1 and stats['hits'] == 1 and stats['errors'] == 0)
+    finally:
+        shutil.rmtree(root)
+
+def test_source_change_invalidates():
+    """Test that a re-encoded clip gets a fresh entry instead of stale frames"""
+    print("\nTesting invalidation...")
+
+    root = tempfile.mkdtemp()
+    try:
+        clip = write_clip(os.path.join(root, 'clip.mp4'), 60)
+        cache = ClipFrameCache(os.path.join(root, 'cache'), display_size=DISPLAY_SIZE)
+        old_mean = cache.load(clip).mean()
+
+        write_clip(clip, 200, frames=10)
+        later = time.time() + 10
+        os.utime(clip, (later, later))
+        cached_before = cache.has(clip)
+        frames = cache.load(clip)
+        sidecars = sorted(name for name in os.listdir(cache.cache_dir) if name.endswith('.json'))
+        stats = cache.get_stats()
+
+        print(f"Mean before: {old_mean:.0f}, after: {frames.mean():.0f}, frames: {len(frames)}, "
+              f"sidecars: {sidecars}, stats: {stats}")
+        return (not cached_before and abs(frames.mean() - 200) < 5 and len(frames) == 10 and
+                len(sidecars) == 2 and stats['builds'] == 2 and stats['hits'] == 0)
+    finally:
+        shutil.rmtree(root)
+
+def test_prune_to_budget():
+    """Test that building past max_disk_mb drops the least recently used entry and its sidecar"""
+    print("\nTesting pruning...")
+
+    root = tempfile.mkdtemp()
+    try:
+        clips = [write_clip(os.path.join(root, f"clip{i}.mp4"), 50 * (i + 1)) for i in range(3)]
+        entry_mb = 15 * DISPLAY_SIZE[0] * DISPLAY_SIZE[1] * 3 / (1024 * 1024)
+        cache = ClipFrameCache(os.path.join(root, 'cache'), display_size=DISPLAY_SIZE, max_disk_mb=entry_mb * 2.5)
+
+        cache.load(clips[0])
+        cache.load(clips[1])
+        # Make clip0 the most recently used, whatever the filesystem's timestamp resolution
+        for offset, clip in ((100, clips[1]), (50, clips[0])):
+            data_path, _ = cache._entry_paths(Path(clip), None)
+            os.utime(data_path, (time.time() - offset, time.time() - offset))
+        cache.load(clips[2])
+
+        kept = [cache.has(clip) for clip in clips]
+        files = sorted(os.listdir(cache.cache_dir))
+        stats = cache.get_stats()
+        print(f"Kept: {kept}, files: {files}, stats: {stats}")
+        return (kept == [True, False, True] and len(files) == 4 and stats['pruned'] == 1 and
+                stats['disk_mb'] <= cache.max_disk_mb)
+    finally:
+        shutil.rmtree(root)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Clip Cache Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Miss Then Hit", test_miss_then_hit),
+        ("Source Change Invalidates", test_source_change_invalidates),
+        ("Prune To Budget", test_prune_to_budget)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
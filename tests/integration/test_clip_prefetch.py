@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script to verify clips are prefetched and swapped without gaps
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import cv2
+import pygame
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from clip_prefetch import ClipPrefetcher
+from fallback_video_player import CachedVideoPlayer
+from video_memory import VideoMemoryBudget
+
+def create_clips(video_dir, count=2, frames=15):
+    """Write short solid-colour test clips"""
+    for i in range(count):
+        path = os.path.join(video_dir, f"clip{i}.mp4")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (160, 120))
+        for _ in range(frames):
+            writer.write(np.full((120, 160, 3), 60 * (i + 1), dtype=np.uint8))
+        writer.release()
+    return sorted(os.path.join(video_dir, name) for name in os.listdir(video_dir))
+
+def test_prefetch_prerolls_first_frame():
+    """Test that a prefetched clip comes back open with its first frame decoded"""
+    print("Testing clip prefetch...")
+
+    video_dir = tempfile.mkdtemp()
+    try:
+        clips = create_clips(video_dir)
+        prefetcher = ClipPrefetcher(lambda path: (cv2.VideoCapture(path), 30.0))
+        prefetcher.prefetch(clips[0])
+        clip = prefetcher.take(timeout=5.0)
+
+        stats = prefetcher.get_stats()
+        print(f"Stats: {stats}")
+
+        ok = clip is not None and clip.cap.isOpened() and clip.first_frame.shape == (120, 160, 3)
+        if clip:
+            clip.cap.release()
+        return ok and stats['prefetched'] == 1
+    finally:
+        shutil.rmtree(video_dir)
+
+def test_cached_player_rollover():
+    """Test that the cached player never returns None when a clip rolls over"""
+    print("\nTesting cached player rollover...")
+
+    pygame.init()
+    pygame.display.set_mode((160, 120))
+    video_dir = tempfile.mkdtemp()
+    try:
+        create_clips(video_dir)
+        player = CachedVideoPlayer(video_dir, (160, 120), cache_dir=os.path.join(video_dir, 'cache'),
+                                   memory_budget=VideoMemoryBudget(budget_mb=64))
+        player.start()
+
+        missing = 0
+        for _ in range(90):
+            if player.get_frame() is None:
+                missing += 1
+            time.sleep(player.frame_time)
+
+        stats = player.get_stats()
+        player.stop()
+        print(f"Missing frames: {missing}")
+        print(f"Transitions: {stats['transitions']}")
+
+        return missing == 0 and stats['transitions']['transitions'] >= 2
+    finally:
+        shutil.rmtree(video_dir)
+        pygame.quit()
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Clip Prefetch Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Prefetch Prerolls First Frame", test_prefetch_prerolls_first_frame),
+        ("Cached Player Rollover", test_cached_player_rollover)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test script to verify MQTT commands run off the network thread with acks
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+import shutil
+import tempfile
+import importlib.util
+
+# Add src directory to path
+src_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+sys.path.insert(0, src_dir)
+
+from command_executor import CommandExecutor
+from score_store import ScoreStore
+
+def load_mqtt_client_module():
+    """Load mqtt-client.py the way the kiosk does"""
+    spec = importlib.util.spec_from_file_location('mqtt_client', os.path.join(src_dir, 'mqtt-client.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class Message:
+    """Minimal stand-in for a paho MQTTMessage"""
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = json.dumps(payload).encode('utf-8')
+
+class SlowLauncher:
+    """Game launcher whose requests take a while, like a real launch"""
+    player_queue = None
+
+    def add_score_callback(self, callback):
+        pass
+
+    def request_game(self, player_name, skill=3, time_limit=None, source=None):
+        time.sleep(0.3)
+        return {'accepted': True, 'duplicate': False, 'position': 1, 'eta_seconds': 0, 'depth': 1}
+
+def test_bounded_queue_in_order():
+    """Test that jobs run in submission order and a full queue rejects instead of blocking"""
+    print("Testing bounded executor...")
+
+    executor = CommandExecutor(max_pending=2)
+    gate = threading.Event()
+    ran = []
+
+    executor.submit('block', gate.wait)
+    time.sleep(0.05)  # Worker is now busy on the blocking job
+    accepted = [executor.submit(f"job{i}", ran.append, i) for i in range(4)]
+    gate.set()
+    executor.stop()
+
+    stats = executor.get_stats()
+    print(f"Accepted: {accepted}, ran: {ran}, stats: {stats}")
+    return accepted == [True, True, False, False] and ran == [0, 1] and stats['rejected'] == 2
+
+def test_ack_then_correlated_result():
+    """Test that the network callback returns at once with an ack and the result follows with the same id"""
+    print("\nTesting MQTT dispatch...")
+
+    module = load_mqtt_client_module()
+    store = ScoreStore(os.path.join(tempfile.mkdtemp(), 'scores.db'))
+    client = module.DoomBoxMQTTClient('localhost', 1883, store=store)
+    client.set_game_launcher(SlowLauncher())
+
+    published = []
+    client.publish = lambda topic, payload, retain=False, durable=True: published.append(json.loads(payload)) or True
+
+    start = time.perf_counter()
+    client._on_message(None, None, Message(client.topics['start_game'],
+                                           {'player_name': 'alice', 'request_id': 'r1'}))
+    callback_ms = (time.perf_counter() - start) * 1000
+    ack = list(published)
+
+    client.executor.stop()
+    types = [(message['type'], message['request_id']) for message in published]
+
+    print(f"Callback took {callback_ms:.1f}ms, messages: {types}")
+    return (callback_ms < 100 and [m['type'] for m in ack] == ['command_accepted'] and
+            types == [('command_accepted', 'r1'), ('game_launch_response', 'r1')])
+
+class NoQueueLauncher:
+    """Game launcher whose database (and so player queue) failed to open"""
+    player_queue = None
+    current_player = None
+
+    def __init__(self):
+        self.launched = []
+
+    def add_score_callback(self, callback):
+        pass
+
+    def is_game_running(self):
+        return False
+
+    def launch_game(self, player_name, skill=3):
+        self.launched.append(player_name)
+        return True
+
+def test_commands_without_queue():
+    """Test that launches, queue commands and status still work when the player queue is unavailable"""
+    print("\nTesting commands without a player queue...")
+
+    root = tempfile.mkdtemp()
+    try:
+        # request_game falls back to launching directly
+        spec = importlib.util.spec_from_file_location('game_launcher', os.path.join(src_dir, 'game-launcher.py'))
+        launcher_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(launcher_module)
+        launcher = NoQueueLauncher()
+        launch = launcher_module.GameLauncher.request_game(launcher, 'alice')
+
+        module = load_mqtt_client_module()
+        client = module.DoomBoxMQTTClient('localhost', 1883, store=ScoreStore(os.path.join(root, 'scores.db')))
+        client.executor.stop()
+        client.set_game_launcher(launcher)
+        published = []
+        client.publish = lambda topic, payload, retain=False, durable=True: published.append(json.loads(payload)) or True
+
+        for command in ('leave_queue', 'get_queue', 'get_status'):
+            client._handle_command({'command': command, 'player_name': 'bob'})
+        status = [message for message in published if 'queue_depth' in message]
+
+        print(f"Launch: {launch}, launched: {launcher.launched}, published: {published}")
+        return (launch['accepted'] and launcher.launched == ['alice'] and len(published) == 1 and
+                status and status[0]['queue_depth'] == 0)
+    finally:
+        shutil.rmtree(root)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Command Executor Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Bounded Queue In Order", test_bounded_queue_in_order),
+        ("Ack Then Correlated Result", test_ack_then_correlated_result),
+        ("Commands Without Queue", test_commands_without_queue)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
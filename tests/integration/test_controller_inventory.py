@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script to verify controllers are inventoried from sysfs without pygame
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from controller_inventory import ControllerInventory, parse_bitmap, BITS_PER_LONG
+
+def make_input_device(sys_root, dev_root, index, name, key_bits, abs_bits, handlers):
+    """Create a fake /sys/class/input/inputN entry and its /dev/input nodes"""
+    input_dir = os.path.join(sys_root, f"input{index}")
+    os.makedirs(os.path.join(input_dir, 'capabilities'))
+    os.makedirs(os.path.join(input_dir, 'id'))
+    with open(os.path.join(input_dir, 'name'), 'w') as f:
+        f.write(name + '\n')
+    with open(os.path.join(input_dir, 'id', 'vendor'), 'w') as f:
+        f.write('045e\n')
+    with open(os.path.join(input_dir, 'id', 'product'), 'w') as f:
+        f.write('028e\n')
+    for cap, bits in (('key', key_bits), ('abs', abs_bits)):
+        words = [0] * (max(bits, default=0) // BITS_PER_LONG + 1)
+        for bit in bits:
+            words[bit // BITS_PER_LONG] |= 1 << (bit % BITS_PER_LONG)
+        with open(os.path.join(input_dir, 'capabilities', cap), 'w') as f:
+            f.write(' '.join(format(word, 'x') for word in reversed(words)) + '\n')
+    for handler in handlers:
+        os.makedirs(os.path.join(input_dir, handler))
+        open(os.path.join(dev_root, handler), 'w').close()
+
+GAMEPAD_KEYS = list(range(0x130, 0x13b))  # BTN_SOUTH .. BTN_THUMBR
+GAMEPAD_ABS = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x10, 0x11]  # Sticks, triggers, d-pad hat
+KEYBOARD_KEYS = list(range(1, 120))
+
+def test_sysfs_scan():
+    """Test that gamepads are found with their axes/buttons/hats and keyboards are skipped"""
+    print("Testing sysfs scan...")
+
+    root = tempfile.mkdtemp()
+    try:
+        sys_root, dev_root = os.path.join(root, 'sys'), os.path.join(root, 'dev')
+        os.makedirs(sys_root)
+        os.makedirs(dev_root)
+        make_input_device(sys_root, dev_root, 0, 'AT Keyboard', KEYBOARD_KEYS, [], ['event0'])
+        # Composite pad: mouse buttons and media keys don't count as gamepad buttons
+        make_input_device(sys_root, dev_root, 3, 'Xbox 360 Controller', [0x110, 0x111] + GAMEPAD_KEYS + [0x161, 0x2c0],
+                          GAMEPAD_ABS, ['event3', 'js0'])
+
+        inventory = ControllerInventory(sys_root, dev_root)
+        start = time.perf_counter()
+        snapshot = inventory.get_snapshot()
+        snapshot_us = (time.perf_counter() - start) * 1e6
+
+        controller = snapshot['controllers'][0]
+        print(f"Snapshot: {snapshot['controllers_found']} controllers, {snapshot['joysticks']} in {snapshot_us:.0f}us")
+        print(f"Controller: {controller}")
+
+        return (snapshot['controllers_found'] == 1 and snapshot['joysticks_found'] == 1 and
+                controller['name'] == 'Xbox 360 Controller' and controller['axes'] == 6 and
+                controller['buttons'] == 11 and controller['hats'] == 1 and
+                parse_bitmap('') == [] and parse_bitmap('5') == [0, 2])
+    finally:
+        shutil.rmtree(root)
+
+def test_hotplug_rescan():
+    """Test that plugging in a controller updates the snapshot without a manual rescan"""
+    print("\nTesting hotplug...")
+
+    root = tempfile.mkdtemp()
+    try:
+        sys_root, dev_root = os.path.join(root, 'sys'), os.path.join(root, 'dev')
+        os.makedirs(sys_root)
+        os.makedirs(dev_root)
+
+        inventory = ControllerInventory(sys_root, dev_root, rescan_interval=0.2)
+        inventory.start()
+        before = inventory.get_snapshot()['controllers_found']
+
+        make_input_device(sys_root, dev_root, 5, '8BitDo Pro 2', GAMEPAD_KEYS, GAMEPAD_ABS, ['event5', 'js0'])
+        deadline = time.time() + 5
+        while inventory.get_snapshot()['controllers_found'] == 0 and time.time() < deadline:
+            time.sleep(0.05)
+
+        after = inventory.get_snapshot()['controllers_found']
+        stats = inventory.get_stats()
+        inventory.stop()
+
+        # Without inotify the rescan interval is long; stop() must not wait it out
+        polling = ControllerInventory(sys_root, dev_root, rescan_interval=30)
+        polling._open_inotify = lambda: None
+        polling.start()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        polling.stop()
+        polling.watch_thread.join(timeout=5)
+        stop_ms = (time.perf_counter() - start) * 1000
+
+        print(f"Before: {before}, after: {after}, stats: {stats}, interval mode stopped in {stop_ms:.0f}ms")
+        return before == 0 and after == 1 and not polling.watch_thread.is_alive() and stop_ms < 1000
+    finally:
+        shutil.rmtree(root)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Controller Inventory Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Sysfs Scan", test_sysfs_scan),
+        ("Hotplug Rescan", test_hotplug_rescan)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the kiosk frame profiler records phase percentiles
+"""
+
+import sys
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from frame_profiler import FrameProfiler
+
+def test_phase_percentiles():
+    """Test that phase timings feed rolling percentiles"""
+    print("Testing phase percentiles...")
+
+    profiler = FrameProfiler(window=50, log_interval=3600, hud_visible=False)
+    for i in range(20):
+        profiler.begin_frame()
+        with profiler.phase('video'):
+            time.sleep(0.005 if i == 19 else 0.001)
+        with profiler.phase('flip'):
+            pass
+        profiler.end_frame()
+
+    summary = profiler.summary()
+    video = summary['phases']['video']
+    print(f"Video: {video}")
+    print(f"FPS: {summary['fps']:.1f}")
+
+    return (summary['frames'] == 20 and
+            0.9 <= video['p50'] < 4.0 and
+            video['p99'] >= video['p95'] >= video['p50'] and
+            summary['phases']['overlay']['p99'] == 0.0)
+
+def test_hud_render():
+    """Test that the HUD renders and is cached between refreshes"""
+    print("\nTesting HUD render...")
+
+    pygame.init()
+    font = pygame.font.Font(None, 16)
+    profiler = FrameProfiler(hud_visible=False)
+    profiler.begin_frame()
+    profiler.end_frame()
+
+    visible = profiler.toggle_hud()
+    first = profiler.render_hud(font)
+    second = profiler.render_hud(font)
+    pygame.quit()
+
+    print(f"HUD size: {first.get_size()}")
+    return visible and first is second and first.get_width() > 0
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Frame Profiler Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Phase Percentiles", test_phase_percentiles),
+        ("HUD Render", test_hud_render)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script to verify game output is drained without blocking the game
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import subprocess
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from game_output import GameOutputPump
+
+CHATTY_GAME = (
+    "import sys\n"
+    "for i in range(20000):\n"
+    "    print(f'R_Init: frame {i} ' + 'x' * 40)\n"
+    "    if i % 1000 == 0:\n"
+    "        print(f'warning {i}', file=sys.stderr)\n"
+    "print('E1M1 - 1:08.94 (1:08)  K: 18/19  I: 31/37  S: 3/6')\n"
+)
+
+def spawn(script):
+    """Start a child that writes to piped stdout/stderr like dsda-doom"""
+    return subprocess.Popen([sys.executable, '-c', script], stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True, errors='replace', bufsize=1)
+
+def test_chatty_game_never_blocks():
+    """Test that a game writing far more than a pipe buffer runs to completion"""
+    print("Testing output draining...")
+
+    log_dir = tempfile.mkdtemp()
+    try:
+        process = spawn(CHATTY_GAME)
+        pump = GameOutputPump(process, log_dir, tail_lines=10, max_bytes=64 * 1024, backup_count=2)
+        pump.start()
+
+        start = time.time()
+        exit_code = process.wait(timeout=20)
+        elapsed = time.time() - start
+        pump.close()
+
+        stats = pump.get_stats()
+        tail = pump.get_tail()
+        logs = sorted(os.listdir(log_dir))
+        print(f"Exit {exit_code} after {elapsed:.2f}s, stats: {stats}")
+        print(f"Logs: {logs}, tail end: {tail[-1]}")
+
+        return (exit_code == 0 and stats['lines'] == {'stdout': 20001, 'stderr': 20} and
+                len(tail) == 10 and 'E1M1' in tail[-1] and
+                logs == ['game.log', 'game.log.1', 'game.log.2'])
+    finally:
+        shutil.rmtree(log_dir)
+
+def test_subscribers_and_parser():
+    """Test that subscribers get raw lines or parsed events, and a failing one is contained"""
+    print("\nTesting subscribers...")
+
+    log_dir = tempfile.mkdtemp()
+    try:
+        process = spawn("import sys\nprint('ST_Init: Init status bar.')\nprint('level 7 done', file=sys.stderr)\n")
+        pump = GameOutputPump(process, log_dir)
+
+        raw, parsed = [], []
+
+        def broken(stream, line):
+            raise RuntimeError("subscriber bug")
+
+        pump.subscribe(lambda stream, line: raw.append((stream, line)))
+        pump.subscribe(parsed.append, parser=lambda line: int(line.split()[1]) if line.startswith('level') else None)
+        pump.subscribe(broken)
+        pump.start()
+        process.wait(timeout=10)
+        pump.close()
+
+        stats = pump.get_stats()
+        print(f"Raw: {raw}, parsed: {parsed}, errors: {stats['subscriber_errors']}")
+        return (sorted(raw) == [('stderr', 'level 7 done'), ('stdout', 'ST_Init: Init status bar.')] and
+                parsed == [7] and stats['subscriber_errors'] == 2)
+    finally:
+        shutil.rmtree(log_dir)
+
+def test_close_bounded_by_timeout():
+    """Test that close() waits at most its timeout in total while a child still holds the pipes"""
+    print("\nTesting bounded close...")
+
+    log_dir = tempfile.mkdtemp()
+    try:
+        # The game's own child keeps stdout and stderr open after the game exits
+        process = spawn("import subprocess, sys\nsubprocess.Popen(['sleep', '3'])\n")
+        pump = GameOutputPump(process, log_dir)
+        pump.start()
+        process.wait(timeout=10)
+
+        start = time.perf_counter()
+        pump.close(timeout=0.3)
+        elapsed = time.perf_counter() - start
+
+        print(f"close(0.3) returned after {elapsed:.2f}s")
+        return elapsed < 0.4
+    finally:
+        shutil.rmtree(log_dir)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Game Output Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Chatty Game Never Blocks", test_chatty_game_never_blocks),
+        ("Subscribers And Parser", test_subscribers_and_parser),
+        ("Close Bounded By Timeout", test_close_bounded_by_timeout)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
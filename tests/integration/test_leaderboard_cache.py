@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the in-memory leaderboard cache only queries SQLite on change
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from leaderboard_cache import LeaderboardCache
+
+def create_scores_db():
+    """Create a temporary scores database"""
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany('INSERT INTO scores (player_name, score) VALUES (?, ?)',
+                     [('alice', 300), ('bob', 200), ('carol', 100)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+def test_cache_hits():
+    """Test that repeated reads are served from memory"""
+    print("Testing leaderboard cache hits...")
+
+    db_path = create_scores_db()
+    cache = LeaderboardCache(db_path, limit=8, check_interval=60)
+
+    for _ in range(30):
+        scores = cache.get_top_scores(8)
+
+    stats = cache.get_stats()
+    print(f"Scores: {scores}")
+    print(f"Stats: {stats}")
+
+    cache.close()
+    os.remove(db_path)
+    return scores[0] == ('alice', 300) and stats['refreshes'] == 1 and stats['hits'] == 29
+
+def test_invalidate_on_score_update():
+    """Test that a score callback triggers exactly one refresh"""
+    print("\nTesting invalidation on score update...")
+
+    db_path = create_scores_db()
+    cache = LeaderboardCache(db_path, limit=8, check_interval=60)
+    cache.get_top_scores(8)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('INSERT INTO scores (player_name, score) VALUES (?, ?)', ('dave', 999))
+    conn.commit()
+    conn.close()
+
+    cache.on_score_update('dave', 999)
+    scores = cache.get_top_scores(8)
+    cache.get_top_scores(8)
+
+    stats = cache.get_stats()
+    print(f"Scores: {scores}")
+    print(f"Stats: {stats}")
+
+    cache.close()
+    os.remove(db_path)
+    return scores[0] == ('dave', 999) and stats['refreshes'] == 2
+
+def test_detects_external_writes():
+    """Test that writes from another connection are picked up via data_version"""
+    print("\nTesting external write detection...")
+
+    db_path = create_scores_db()
+    cache = LeaderboardCache(db_path, limit=8, check_interval=0)
+    cache.get_top_scores(8)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('INSERT INTO scores (player_name, score) VALUES (?, ?)', ('erin', 5000))
+    conn.commit()
+    conn.close()
+
+    scores = cache.get_top_scores(8)
+    stats = cache.get_stats()
+    print(f"Scores: {scores}")
+    print(f"Stats: {stats}")
+
+    cache.close()
+    os.remove(db_path)
+    return scores[0] == ('erin', 5000) and stats['last_refresh_reason'] == 'db_changed'
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Leaderboard Cache Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Cache Hits", test_cache_hits),
+        ("Invalidate On Score Update", test_invalidate_on_score_update),
+        ("Detect External Writes", test_detects_external_writes)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script to verify leaderboard snapshot/delta replication and gap recovery
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from score_store import ScoreStore
+from leaderboard_sync import LeaderboardPublisher, LeaderboardReplica
+
+class RetainedTopic:
+    """Broker stand-in for the snapshot topic: keeps the last retained message"""
+    def __init__(self):
+        self.retained = None
+        self.replicas = []
+
+    def publish(self, snapshot):
+        self.retained = snapshot
+        for replica in self.replicas:
+            replica.apply_snapshot(snapshot)
+
+    def subscribe(self, replica):
+        """Subscribing delivers the retained message, as MQTT does"""
+        if replica not in self.replicas:
+            self.replicas.append(replica)
+        if self.retained:
+            replica.apply_snapshot(self.retained)
+
+def record(store, publisher, player_name, score):
+    """Commit a score the way the launcher does, then sequence it"""
+    store.add_score(player_name, score).result(timeout=5)
+    return publisher.record(player_name, score)
+
+def expected_rows(store, limit):
+    return [{'player_name': name, 'score': score} for name, score in store.top_scores(limit)]
+
+def test_gap_triggers_refetch():
+    """Test that a lost delta is detected and a refetched snapshot brings the copy back in sync"""
+    print("Testing gap detection...")
+
+    root = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(root, 'scores.db'))
+        publisher = LeaderboardPublisher(store, limit=3)
+        snapshots = RetainedTopic()
+        snapshots.publish(publisher.snapshot())
+
+        replica = LeaderboardReplica(limit=3)
+        replica.request_snapshot = lambda: snapshots.subscribe(replica)
+        snapshots.subscribe(replica)
+        in_sync_before = replica.get_stats()['in_sync']
+
+        # alice and bob arrive; bob's delta is lost on the way
+        for name, score, lost in (('alice', 500, False), ('bob', 900, True), ('carol', 700, False),
+                                  ('alice', 400, False), ('dave', 100, False)):
+            delta, snapshot = record(store, publisher, name, score)
+            if not lost:
+                replica.apply_delta(delta)
+            # The retained snapshot is only updated, not delivered, to subscribers that aren't refetching
+            snapshots.retained = snapshot
+
+        replica.apply_delta(delta)  # Duplicate delivery is harmless
+        stats = replica.get_stats()
+        rows = replica.get_rows()
+
+        # A late joiner is current straight from the retained snapshot
+        late = LeaderboardReplica(limit=3)
+        snapshots.subscribe(late)
+
+        print(f"Replica: {rows}")
+        print(f"Stats: {stats}")
+        return (in_sync_before and rows == expected_rows(store, 3) and stats['gaps'] == 1 and
+                stats['refetches'] == 1 and stats['duplicates'] >= 1 and stats['in_sync'] and
+                stats['version'] == 5 and late.get_rows() == rows)
+    finally:
+        shutil.rmtree(root)
+
+def test_restart_starts_new_epoch():
+    """Test that a publisher restart is picked up and deltas replayed from before it are ignored"""
+    print("\nTesting publisher restart...")
+
+    root = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(root, 'scores.db'))
+        publisher = LeaderboardPublisher(store, limit=5)
+        snapshots = RetainedTopic()
+        replica = LeaderboardReplica(limit=5, request_snapshot=lambda: snapshots.subscribe(replica))
+
+        first_delta, snapshot = record(store, publisher, 'alice', 300)
+        snapshots.publish(snapshot)
+        snapshots.subscribe(replica)
+
+        time.sleep(0.01)
+        restarted = LeaderboardPublisher(store, limit=5)
+        delta, snapshot = record(store, restarted, 'bob', 800)
+        snapshots.retained = snapshot
+        replica.apply_delta(delta)       # Newer epoch: refetch
+        replica.apply_delta(first_delta)  # Replayed from the old epoch's outbox: ignored
+
+        stats = replica.get_stats()
+        print(f"Replica: {replica.get_rows()}, stats: {stats}")
+        return (replica.get_rows() == expected_rows(store, 5) and stats['epoch'] == restarted.epoch and
+                stats['refetches'] == 1 and stats['stale'] == 1 and stats['in_sync'])
+    finally:
+        shutil.rmtree(root)
+
+def test_names_match_store():
+    """Test that names differing only in case stay separate rows, as they do in the store"""
+    print("\nTesting mixed-case names...")
+
+    root = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(root, 'scores.db'))
+        publisher = LeaderboardPublisher(store, limit=5)
+        replica = LeaderboardReplica(limit=5)
+        replica.apply_snapshot(publisher.snapshot())
+
+        for name, score in (('alice', 200), ('Alice', 100), ('ALICE', 150), ('alice', 120)):
+            delta, _ = record(store, publisher, name, score)
+            replica.apply_delta(delta)
+
+        print(f"Replica: {replica.get_rows()}, store: {store.top_scores(5)}")
+        return replica.get_rows() == expected_rows(store, 5) and len(replica.get_rows()) == 3
+    finally:
+        shutil.rmtree(root)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Leaderboard Sync Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Gap Triggers Refetch", test_gap_triggers_refetch),
+        ("Restart Starts New Epoch", test_restart_starts_new_epoch),
+        ("Names Match Store", test_names_match_store)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
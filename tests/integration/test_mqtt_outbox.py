@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Test script to verify MQTT publishes survive broker outages and restarts
+"""
+
+import sys
+import os
+import json
+import shutil
+import time
+import tempfile
+import threading
+from concurrent.futures import Future
+import importlib.util
+
+# Add src directory to path
+src_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+sys.path.insert(0, src_dir)
+
+from score_store import ScoreStore
+from mqtt_outbox import MQTTOutbox
+
+def load_mqtt_client_module():
+    """Load mqtt-client.py the way the kiosk does"""
+    spec = importlib.util.spec_from_file_location('mqtt_client', os.path.join(src_dir, 'mqtt-client.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class PublishResult:
+    def __init__(self, rc, mid):
+        self.rc = rc
+        self.mid = mid
+
+class FakePaho:
+    """Records publishes instead of talking to a broker; acks are sent by the test"""
+    def __init__(self):
+        self.sent = []
+        self.threads = []
+        self.next_mid = 1
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        self.sent.append((topic, json.loads(payload), qos))
+        self.threads.append(threading.current_thread().name)
+        mid, self.next_mid = self.next_mid, self.next_mid + 1
+        return PublishResult(0, mid)
+
+    def subscribe(self, topic):
+        pass
+
+def test_bounded_outbox():
+    """Test that the outbox keeps the newest messages when full and survives reopening"""
+    print("Testing bounded outbox...")
+
+    root = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(root, 'scores.db')
+        store = ScoreStore(db_path)
+        outbox = MQTTOutbox(store, max_messages=3)
+        ids = [outbox.add('doombox/scores', json.dumps({'n': i})) for i in range(5)]
+        outbox.remove(ids[3])
+        store.close()
+
+        reopened = MQTTOutbox(ScoreStore(db_path), max_messages=3)
+        pending = [json.loads(row[2])['n'] for row in reopened.pending()]
+        stats = outbox.get_stats()
+        print(f"Pending after reopen: {pending}, stats: {stats}")
+        return pending == [2, 4] and stats['dropped'] == 2 and reopened.get_stats()['depth'] == 2
+    finally:
+        shutil.rmtree(root)
+
+def test_offline_publish_replayed():
+    """Test that responses published while offline are sent on reconnect and cleared by the PUBACK"""
+    print("\nTesting replay on reconnect...")
+
+    root = tempfile.mkdtemp()
+    try:
+        module = load_mqtt_client_module()
+        store = ScoreStore(os.path.join(root, 'scores.db'))
+        client = module.DoomBoxMQTTClient('localhost', 1883, store=store)
+        fake = FakePaho()
+        client.client = fake
+
+        # Broker down: the score is kept, the status snapshot is not
+        kept = client.publish_score('alice', 4200) is None and client.outbox.get_stats()['depth'] == 1
+        status_sent = client.publish(client.topics['status'], '{}', durable=False)
+
+        client._on_connect(fake, None, {}, 0)
+        client.executor.stop()  # Finishes the replay queued by the connect
+        replayed = [(topic, message.get('player_name')) for topic, message, qos in fake.sent if qos == 1]
+        off_network_thread = threading.current_thread().name not in fake.threads
+        depth_before_ack = client.outbox.get_stats()['depth']
+        client._on_publish(fake, None, 1)
+        store.flush()
+        client._on_disconnect(fake, None, 1)
+
+        stats = client.get_stats()
+        print(f"Replayed: {replayed} from {set(fake.threads)}, depth before ack: {depth_before_ack}, stats: {stats}")
+        return (kept and not status_sent and off_network_thread and replayed[0] == (client.topics['scores_delta'], 'alice') and
+                depth_before_ack == 1 and stats['outbox']['depth'] == 0 and
+                stats['outbox']['replayed'] == 1 and stats['disconnects'] == 1 and
+                store.query('SELECT COUNT(*) FROM mqtt_outbox')[0][0] == 0)
+    finally:
+        shutil.rmtree(root)
+
+def test_untracked_acks_forgotten():
+    """Test that acks for non-durable publishes leave nothing behind to match a reused mid"""
+    print("\nTesting ack bookkeeping...")
+
+    root = tempfile.mkdtemp()
+    try:
+        module = load_mqtt_client_module()
+        store = ScoreStore(os.path.join(root, 'scores.db'))
+        client = module.DoomBoxMQTTClient('localhost', 1883, store=store)
+        client.executor.stop()
+        fake = FakePaho()
+        client.client = fake
+        client.connected = True
+
+        for _ in range(100):
+            client.publish_telemetry({'type': 'delta'})
+            client._on_publish(fake, None, fake.next_mid - 1)
+        leftover = (len(client.early_acks), len(client.inflight))
+
+        # paho's mid counter wraps: a durable publish reuses mid 1 and must wait for its own ack
+        fake.next_mid = 1
+        client.publish(client.topics['scores'], '{}')
+        depth_before_ack = client.outbox.get_stats()['depth']
+        client._on_publish(fake, None, 1)
+        store.flush()
+
+        print(f"Left after 100 acked publishes (early acks, inflight): {leftover}, "
+              f"depth before ack: {depth_before_ack}, after: {client.outbox.get_stats()['depth']}")
+        return leftover == (0, 0) and depth_before_ack == 1 and client.outbox.get_stats()['depth'] == 0
+    finally:
+        shutil.rmtree(root)
+
+class StalledStore:
+    """Score store whose writer is busy: writes stay queued until the test commits them"""
+    def __init__(self):
+        self.writes = []
+
+    def query(self, sql, params=()):
+        return [(0,)]
+
+    def submit(self, statements):
+        future = Future()
+        self.writes.append((statements, future))
+        return future
+
+def test_slow_commit_not_awaited():
+    """Test that command acks skip the outbox and a late outbox insert is deleted, not replayed"""
+    print("\nTesting slow commits...")
+
+    root = tempfile.mkdtemp()
+    try:
+        module = load_mqtt_client_module()
+        client = module.DoomBoxMQTTClient('localhost', 1883, store=ScoreStore(os.path.join(root, 'scores.db')))
+        client.executor.stop()
+        fake = FakePaho()
+        client.client = fake
+        client.connected = True
+        client._dispatch('get_status', lambda data: None, {'request_id': 'r1'}, acknowledge=True)
+        ack_depth = client.outbox.get_stats()['depth']
+
+        store = StalledStore()
+        outbox = MQTTOutbox(store)
+        try:
+            outbox.add('doombox/status', '{}', timeout=0.05)
+            timed_out = False
+        except Exception:
+            timed_out = True
+        store.writes[0][1].set_result(7)  # The insert lands after add() gave up
+        cleanup = store.writes[-1][0] if len(store.writes) == 2 else None
+
+        print(f"Ack sent: {fake.sent[0][1]['type']}, outbox depth after ack: {ack_depth}, "
+              f"timed out: {timed_out}, cleanup: {cleanup}")
+        return (fake.sent[0][1]['type'].startswith('command_') and ack_depth == 0 and timed_out and
+                cleanup == [('DELETE FROM mqtt_outbox WHERE id = ?', (7,))] and outbox.get_stats()['late'] == 1)
+    finally:
+        shutil.rmtree(root)
+
+class CallbackLauncher:
+    """Game launcher stand-in that only collects score callbacks"""
+    player_queue = None
+
+    def __init__(self):
+        self.score_callbacks = []
+
+    def add_score_callback(self, callback):
+        self.score_callbacks.append(callback)
+
+def test_score_callback_on_writer_thread():
+    """Test that a score callback run by the store's writer publishes without stalling it"""
+    print("\nTesting score callbacks on the writer thread...")
+
+    root = tempfile.mkdtemp()
+    try:
+        module = load_mqtt_client_module()
+        store = ScoreStore(os.path.join(root, 'scores.db'))
+        client = module.DoomBoxMQTTClient('localhost', 1883, store=store)
+        launcher = CallbackLauncher()
+        client.set_game_launcher(launcher)
+
+        # As GameLauncher.record_score does: notify from the commit's done callback
+        start = time.perf_counter()
+        store.add_score('alice', 4200).add_done_callback(
+            lambda done: [callback('alice', 4200) for callback in launcher.score_callbacks])
+        store.flush(timeout=10)
+        writer_ms = (time.perf_counter() - start) * 1000
+        client.executor.stop()
+
+        stats = client.outbox.get_stats()
+        pending = [topic for _, topic, _, _, _ in client.outbox.pending()]
+        print(f"Writer free after {writer_ms:.0f}ms, outbox: {pending}, stats: {stats}")
+        return writer_ms < 1000 and pending == [client.topics['scores_delta']] and stats['late'] == 0
+    finally:
+        shutil.rmtree(root)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox MQTT Outbox Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Bounded Outbox", test_bounded_outbox),
+        ("Offline Publish Replayed", test_offline_publish_replayed),
+        ("Untracked Acks Forgotten", test_untracked_acks_forgotten),
+        ("Slow Commit Not Awaited", test_slow_commit_not_awaited),
+        ("Score Callback On Writer Thread", test_score_callback_on_writer_thread)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the persistent player queue dedupes, orders and survives restarts
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from score_store import ScoreStore
+from player_queue import PlayerQueue
+
+def test_fifo_and_dedupe():
+    """Test that players are served in order and repeat scans keep their place"""
+    print("Testing FIFO order and dedupe...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(db_dir, 'scores.db'))
+        player_queue = PlayerQueue(store, default_session_seconds=120, handoff_seconds=0)
+
+        first = player_queue.enqueue('alice')
+        player_queue.enqueue('bob', time_limit=60)
+        repeat = player_queue.enqueue('ALICE')
+        player_queue.enqueue('carol')
+
+        snapshot = player_queue.get_snapshot()
+        etas = [player['eta_seconds'] for player in snapshot['players']]
+        claimed = player_queue.claim_next()
+        playing_repeat = player_queue.enqueue('alice')
+        after_claim = player_queue.get_snapshot()
+        store.close()
+
+        print(f"First: {first}, repeat: {repeat}, while playing: {playing_repeat}")
+        print(f"ETAs: {etas}, now playing: {after_claim['now_playing']}, depth: {after_claim['depth']}")
+        return (first['position'] == 1 and repeat['duplicate'] and repeat['position'] == 1 and
+                snapshot['depth'] == 3 and etas == [0, 120, 180] and
+                claimed['player_name'] == 'alice' and playing_repeat['duplicate'] and
+                after_claim['now_playing'] == 'alice' and after_claim['depth'] == 2)
+    finally:
+        shutil.rmtree(db_dir)
+
+def test_survives_restart():
+    """Test that waiting players survive a restart and an interrupted session is closed out"""
+    print("\nTesting restart recovery...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(db_dir, 'scores.db')
+        store = ScoreStore(db_path)
+        player_queue = PlayerQueue(store)
+        for player_name in ('alice', 'bob', 'carol'):
+            player_queue.enqueue(player_name)
+        player_queue.claim_next()  # alice is mid-game when the kiosk dies
+        store.close()
+
+        store = ScoreStore(db_path)
+        restored = PlayerQueue(store)
+        snapshot = restored.get_snapshot()
+        statuses = dict(store.query('SELECT player_name, status FROM player_queue'))
+        requeued = restored.enqueue('alice')
+        store.close()
+
+        print(f"Restored: {[p['player_name'] for p in snapshot['players']]}, statuses: {statuses}")
+        return ([p['player_name'] for p in snapshot['players']] == ['bob', 'carol'] and
+                snapshot['now_playing'] is None and statuses['alice'] == 'interrupted' and
+                requeued['accepted'] and not requeued['duplicate'] and requeued['position'] == 3)
+    finally:
+        shutil.rmtree(db_dir)
+
+def test_full_queue_rejects():
+    """Test that a full queue turns new players away"""
+    print("\nTesting queue limit...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(db_dir, 'scores.db'))
+        player_queue = PlayerQueue(store, max_depth=2)
+        results = [player_queue.enqueue(name) for name in ('alice', 'bob', 'carol')]
+        store.close()
+
+        print(f"Results: {[r['accepted'] for r in results]}, reason: {results[2].get('reason')}")
+        return [r['accepted'] for r in results] == [True, True, False] and results[2]['reason'] == 'queue_full'
+    finally:
+        shutil.rmtree(db_dir)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Player Queue Tests")
+    print("=" * 60)
+
+    tests = [
+        ("FIFO And Dedupe", test_fifo_and_dedupe),
+        ("Survives Restart", test_survives_restart),
+        ("Full Queue Rejects", test_full_queue_rejects)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
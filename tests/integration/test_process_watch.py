@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify game exits are detected without polling delays
+"""
+
+import sys
+import os
+import time
+import threading
+import subprocess
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from process_watch import ProcessExitWaiter
+
+def test_exit_detected_quickly():
+    """Test that an exit is seen within milliseconds, with the exit code"""
+    print("Testing exit detection...")
+
+    process = subprocess.Popen([sys.executable, '-c', 'import time, sys; time.sleep(0.3); sys.exit(3)'])
+    waiter = ProcessExitWaiter(process)
+    exit_code = waiter.wait()
+    detected = time.monotonic()
+    waiter.close()
+
+    # The child has exited by now; measure how long a fresh child's exit takes to be noticed
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    waiter = ProcessExitWaiter(process)
+    start = time.monotonic()
+    waiter.wait()
+    latency_ms = (time.monotonic() - start) * 1000
+    waiter.close()
+
+    print(f"Mode: {waiter.mode}, exit code: {exit_code}, short-lived child waited {latency_ms:.1f}ms")
+    return exit_code == 3 and detected > 0 and latency_ms < 1000
+
+def test_cancel_wakes_waiter():
+    """Test that cancel() releases a blocked wait while the process keeps running"""
+    print("\nTesting cancel...")
+
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(10)'])
+    waiter = ProcessExitWaiter(process)
+    results = []
+
+    thread = threading.Thread(target=lambda: results.append(waiter.wait()))
+    thread.start()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    waiter.cancel()
+    thread.join(timeout=2)
+    woke_ms = (time.monotonic() - start) * 1000
+    still_running = process.poll() is None
+
+    process.kill()
+    process.wait()
+    waiter.close()
+
+    print(f"Result: {results}, woke in {woke_ms:.1f}ms, still running: {still_running}")
+    return results == [None] and woke_ms < 500 and still_running
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Process Watch Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Exit Detected Quickly", test_exit_detected_quickly),
+        ("Cancel Wakes Waiter", test_cancel_wakes_waiter)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
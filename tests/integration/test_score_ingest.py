@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script to verify dsda-doom session stats are turned into recorded scores
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+import importlib.util
+from concurrent.futures import Future
+
+# Add src directory to path
+src_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+sys.path.insert(0, src_dir)
+
+from score_ingest import SessionScoreIngestor, parse_levelstat_line, compute_score
+from score_store import ScoreStore, INSERT_SCORE, INSERT_SESSION_EVENT
+
+LEVELSTAT = (
+    "E1M1 - 1:08.94 (1:08)  K: 18/19  I: 31/37  S: 3/6\n"
+    "E1M2 - 6:12.00 (7:20)  K: 40/52  I: 10/20  S: 0/4\n"
+)
+
+def test_parse_and_score():
+    """Test that a levelstat line parses and scores as expected"""
+    print("Testing levelstat parsing...")
+
+    level = parse_levelstat_line("E1M1 - 1:08.94 (1:08)  K: 18/19  I: 31/37  S: 3/6")
+    print(f"Level: {level}")
+
+    expected = 1000 + 18 * 100 + 31 * 25 + 3 * 500 + int((300 - 68.94) * 5)
+    score = compute_score([level])
+    print(f"Score: {score} (expected {expected})")
+
+    return (level['map'] == 'E1M1' and level['kills'] == 18 and level['max_secrets'] == 6 and
+            score == expected and parse_levelstat_line("W_Init: Init WADfiles.") is None)
+
+def test_collect_sources():
+    """Test that levelstat.txt wins over streamed output, and streamed output is used alone"""
+    print("\nTesting ingestion sources...")
+
+    session_dir = tempfile.mkdtemp()
+    try:
+        streamed = SessionScoreIngestor(session_dir)
+        streamed.feed_line("E1M1 - 1:08.94 (1:08)  K: 18/19  I: 31/37  S: 3/6\n")
+        from_stdout = streamed.ingest()
+
+        with open(os.path.join(session_dir, 'levelstat.txt'), 'w') as f:
+            f.write(LEVELSTAT)
+        from_file = streamed.ingest()
+
+        empty = SessionScoreIngestor(tempfile.gettempdir() + '/doombox-missing').ingest()
+
+        print(f"stdout: {from_stdout['source']} {from_stdout['score']}, "
+              f"file: {from_file['source']} {from_file['score']} in {from_file['ingest_ms']:.1f}ms")
+        return (from_stdout['source'] == 'stdout' and len(from_stdout['levels']) == 1 and
+                from_file['source'] == 'levelstat' and len(from_file['levels']) == 2 and
+                empty['score'] is None)
+    finally:
+        shutil.rmtree(session_dir)
+
+def test_replay_only_after_crash():
+    """Test that the demo is replayed only for a crash that left no levelstat.txt"""
+    print("\nTesting demo replay fallback...")
+
+    session_dir = tempfile.mkdtemp()
+    try:
+        # Stand-in dsda-doom: counts replays and writes one level of stats into its working directory
+        replays = os.path.join(session_dir, 'replays')
+        executable = os.path.join(session_dir, 'fake-dsda-doom')
+        with open(executable, 'w') as f:
+            f.write(f"#!/bin/sh\necho run >> '{replays}'\nprintf '{LEVELSTAT.splitlines()[0]}\\n' > levelstat.txt\n")
+        os.chmod(executable, 0o755)
+        demo = os.path.join(session_dir, 'session.lmp')
+        open(demo, 'w').close()
+
+        def ingestor():
+            return SessionScoreIngestor(session_dir, demo, executable, 'doom.wad')
+
+        clean_exit = ingestor().ingest(crashed=False)
+        crash = ingestor().ingest(crashed=True)
+        with open(os.path.join(session_dir, 'levelstat.txt'), 'w'):
+            pass  # The game exited before finishing a level
+        empty_file = ingestor().ingest(crashed=True)
+
+        with open(replays) as f:
+            replay_count = len(f.readlines())
+        print(f"Clean exit: {clean_exit['source']}, crash: {crash['source']} {crash['score']}, "
+              f"empty levelstat: {empty_file['source']} {empty_file['score']}, replays: {replay_count}")
+        return (clean_exit['source'] is None and crash['source'] == 'demo' and len(crash['levels']) == 1 and
+                empty_file['source'] == 'levelstat' and empty_file['score'] is None and replay_count == 1)
+    finally:
+        shutil.rmtree(session_dir)
+
+def test_score_and_session_commit_together():
+    """Test that the ingested score and the session end land in one transaction"""
+    print("\nTesting score recording...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(db_dir, 'levelstat.txt'), 'w') as f:
+            f.write(LEVELSTAT)
+        result = SessionScoreIngestor(db_dir).ingest()
+
+        store = ScoreStore(os.path.join(db_dir, 'scores.db'))
+        store.submit([
+            (INSERT_SCORE, ('alice', result['score'])),
+            (INSERT_SESSION_EVENT, ('alice', 'finished', 0)),
+        ]).result(timeout=10)
+        scores = store.query('SELECT player_name, score FROM scores')
+        sessions = store.query('SELECT player_name, event, exit_code FROM game_sessions')
+        store.close()
+
+        print(f"Scores: {scores}, sessions: {sessions}")
+        return scores == [('alice', result['score'])] and sessions == [('alice', 'finished', 0)]
+    finally:
+        shutil.rmtree(db_dir)
+
+class StalledStore:
+    """Score store whose writer is busy: writes stay queued until the test commits them"""
+    def __init__(self):
+        self.writes = []
+
+    def submit(self, statements):
+        future = Future()
+        self.writes.append((statements, future))
+        return future
+
+def load_game_launcher_module():
+    """Load game-launcher.py the way the kiosk does"""
+    spec = importlib.util.spec_from_file_location('game_launcher', os.path.join(src_dir, 'game-launcher.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_slow_commit_still_announced():
+    """Test that session end stays within the budget and a late commit still reaches score listeners"""
+    print("\nTesting session end budget...")
+
+    session_dir = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(session_dir, 'levelstat.txt'), 'w') as f:
+            f.write(LEVELSTAT)
+
+        # Only the state _finish_session touches; a full GameLauncher wants dsda-doom and a display
+        module = load_game_launcher_module()
+        launcher = module.GameLauncher.__new__(module.GameLauncher)
+        launcher.session_lock = threading.Lock()
+        launcher.session_recorded = False
+        launcher.output_pump = None
+        launcher.score_ingestor = SessionScoreIngestor(session_dir)
+        launcher.score_store = StalledStore()
+        launcher.score_callbacks = []
+        launcher.last_session_result = None
+        launcher.queue_entry = None
+        launcher.time_limit_timer = None
+        announced = []
+        launcher.add_score_callback(lambda player_name, score: announced.append((player_name, score)))
+
+        start = time.perf_counter()
+        result = launcher._finish_session('alice', 'finished', 0)
+        elapsed = time.perf_counter() - start
+        announced_in_budget = list(announced)
+
+        launcher.score_store.writes[0][1].set_result(1)  # The commit lands late
+        print(f"Returned after {elapsed * 1000:.0f}ms, announced then: {announced_in_budget}, "
+              f"after commit: {announced}")
+        return (elapsed < module.SCORE_INGEST_BUDGET + 0.1 and not announced_in_budget and
+                announced == [('alice', result['score'])] and launcher.last_session_result is result)
+    finally:
+        shutil.rmtree(session_dir)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Score Ingestion Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Parse And Score", test_parse_and_score),
+        ("Ingestion Sources", test_collect_sources),
+        ("Demo Replay Only After Crash", test_replay_only_after_crash),
+        ("Score And Session Commit Together", test_score_and_session_commit_together),
+        ("Slow Commit Still Announced", test_slow_commit_still_announced)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test script to verify kiosks converge on one leaderboard through score gossip
+"""
+
+import sys
+import os
+import json
+import time
+import queue
+import random
+import shutil
+import tempfile
+import threading
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from score_store import ScoreStore
+from score_replication import ScoreReplicator
+from topic_router import topic_matches
+from leaderboard_sync import LeaderboardPublisher, LeaderboardReplica
+
+PLAYERS = ['alice', 'bob', 'carol', 'dave', 'erin', 'frank']
+
+class BrokerStandIn:
+    """
+    In-process stand-in for the MQTT broker
+
+    Messages are JSON round-tripped and delivered on one thread, like a
+    client's network loop; a seeded fraction of them is dropped.
+    """
+    def __init__(self, loss: float = 0.0, seed: int = 7):
+        self.subscribers = []
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.queue = queue.Queue()
+        self.delivered = []
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._deliver_loop, daemon=True)
+        self.thread.start()
+
+    def subscribe(self, pattern, handler):
+        self.subscribers.append((pattern, handler))
+
+    def publish(self, topic, message):
+        if self.random.random() < self.loss:
+            self.dropped += 1
+        else:
+            self.queue.put((topic, json.dumps(message)))
+        return True
+
+    def _deliver_loop(self):
+        while True:
+            topic, payload = self.queue.get()
+            if topic is None:
+                break
+            self.delivered.append((topic, payload))
+            for pattern, handler in self.subscribers:
+                if topic_matches(pattern, topic):
+                    handler(json.loads(payload))
+
+    def close(self):
+        self.queue.put((None, None))
+        self.thread.join(timeout=2)
+
+def make_nodes(root, broker, count, sync_interval=0.2):
+    """Start count kiosks, each with its own database, on one broker"""
+    nodes = []
+    for index in range(count):
+        store = ScoreStore(os.path.join(root, f"kiosk{index}.db"))
+        replicator = ScoreReplicator(store, broker.publish, kiosk_id=f"kiosk{index}", sync_interval=sync_interval)
+        broker.subscribe(replicator.subscription, replicator.handle)
+        nodes.append((store, replicator))
+    return nodes
+
+def leaderboards(nodes):
+    return [store.top_scores(len(PLAYERS)) for store, _ in nodes]
+
+def wait_for_convergence(nodes, expected_rows, timeout=10.0):
+    """Seconds until every node holds all scores and the same leaderboard, or None"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        counts = [store.query('SELECT COUNT(*) FROM scores')[0][0] for store, _ in nodes]
+        boards = leaderboards(nodes)
+        if all(count == expected_rows for count in counts) and all(board == boards[0] for board in boards):
+            return time.perf_counter() - start
+        time.sleep(0.02)
+    return None
+
+def record_scores(nodes, per_node, seed=3):
+    """Each kiosk records scores for an overlapping set of players, as the launcher would"""
+    rng = random.Random(seed)
+    best = {}
+    for _ in range(per_node):
+        for store, replicator in nodes:
+            player, score = rng.choice(PLAYERS), rng.randrange(100, 10000)
+            # Notified from the commit, on the store's writer thread, as GameLauncher.record_score does
+            store.add_score(player, score).add_done_callback(
+                lambda done, replicator=replicator, player=player, score=score: replicator.push_local(player, score))
+            best[player] = max(best.get(player, 0), score)
+    for store, _ in nodes:
+        store.flush(timeout=10)
+    return best
+
+def test_lossy_gossip_converges():
+    """Test that three kiosks losing 30% of messages still converge, and how quickly"""
+    print("Testing convergence...")
+
+    root = tempfile.mkdtemp()
+    broker = BrokerStandIn(loss=0.3)
+    try:
+        nodes = make_nodes(root, broker, 3)
+        for _, replicator in nodes:
+            replicator.start()
+
+        start = time.perf_counter()
+        best = record_scores(nodes, per_node=10)
+        record_ms = (time.perf_counter() - start) * 1000
+        converged = wait_for_convergence(nodes, expected_rows=30)
+
+        for _, replicator in nodes:
+            replicator.stop()
+        board = leaderboards(nodes)[0]
+        stats = [replicator.get_stats() for _, replicator in nodes]
+
+        print(f"Recorded 30 scores in {record_ms:.0f}ms, dropped {broker.dropped} messages, "
+              f"converged in {converged if converged is None else f'{converged * 1000:.0f}ms'}")
+        print(f"Leaderboard: {board}")
+        print(f"Stats: {stats[0]}")
+        return (converged is not None and converged < 5.0 and record_ms < 1000 and
+                board == sorted(best.items(), key=lambda row: -row[1]) and
+                sum(s['repairs_sent'] for s in stats) > 0)
+    finally:
+        broker.close()
+        shutil.rmtree(root)
+
+def test_idempotent_merge():
+    """Test that redelivered scores are ignored and scores recorded before replication are adopted"""
+    print("\nTesting idempotent merge...")
+
+    root = tempfile.mkdtemp()
+    broker = BrokerStandIn()
+    try:
+        # A kiosk with history from before replication was turned on
+        old = ScoreStore(os.path.join(root, 'kiosk0.db'))
+        for score in (300, 500):
+            old.add_score('zoe', score).result(timeout=5)
+        old.close()
+
+        nodes = make_nodes(root, broker, 2)
+        record_scores(nodes, per_node=3)
+        for _, replicator in nodes:
+            replicator.send_summary()
+        converged = wait_for_convergence(nodes, expected_rows=8)
+
+        # Deliver everything again
+        replayed = list(broker.delivered)
+        for topic, payload in replayed:
+            broker.queue.put((topic, payload))
+        time.sleep(0.3)
+
+        counts = [store.query('SELECT COUNT(*) FROM scores')[0][0] for store, _ in nodes]
+        origins = nodes[1][0].query("SELECT origin_seq FROM scores WHERE kiosk_id = 'kiosk0' ORDER BY origin_seq")
+        stats = nodes[1][1].get_stats()
+        print(f"Converged: {converged}, counts after replaying {len(replayed)} messages: {counts}")
+        print(f"kiosk0 sequences on kiosk1: {[seq for (seq,) in origins]}, stats: {stats}")
+        return (converged is not None and counts == [8, 8] and
+                [seq for (seq,) in origins] == [1, 2, 3, 4, 5] and stats['duplicates'] > 0)
+    finally:
+        broker.close()
+        shutil.rmtree(root)
+
+def test_repair_announced_once():
+    """Test that a repair batch is announced once, with leaderboard deltas only for scores that change the top-N"""
+    print("\nTesting repair batch announcement...")
+
+    root = tempfile.mkdtemp()
+    broker = BrokerStandIn()
+    try:
+        nodes = make_nodes(root, broker, 2)
+        (history, _), (store, replicator) = nodes
+        rng = random.Random(5)
+        for _ in range(20):
+            history.add_score(rng.choice(PLAYERS), rng.randrange(100, 10000)).result(timeout=5)
+
+        # A kiosk joining late catches up on another's history in one batch
+        publisher = LeaderboardPublisher(store, limit=3)
+        replica = LeaderboardReplica(limit=3)
+        replica.apply_snapshot(publisher.snapshot())
+        batches, deltas = [], []
+
+        def on_scores(scores):
+            batches.append(len(scores))
+            batch_deltas, snapshot = publisher.record_batch(scores)
+            deltas.extend(batch_deltas)
+            for delta in batch_deltas:
+                replica.apply_delta(delta)
+            replica.apply_snapshot(snapshot)
+
+        replicator.add_listener(on_scores)
+        replicator.send_summary()
+        converged = wait_for_convergence(nodes, expected_rows=20)
+
+        print(f"Batches announced: {batches}, deltas: {len(deltas)}, replica: {replica.get_rows()}")
+        return (converged is not None and batches == [20] and 0 < len(deltas) < 20 and
+                replica.get_rows() == [{'player_name': name, 'score': score} for name, score in store.top_scores(3)])
+    finally:
+        broker.close()
+        shutil.rmtree(root)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Score Replication Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Lossy Gossip Converges", test_lossy_gossip_converges),
+        ("Idempotent Merge", test_idempotent_merge),
+        ("Repair Announced Once", test_repair_announced_once)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shared score store batches writes and uses WAL
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from score_store import ScoreStore, SCHEMA_VERSION
+
+def test_wal_and_schema():
+    """Test that the store creates the schema in WAL mode"""
+    print("Testing schema and journal mode...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(db_dir, 'scores.db'))
+        journal_mode = store.query('PRAGMA journal_mode')[0][0]
+        auto_vacuum = store.query('PRAGMA auto_vacuum')[0][0]
+        tables = {row[0] for row in store.query("SELECT name FROM sqlite_master WHERE type='table'")}
+        store.close()
+
+        print(f"Journal mode: {journal_mode}, auto_vacuum: {auto_vacuum}, tables: {sorted(tables)}")
+        return journal_mode == 'wal' and auto_vacuum == 2 and {'scores', 'game_sessions'} <= tables
+    finally:
+        shutil.rmtree(db_dir)
+
+def test_batched_writes_from_threads():
+    """Test that writes queued from several threads are all committed, in batches"""
+    print("\nTesting batched writes...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(db_dir, 'scores.db'))
+
+        def writer(name):
+            for i in range(50):
+                store.add_score(name, i)
+                store.log_session(name, 'started')
+
+        threads = [threading.Thread(target=writer, args=(f"player{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        flushed = store.flush(timeout=10)
+        scores = store.query('SELECT COUNT(*) FROM scores')[0][0]
+        sessions = store.query('SELECT COUNT(*) FROM game_sessions')[0][0]
+        stats = store.get_stats()
+        store.close()
+
+        print(f"Scores: {scores}, sessions: {sessions}")
+        print(f"Stats: {stats}")
+        return flushed and scores == 200 and sessions == 200 and stats['batches'] < stats['writes']
+    finally:
+        shutil.rmtree(db_dir)
+
+def test_transaction_is_atomic():
+    """Test that statements submitted together commit or fail together"""
+    print("\nTesting atomic submit...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(db_dir, 'scores.db'))
+        future = store.submit([
+            ('INSERT INTO scores (player_name, score) VALUES (?, ?)', ('alice', 100)),
+            ('INSERT INTO missing_table VALUES (?)', (1,)),
+        ])
+        failed = future.exception(timeout=10) is not None
+        scores = store.query('SELECT COUNT(*) FROM scores')[0][0]
+
+        # A bad write batched with good ones fails alone
+        batch = [([('INSERT INTO scores (player_name, score) VALUES (?, ?)', (name, 200))], Future())
+                 for name in ('bob', 'carol')]
+        batch.insert(1, ([('INSERT INTO missing_table VALUES (?)', (1,))], Future()))
+        conn = sqlite3.connect(store.db_path)
+        store._commit_batch(conn, batch)
+        conn.close()
+        outcomes = [future.exception() is None for _, future in batch]
+        batched = store.query('SELECT player_name FROM scores ORDER BY player_name')
+        store.close()
+
+        print(f"Failed: {failed}, scores: {scores}, batch outcomes: {outcomes}, committed: {batched}")
+        return failed and scores == 0 and outcomes == [True, False, True] and batched == [('bob',), ('carol',)]
+    finally:
+        shutil.rmtree(db_dir)
+
+def test_player_best_leaderboard():
+    """Test that the leaderboard shows each player once, read through the index"""
+    print("\nTesting per-player best scores...")
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        store = ScoreStore(os.path.join(db_dir, 'scores.db'))
+        for player_name, score in [('alice', 100), ('bob', 300), ('alice', 500), ('alice', 200), ('carol', 50)]:
+            store.add_score(player_name, score)
+        store.flush(timeout=10)
+
+        players = store.top_scores(10)
+        all_scores = store.top_scores(10, distinct_players=False)
+        plan = ' '.join(row[-1] for row in store.query(
+            'EXPLAIN QUERY PLAN SELECT player_name, score FROM player_best ORDER BY score DESC, timestamp ASC LIMIT 8'))
+        version = store.query('PRAGMA user_version')[0][0]
+        store.close()
+
+        print(f"Players: {players}")
+        print(f"All scores: {all_scores}")
+        print(f"Plan: {plan}")
+        return (players == [('alice', 500), ('bob', 300), ('carol', 50)] and
+                len(all_scores) == 5 and 'idx_player_best_score' in plan and version == SCHEMA_VERSION)
+    finally:
+        shutil.rmtree(db_dir)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Score Store Tests")
+    print("=" * 60)
+
+    tests = [
+        ("WAL And Schema", test_wal_and_schema),
+        ("Batched Writes From Threads", test_batched_writes_from_threads),
+        ("Atomic Submit", test_transaction_is_atomic),
+        ("Player Best Leaderboard", test_player_best_leaderboard)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script to verify telemetry keyframes, change-driven deltas and wakeups
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from telemetry import TelemetryPublisher, read_soc_temperature
+
+THRESHOLDS = {'game_state': 0, 'queue_depth': 0, 'fps': 5.0}
+
+def test_keyframes_and_deltas():
+    """Test that jitter is suppressed, real changes send cumulative deltas, and keyframes recur"""
+    print("Testing keyframes and deltas...")
+
+    sent = []
+    state = {'game_state': 'idle', 'queue_depth': 0, 'fps': 30.0, 'frames_decoded': 100}
+    telemetry = TelemetryPublisher(lambda message, retain: sent.append((message, retain)),
+                                   interval=0.3, check_interval=1.0, thresholds=THRESHOLDS)
+    telemetry.add_source('kiosk', lambda: dict(state))
+
+    results = [telemetry.check()]
+    state.update(fps=32.04, frames_decoded=160)      # Jitter and a counter: nothing sent
+    results.append(telemetry.check())
+    state.update(queue_depth=2)                      # Queue change: delta
+    results.append(telemetry.check())
+    state.update(game_state='running')               # Another delta, still relative to the keyframe
+    results.append(telemetry.check())
+    time.sleep(0.35)
+    results.append(telemetry.check())                # Interval elapsed: new keyframe
+
+    keyframe, delta1, delta2, keyframe2 = [message for message, _ in sent]
+    print(f"Results: {results}")
+    print(f"Second delta: {delta2}")
+    return (results == ['keyframe', None, 'delta', 'delta', 'keyframe'] and
+            [retain for _, retain in sent] == [True, False, False, True] and
+            delta1['base'] == keyframe['seq'] and delta2['base'] == keyframe['seq'] and
+            delta2['fields'] == {'queue_depth': 2, 'game_state': 'running', 'fps': 32.0, 'frames_decoded': 160} and
+            keyframe2['seq'] == keyframe2['base'] == 4 and len(keyframe2['fields']) == 4)
+
+def test_notify_and_soc_temperature():
+    """Test that notify() publishes without waiting for the interval and SoC temperature is parsed"""
+    print("\nTesting notify and SoC temperature...")
+
+    published = threading.Event()
+    sent = []
+    state = {'game_state': 'idle'}
+
+    def publish(message, retain):
+        sent.append(message)
+        if message['type'] == 'delta':
+            published.set()
+
+    telemetry = TelemetryPublisher(publish, interval=60, check_interval=10, thresholds=THRESHOLDS)
+    telemetry.add_source('game', lambda: dict(state))
+    telemetry.add_source('broken', lambda: 1 / 0)
+    telemetry.start()
+    time.sleep(0.1)
+
+    start = time.perf_counter()
+    state['game_state'] = 'starting'
+    telemetry.notify()
+    delivered = published.wait(2.0)
+    latency_ms = (time.perf_counter() - start) * 1000
+    telemetry.stop()
+
+    with tempfile.NamedTemporaryFile('w', suffix='temp', delete=False) as f:
+        f.write('48312\n')
+    temperature = read_soc_temperature(f.name)
+    os.unlink(f.name)
+
+    stats = telemetry.get_stats()
+    print(f"Delta after {latency_ms:.1f}ms, temperature {temperature}, stats: {stats}")
+    return (delivered and latency_ms < 500 and temperature == 48.3 and
+            read_soc_temperature('/nonexistent/temp') is None and stats['source_errors'] >= 2)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Telemetry Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Keyframes And Deltas", test_keyframes_and_deltas),
+        ("Notify And SoC Temperature", test_notify_and_soc_temperature)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script to verify MQTT topic routing and self-echo suppression
+"""
+
+import sys
+import os
+import tempfile
+import importlib.util
+
+# Add src directory to path
+src_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+sys.path.insert(0, src_dir)
+
+from topic_router import TopicRouter, topic_matches
+from score_store import ScoreStore
+
+def load_mqtt_client_module():
+    """Load mqtt-client.py the way the kiosk does"""
+    spec = importlib.util.spec_from_file_location('mqtt_client', os.path.join(src_dir, 'mqtt-client.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class Message:
+    """Minimal stand-in for a paho MQTTMessage"""
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload.encode('utf-8')
+
+def test_wildcard_routes():
+    """Test that + and # patterns match like a broker and unrouted topics are counted"""
+    print("Testing wildcard routing...")
+
+    router = TopicRouter('kiosk-a')
+    seen = []
+    router.add_route('doombox/+/scores', lambda topic, data: seen.append(('plus', topic)))
+    router.add_route('doombox/commands/#', lambda topic, data: seen.append(('hash', topic)))
+
+    router.route('doombox/kiosk-b/scores', b'{"score": 1}')
+    router.route('doombox/commands', b'{}')
+    router.route('doombox/commands/stop_game', b'{}')
+    router.route('doombox/kiosk-b/scores/extra', b'{}')
+    router.route('doombox/commands', b'not json')
+
+    stats = router.get_stats()
+    print(f"Seen: {seen}")
+    print(f"Stats: {stats}")
+    return (seen == [('plus', 'doombox/kiosk-b/scores'), ('hash', 'doombox/commands'),
+                     ('hash', 'doombox/commands/stop_game')] and
+            topic_matches('#', 'a/b') and not topic_matches('a/+', 'a') and
+            stats['dropped']['no_route'] == 1 and stats['dropped']['invalid_json'] == 1 and
+            stats['topics']['doombox/commands'] == {'handled': 1, 'dropped': 1})
+
+def test_no_status_feedback_loop():
+    """Test that status is not subscribed and our own messages echoed back are dropped"""
+    print("\nTesting self-echo suppression...")
+
+    module = load_mqtt_client_module()
+    store = ScoreStore(os.path.join(tempfile.mkdtemp(), 'scores.db'))
+    client = module.DoomBoxMQTTClient('localhost', 1883, store=store)
+    published = []
+    client.connected = True
+    client.publish = lambda topic, payload, retain=False, durable=True: published.append((topic, payload)) or True
+
+    # Feed everything we publish straight back, as a broker would if we were subscribed
+    client._publish_system_status()
+    for _ in range(3):
+        for topic, payload in list(published):
+            client._on_message(None, None, Message(topic, payload))
+    client.publish_player_registered('alice')
+    client._on_message(None, None, Message(*published[-1]))
+    client._on_message(None, None, Message(client.topics['status'], '{"origin": "someone-else"}'))
+    client.executor.stop()
+
+    subscriptions = client.router.subscriptions()
+    stats = client.router.get_stats()
+    print(f"Subscriptions: {subscriptions}")
+    print(f"Published {len(published)} messages, stats: {stats}")
+    return (client.topics['status'] not in subscriptions and len(published) == 2 and
+            stats['dropped']['self_echo'] == 4 and stats['dropped']['no_route'] == 1 and
+            stats['topics'][client.topics['players']] == {'handled': 0, 'dropped': 1})
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Topic Router Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Wildcard Routes", test_wildcard_routes),
+        ("No Status Feedback Loop", test_no_status_feedback_loop)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the video memory budget plans clips and evicts LRU entries
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from video_memory import VideoMemoryBudget, frame_bytes
+
+MB = 1024 * 1024
+
+def test_plan_degradation():
+    """Test that tight budgets reduce FPS first, then resolution"""
+    print("Testing clip plan degradation...")
+
+    display_size = (640, 480)
+    clip_mb = 90 * frame_bytes(display_size) / MB
+
+    full = VideoMemoryBudget(budget_mb=clip_mb + 1).plan_clip(display_size, 30, 90)
+    half_fps = VideoMemoryBudget(budget_mb=clip_mb * 0.6).plan_clip(display_size, 30, 90)
+    half_res = VideoMemoryBudget(budget_mb=clip_mb * 0.2).plan_clip(display_size, 30, 90)
+
+    print(f"Full: {full}")
+    print(f"Half FPS: {half_fps}")
+    print(f"Half resolution: {half_res}")
+
+    return (full['degraded'] is None and full['frames'] == 90 and
+            half_fps['degraded'] == 'fps' and half_fps['frames'] == 45 and
+            half_res['degraded'] == 'resolution' and half_res['frame_size'] == (320, 240))
+
+def test_lru_eviction():
+    """Test that reservations evict the least recently used clip"""
+    print("\nTesting LRU eviction...")
+
+    budget = VideoMemoryBudget(budget_mb=10)
+    evicted = []
+
+    budget.reserve('a', 4 * MB, evicted.append)
+    budget.reserve('b', 4 * MB, evicted.append)
+    budget.touch('a')
+    fits = budget.reserve('c', 4 * MB, evicted.append)
+
+    stats = budget.get_stats()
+    print(f"Evicted: {evicted}")
+    print(f"Stats: {stats}")
+
+    return fits and evicted == ['b'] and stats['used_mb'] == 8 and stats['evictions'] == 1
+
+def test_pinned_reservations():
+    """Test that reservations without a callback are never evicted"""
+    print("\nTesting pinned reservations...")
+
+    budget = VideoMemoryBudget(budget_mb=10)
+    evicted = []
+
+    budget.reserve('ring', 6 * MB)
+    budget.reserve('a', 4 * MB, evicted.append)
+    fits = budget.reserve('b', 4 * MB, evicted.append)
+    budget.release('ring')
+
+    stats = budget.get_stats()
+    print(f"Evicted: {evicted}")
+    print(f"Stats: {stats}")
+
+    return fits and evicted == ['a'] and stats['used_mb'] == 4
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Video Memory Budget Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Plan Degradation", test_plan_degradation),
+        ("LRU Eviction", test_lru_eviction),
+        ("Pinned Reservations", test_pinned_reservations)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the webhook keeps one MQTT session and buffers while the broker is away
+"""
+
+import sys
+import os
+import types
+import importlib.util
+
+# Add the repository root to path for the config import
+root_dir = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.insert(0, root_dir)
+
+def load_webhook_module():
+    """Load tools/webhook.py with paho replaced by FakeClient"""
+    spec = importlib.util.spec_from_file_location('webhook', os.path.join(root_dir, 'tools', 'webhook.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.mqtt = types.SimpleNamespace(Client=FakeClient)
+    return module
+
+class PublishInfo:
+    def __init__(self, mid):
+        self.mid = mid
+
+class FakeClient:
+    """Stands in for paho: records the session settings and publishes; the test drives the callbacks"""
+    instances = []
+
+    def __init__(self, client_id=None, clean_session=True):
+        self.client_id = client_id
+        self.clean_session = clean_session
+        self.started = False
+        self.sent = []
+        FakeClient.instances.append(self)
+
+    def reconnect_delay_set(self, min_delay=1, max_delay=120):
+        self.reconnect_delays = (min_delay, max_delay)
+
+    def connect_async(self, host, port, keepalive):
+        self.address = (host, port)
+
+    def loop_start(self):
+        self.started = True
+
+    def publish(self, topic, payload, qos=0):
+        self.sent.append((topic, payload, qos))
+        return PublishInfo(len(self.sent))
+
+def test_offline_buffer_and_flush():
+    """Test that publishes wait in the bounded outbox while offline and go out, acked, on connect"""
+    print("Testing offline buffering...")
+
+    module = load_webhook_module()
+    bridge = module.MQTTBridge('broker', 1883, outbox_size=2)
+    client = bridge.client
+
+    accepted = [bridge.publish('doombox/start_game', f'{{"n": {i}}}') for i in range(3)]
+    sent_while_offline = len(client.sent)
+
+    bridge._on_connect(client, None, {}, 0)
+    flushed = [(topic, qos) for topic, _, qos in client.sent]
+    bridge._on_publish(client, None, 2)   # Acks can come back in any order
+    bridge._on_publish(client, None, 1)
+    live = bridge.publish('doombox/start_game', '{"n": 3}')
+    bridge._on_disconnect(client, None, 1)
+
+    stats = bridge.get_stats()
+    print(f"Accepted: {accepted}, flushed: {flushed}, stats: {stats}")
+    return (accepted == [True, True, False] and sent_while_offline == 0 and
+            flushed == [('doombox/start_game', 1)] * 2 and live and len(client.sent) == 3 and
+            stats['buffered'] == 2 and stats['dropped'] == 1 and stats['published'] == 3 and
+            stats['delivered'] == 2 and stats['inflight'] == 1 and stats['outbox_depth'] == 0 and
+            stats['connects'] == 1 and stats['disconnects'] == 1 and not stats['connected'] and
+            stats['delivery_latency']['count'] == 2)
+
+def test_shared_session_and_stats():
+    """Test that requests share one persistent session and /stats reports it"""
+    print("\nTesting shared session and /stats...")
+
+    module = load_webhook_module()
+    FakeClient.instances.clear()
+    first, second = module.get_bridge(), module.get_bridge()
+    session = FakeClient.instances[0]
+    session_ok = (first is second and len(FakeClient.instances) == 1 and not session.clean_session and
+                  session.started and session.client_id == module.MQTT_CLIENT_ID)
+
+    first._on_connect(session, None, {}, 0)
+    app = module.app.test_client()
+    response = app.post('/trigger/alice')
+    stats = app.get('/stats').get_json()
+
+    print(f"Trigger: {response.status_code}, mqtt: {stats['mqtt']}, request latency: {stats['request_latency']}")
+    return (session_ok and response.status_code == 200 and len(session.sent) == 1 and
+            stats['mqtt']['connected'] and stats['mqtt']['published'] == 1 and
+            stats['request_latency']['count'] == 1)
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("DoomBox Webhook Bridge Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Offline Buffer And Flush", test_offline_buffer_and_flush),
+        ("Shared Session And Stats", test_shared_session_and_stats)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+            print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+        except Exception as e:
+            results.append((test_name, False))
+            print(f"{test_name}: FAIL - {e}")
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    print(f"\nOverall: {passed}/{total} tests passed")
+
+    return 0 if passed == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+DoomBox Score Database Migration Utility
+Brings existing score databases up to the current schema (leaderboard index,
+per-player best scores) and can import scores from a legacy database
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from score_store import SCORE_DATABASE, SCHEMA_VERSION, TOP_PLAYERS, migrate, schema_version
+
+
+def table_count(conn, table):
+    """Row count of a table, or None if it does not exist"""
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    except sqlite3.Error:
+        return None
+
+
+def import_legacy_scores(conn, legacy_path):
+    """Copy scores from another database (e.g. the old scores.db) that are not already present"""
+    conn.execute('ATTACH DATABASE ? AS legacy', (legacy_path,))
+    try:
+        cursor = conn.execute('''
+            INSERT INTO scores (player_name, score, timestamp)
+            SELECT l.player_name, l.score, l.timestamp FROM legacy.scores l
+            WHERE NOT EXISTS (
+                SELECT 1 FROM scores s
+                WHERE s.player_name = l.player_name AND s.score = l.score AND s.timestamp = l.timestamp
+            )
+        ''')
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.execute('DETACH DATABASE legacy')
+
+
+def show_query_plan(conn):
+    """Print how SQLite answers the leaderboard query"""
+    for row in conn.execute('EXPLAIN QUERY PLAN ' + TOP_PLAYERS, (10,)):
+        print(f"   plan: {row[-1]}")
+
+
+def migrate_database(db_path, check_only=False, legacy_path=None):
+    """Migrate one database file"""
+    print(f"📂 {db_path}")
+    if not os.path.exists(db_path):
+        print("   ❌ Not found")
+        return False
+
+    conn = sqlite3.connect(db_path)
+    try:
+        version = schema_version(conn)
+        print(f"   Schema version: {version} (current: {SCHEMA_VERSION})")
+        print(f"   Scores: {table_count(conn, 'scores')}, sessions: {table_count(conn, 'game_sessions')}")
+
+        if check_only:
+            return version >= SCHEMA_VERSION
+
+        old_version, new_version = migrate(conn)
+        if new_version != old_version:
+            print(f"   ✅ Migrated {old_version} -> {new_version}")
+        else:
+            print("   ✅ Already up to date")
+
+        if legacy_path:
+            imported = import_legacy_scores(conn, legacy_path)
+            print(f"   📥 Imported {imported} scores from {legacy_path}")
+
+        print(f"   Players on leaderboard: {table_count(conn, 'player_best')}")
+        show_query_plan(conn)
+        return True
+
+    except sqlite3.Error as e:
+        print(f"   ❌ Migration failed: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate DoomBox score databases to the current schema")
+    parser.add_argument("databases", nargs="*", default=[SCORE_DATABASE],
+                        help=f"Database files to migrate (default: {SCORE_DATABASE})")
+    parser.add_argument("--check", action="store_true", help="Only report schema versions, change nothing")
+    parser.add_argument("--import-legacy", metavar="PATH",
+                        help="Also copy scores from a legacy database such as scores.db")
+
+    args = parser.parse_args()
+
+    ok = True
+    for db_path in args.databases:
+        ok = migrate_database(db_path, args.check, args.import_legacy) and ok
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,11 +12,14 @@ Methods supported:
 3. HTTP API (for remote triggering)
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 import json
 import paho.mqtt.client as mqtt
 import os
+import time
 import logging
+import threading
+from collections import deque
 from datetime import datetime
 import re
 
@@ -35,6 +38,12 @@ except ImportError:
 # File trigger path (if webhook runs on same machine as kiosk)
 TRIGGER_FILE = "/opt/doombox/new_player.json"
 
+# MQTT session settings
+MQTT_CLIENT_ID = "doombox-webhook"
+MQTT_KEEPALIVE = 60
+OUTBOX_SIZE = 500        # Registrations buffered while the broker is unreachable
+LATENCY_SAMPLES = 200    # Recent requests/deliveries kept for latency stats
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -50,19 +59,150 @@ def sanitize_player_name(name):
         clean_name = f"Player_{datetime.now().strftime('%H%M%S')}"
     return clean_name
 
+def latency_summary(samples):
+    """avg/p95/max of a list of millisecond samples"""
+    if not samples:
+        return {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "avg_ms": round(sum(ordered) / len(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max_ms": round(ordered[-1], 2)
+    }
+
+class MQTTBridge:
+    """
+    One long-lived MQTT session shared by all requests
+    
+    paho's network loop reconnects on its own with backoff. Publishes use QoS 1;
+    while the broker is unreachable they wait in a bounded outbox that is
+    flushed on reconnect. When the outbox is full publish() returns False so the
+    caller can fall back to the file trigger.
+    """
+    
+    def __init__(self, host, port, client_id=MQTT_CLIENT_ID, outbox_size=OUTBOX_SIZE):
+        self.host = host
+        self.port = port
+        self.client = mqtt.Client(client_id=client_id, clean_session=False)
+        self.client.reconnect_delay_set(min_delay=1, max_delay=30)
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.on_publish = self._on_publish
+        
+        self.connected = False
+        self.lock = threading.Lock()          # connected flag, outbox, stats
+        self.outbox = deque()
+        self.outbox_size = outbox_size
+        self.inflight_lock = threading.Lock()  # Never held while calling into paho
+        self.inflight = {}                     # mid -> publish time, until PUBACK
+        self.early_acks = set()                # PUBACKs that beat us to recording the mid
+        self.delivery_ms = deque(maxlen=LATENCY_SAMPLES)
+        
+        self.stats = {
+            "published": 0,
+            "delivered": 0,
+            "buffered": 0,
+            "dropped": 0,
+            "connects": 0,
+            "disconnects": 0
+        }
+        
+        self.client.connect_async(host, port, MQTT_KEEPALIVE)
+        self.client.loop_start()
+    
+    def _on_connect(self, client, userdata, flags, rc):
+        if rc != 0:
+            logger.error(f"MQTT connect refused: {rc}")
+            return
+        with self.lock:
+            self.connected = True
+            self.stats["connects"] += 1
+            pending = list(self.outbox)
+            self.outbox.clear()
+        logger.info(f"MQTT session up ({self.host}:{self.port}), flushing {len(pending)} buffered messages")
+        for topic, payload, queued_at in pending:
+            self._send(topic, payload, queued_at)
+    
+    def _on_disconnect(self, client, userdata, rc):
+        with self.lock:
+            self.connected = False
+            self.stats["disconnects"] += 1
+        logger.warning(f"MQTT session lost (rc={rc}), reconnecting in the background")
+    
+    def _on_publish(self, client, userdata, mid):
+        with self.inflight_lock:
+            sent_at = self.inflight.pop(mid, None)
+            if sent_at is None:
+                self.early_acks.add(mid)
+                return
+        self._record_delivery(sent_at)
+    
+    def _record_delivery(self, sent_at):
+        with self.lock:
+            self.stats["delivered"] += 1
+            self.delivery_ms.append((time.perf_counter() - sent_at) * 1000)
+    
+    def _send(self, topic, payload, queued_at):
+        """Hand a message to paho at QoS 1 and track it until the broker acknowledges it"""
+        info = self.client.publish(topic, payload, qos=1)
+        with self.lock:
+            self.stats["published"] += 1
+        with self.inflight_lock:
+            acked = info.mid in self.early_acks
+            if acked:
+                self.early_acks.discard(info.mid)
+            else:
+                self.inflight[info.mid] = queued_at
+        if acked:
+            self._record_delivery(queued_at)
+    
+    def publish(self, topic, payload):
+        """Publish now, or buffer until the session is back; False if the outbox is full"""
+        queued_at = time.perf_counter()
+        with self.lock:
+            if not self.connected:
+                if len(self.outbox) >= self.outbox_size:
+                    self.stats["dropped"] += 1
+                    return False
+                self.outbox.append((topic, payload, queued_at))
+                self.stats["buffered"] += 1
+                return True
+        self._send(topic, payload, queued_at)
+        return True
+    
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats, connected=self.connected, outbox_depth=len(self.outbox))
+            delivery_ms = list(self.delivery_ms)
+        with self.inflight_lock:
+            stats["inflight"] = len(self.inflight)
+        stats["delivery_latency"] = latency_summary(delivery_ms)
+        return stats
+
+_bridge = None
+_bridge_lock = threading.Lock()
+request_ms = deque(maxlen=LATENCY_SAMPLES)
+
+def get_bridge():
+    """The shared MQTT session, started on first use"""
+    global _bridge
+    with _bridge_lock:
+        if _bridge is None:
+            _bridge = MQTTBridge(MQTT_BROKER, MQTT_PORT)
+        return _bridge
+
 def trigger_via_mqtt(player_name):
     """Trigger game via MQTT"""
     try:
-        client = mqtt.Client()
-        client.connect(MQTT_BROKER, MQTT_PORT, 60)
-        
         message = {
             "player_name": player_name,
             "timestamp": datetime.now().isoformat()
         }
         
-        client.publish(MQTT_TOPIC, json.dumps(message))
-        client.disconnect()
+        if not get_bridge().publish(MQTT_TOPIC, json.dumps(message)):
+            logger.error(f"MQTT outbox full, could not queue trigger for {player_name}")
+            return False
         
         logger.info(f"MQTT trigger sent for player: {player_name}")
         return True
@@ -87,6 +227,17 @@ def trigger_via_file(player_name):
         logger.error(f"File trigger failed: {e}")
         return False
 
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_latency(response):
+    # Only the trigger endpoints; health checks and stats would skew the numbers
+    if request.endpoint in ('register_player', 'manual_trigger'):
+        request_ms.append((time.perf_counter() - g.request_start) * 1000)
+    return response
+
 @app.route('/', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -201,7 +352,9 @@ def get_stats():
     try:
         stats = {
             "total_registrations": 0,
-            "recent_players": []
+            "recent_players": [],
+            "request_latency": latency_summary(list(request_ms)),
+            "mqtt": _bridge.get_stats() if _bridge else {"connected": False, "outbox_depth": 0}
         }
         
         # Read from log file